@@ -50,6 +50,11 @@ resource "aws_dynamodb_table" "articles" {
     type = "S"
   }
 
+  attribute {
+    name = "published_date"
+    type = "S"
+  }
+
   # GSI for querying by state and published date
   global_secondary_index {
     name            = "state-published_at-index"
@@ -83,6 +88,18 @@ resource "aws_dynamodb_table" "articles" {
     write_capacity = var.billing_mode == "PROVISIONED" ? var.gsi_write_capacity : null
   }
 
+  # GSI for deduplication lookups by publication day
+  global_secondary_index {
+    name               = "published_date-published_at-index"
+    hash_key           = "published_date"
+    range_key          = "published_at"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["url", "canonical_url", "title", "content_hash", "cluster_id"]
+
+    read_capacity  = var.billing_mode == "PROVISIONED" ? var.gsi_read_capacity : null
+    write_capacity = var.billing_mode == "PROVISIONED" ? var.gsi_write_capacity : null
+  }
+
   # Enable point-in-time recovery
   point_in_time_recovery {
     enabled = var.enable_point_in_time_recovery
@@ -69,7 +69,8 @@ output "articles_gsi_names" {
   value = [
     "state-published_at-index",
     "cluster-published_at-index",
-    "source-ingested_at-index"
+    "source-ingested_at-index",
+    "published_date-published_at-index"
   ]
 }
 
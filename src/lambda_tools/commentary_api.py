@@ -6,29 +6,49 @@ with author attribution, comment moderation and visibility controls, search and
 capabilities for the Sentinel cybersecurity triage system.
 """
 
-import json
+import base64
+import gzip
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
 import uuid
 import os
 import re
+import time
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.conditions import Key
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# AWS clients
-dynamodb = boto3.resource('dynamodb')
+# AWS clients (keep-alive connections are reused across warm invocations).
+# One Lambda instance serves one request at a time, so a small pool suffices;
+# tight timeouts keep a dead socket from burning billed duration, and adaptive
+# retries throttle client-side instead of hammering a throttled table.
+dynamodb = boto3.resource('dynamodb', config=Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    connect_timeout=1,
+    read_timeout=3,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+))
 
 
-@dataclass
+@dataclass(slots=True)
 class CommentResult:
     """Result of comment operations."""
     success: bool
@@ -53,6 +73,94 @@ class CommentResult:
             self.metadata = {}
 
 
+# Response body fields, fetched from a CommentResult in a single attrgetter call
+_RESPONSE_FIELDS = (
+    'success', 'operation', 'comment_id', 'article_id', 'thread_id',
+    'comment_count', 'comments', 'errors', 'warnings', 'metadata'
+)
+_get_response_fields = attrgetter(*_RESPONSE_FIELDS)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the JSON encoder does not handle natively."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+
+def _serialize_body(body: Dict[str, Any]) -> str:
+    """Serialize a response body once for the API Gateway proxy integration."""
+    if orjson is not None:
+        return orjson.dumps(body, default=_json_default).decode()
+    return json.dumps(body, default=_json_default)
+
+
+def _response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a Lambda proxy response with a pre-serialized JSON body."""
+    return {
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': _serialize_body(body)
+    }
+
+
+def _to_dynamodb_type(value: Any) -> Any:
+    """Convert Python types to DynamoDB compatible types."""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    elif isinstance(value, dict):
+        return {k: _to_dynamodb_type(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_to_dynamodb_type(item) for item in value]
+    else:
+        return value
+
+
+def _from_dynamodb_types(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert DynamoDB types back to Python types."""
+    converted = {}
+    for key, value in item.items():
+        if isinstance(value, Decimal):
+            converted[key] = float(value)
+        elif isinstance(value, dict):
+            converted[key] = _from_dynamodb_types(value)
+        elif isinstance(value, list):
+            converted[key] = [
+                _from_dynamodb_types(item) if isinstance(item, dict)
+                else float(item) if isinstance(item, Decimal)
+                else item
+                for item in value
+            ]
+        else:
+            converted[key] = value
+    return converted
+
+
+def _accepts_gzip(event: Dict[str, Any]) -> bool:
+    """Check whether the API Gateway request advertises gzip support."""
+    headers = event.get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == 'accept-encoding':
+            return 'gzip' in (value or '').lower()
+    return False
+
+
+def _compress_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Gzip and base64-encode a proxy response body that is large enough to benefit."""
+    raw = response['body'].encode('utf-8')
+    if len(raw) < MIN_COMPRESSION_BYTES:
+        return response
+    
+    compressed = gzip.compress(raw, compresslevel=5)
+    return {
+        **response,
+        'headers': {**response['headers'], 'Content-Encoding': 'gzip'},
+        'isBase64Encoded': True,
+        'body': base64.b64encode(compressed).decode('ascii')
+    }
+
+
 class CommentError(Exception):
     """Custom exception for comment operations."""
     pass
@@ -67,6 +175,9 @@ class CommentModerator:
         'inappropriate', 'offensive', 'harassment'
     ]
     
+    # Banned words that force auto-moderation regardless of other flags
+    AUTO_MODERATE_WORDS = ('spam', 'scam')
+    
     # Maximum comment length
     MAX_COMMENT_LENGTH = 5000
     
@@ -95,12 +206,21 @@ class CommentModerator:
                 validation_result['flags'].append('too_long')
                 return validation_result
             
-            # Check for banned words
             content_lower = content.lower()
+            
+            # Basic HTML/script injection detection - invalidates the comment outright
+            if '<script' in content_lower or 'javascript:' in content_lower:
+                validation_result['is_valid'] = False
+                validation_result['flags'].append('potential_xss')
+                return validation_result
+            
+            # Check for banned words, stopping at the first auto-moderate term
             for banned_word in cls.BANNED_WORDS:
                 if banned_word in content_lower:
                     validation_result['flags'].append(f'banned_word_{banned_word}')
                     validation_result['warnings'].append(f'Contains potentially inappropriate content: {banned_word}')
+                    if banned_word in cls.AUTO_MODERATE_WORDS:
+                        break
             
             # Check for potential URLs (basic detection)
             url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
@@ -114,11 +234,6 @@ class CommentModerator:
                 validation_result['warnings'].append('Excessive capitalization detected')
                 validation_result['flags'].append('excessive_caps')
             
-            # Basic HTML/script injection detection
-            if '<script' in content_lower or 'javascript:' in content_lower:
-                validation_result['is_valid'] = False
-                validation_result['flags'].append('potential_xss')
-            
             # Sanitize content (basic HTML escape)
             sanitized = content.replace('<', '&lt;').replace('>', '&gt;').replace('&', '&amp;')
             validation_result['sanitized_content'] = sanitized
@@ -134,7 +249,8 @@ class CommentModerator:
     @classmethod
     def should_auto_moderate(cls, validation_result: Dict[str, Any]) -> bool:
         """Determine if comment should be auto-moderated."""
-        auto_moderate_flags = ['banned_word_spam', 'banned_word_scam', 'potential_xss']
+        auto_moderate_flags = [f'banned_word_{word}' for word in cls.AUTO_MODERATE_WORDS]
+        auto_moderate_flags.append('potential_xss')
         return any(flag in validation_result['flags'] for flag in auto_moderate_flags)
 
 
@@ -147,37 +263,35 @@ class ThreadManager:
     def build_comment_tree(self, comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Build hierarchical comment tree from flat comment list."""
         try:
-            # Create lookup maps
-            comment_map = {comment['comment_id']: comment for comment in comments}
-            root_comments = []
-            
-            # Add children list to each comment
-            for comment in comments:
-                comment['children'] = []
-                comment['depth'] = 0
-            
-            # Build tree structure
-            for comment in comments:
-                parent_id = comment.get('parent_comment_id')
-                if parent_id and parent_id in comment_map:
-                    # This is a reply
-                    parent_comment = comment_map[parent_id]
-                    parent_comment['children'].append(comment)
-                    comment['depth'] = parent_comment['depth'] + 1
+            # Parallel arrays over the flat list; nodes are referenced by index
+            parents = [comment.get('parent_comment_id') for comment in comments]
+            created = [comment.get('created_at', '') for comment in comments]
+            index = {comment['comment_id']: i for i, comment in enumerate(comments)}
+            
+            # Group children by visiting nodes in creation order, so every
+            # child list (and the root list) comes out already sorted
+            children: List[List[int]] = [[] for _ in comments]
+            roots = []
+            for i in sorted(range(len(comments)), key=created.__getitem__):
+                parent_index = index.get(parents[i]) if parents[i] else None
+                if parent_index is None:
+                    roots.append(i)
                 else:
-                    # This is a root comment
-                    root_comments.append(comment)
-            
-            # Sort comments by creation time
-            def sort_comments(comment_list):
-                comment_list.sort(key=lambda x: x.get('created_at', ''))
-                for comment in comment_list:
-                    if comment['children']:
-                        sort_comments(comment['children'])
-            
-            sort_comments(root_comments)
-            
-            return root_comments
+                    children[parent_index].append(i)
+            
+            # Single iterative DFS to attach children and assign depths
+            depths = [0] * len(comments)
+            stack = list(roots)
+            while stack:
+                i = stack.pop()
+                comment = comments[i]
+                comment['depth'] = depths[i]
+                comment['children'] = [comments[child] for child in children[i]]
+                for child in children[i]:
+                    depths[child] = depths[i] + 1
+                    stack.append(child)
+            
+            return [comments[i] for i in roots]
             
         except Exception as e:
             logger.error(f"Error building comment tree: {e}")
@@ -245,6 +359,69 @@ class ThreadManager:
             }
 
 
+class SearchQuery(NamedTuple):
+    """Compiled form of a comment search request."""
+    use_query: bool
+    request: Dict[str, Any]
+    author: Optional[str]
+    content_search: str
+    date_from: Optional[str]
+    date_to: Optional[str]
+    include_replies: bool
+
+
+def _freeze_params(value: Any) -> Any:
+    """Convert search parameters into a hashable, order-independent form."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze_params(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_params(item) for item in value)
+    return value
+
+
+def _build_search_query(search_params: Dict[str, Any]) -> SearchQuery:
+    """Compile search parameters into DynamoDB request kwargs and filters."""
+    article_id = search_params.get('article_id')
+    author = search_params.get('author')
+    limit = min(search_params.get('limit', 100), 1000)  # Cap at 1000
+    
+    if article_id:
+        request = {
+            'IndexName': 'article_id-created_at-index',
+            'KeyConditionExpression': Key('article_id').eq(article_id),
+            'Limit': limit
+        }
+    else:
+        request = {'Limit': limit}
+    
+    return SearchQuery(
+        use_query=bool(article_id),
+        request=request,
+        author=author.lower() if author else None,
+        content_search=search_params.get('content_search', '').lower(),
+        date_from=search_params.get('date_from'),
+        date_to=search_params.get('date_to'),
+        include_replies=search_params.get('include_replies', True)
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_frozen_search_query(frozen_params: frozenset) -> SearchQuery:
+    """Compile frozen search parameters, cached for repeated identical searches."""
+    return _build_search_query(dict(frozen_params))
+
+
+def _compile_search_query(search_params: Dict[str, Any]) -> SearchQuery:
+    """Compile search parameters, through the cache when they can be hashed."""
+    try:
+        frozen_params = _freeze_params(search_params)
+        hash(frozen_params)
+    except TypeError:
+        # Values such as sets cannot key the cache; compile them directly
+        return _build_search_query(search_params)
+    return _compile_frozen_search_query(frozen_params)
+
+
 class CommentSearchManager:
     """Handles comment search and filtering."""
     
@@ -254,26 +431,16 @@ class CommentSearchManager:
     def search_comments(self, search_params: Dict[str, Any]) -> CommentResult:
         """Search comments with various filters."""
         try:
-            # Extract search parameters
-            article_id = search_params.get('article_id')
-            author = search_params.get('author')
-            content_search = search_params.get('content_search', '').lower()
-            date_from = search_params.get('date_from')
-            date_to = search_params.get('date_to')
-            include_replies = search_params.get('include_replies', True)
-            limit = min(search_params.get('limit', 100), 1000)  # Cap at 1000
-            
-            # Build query
-            if article_id:
+            # Reuse the compiled query for repeated identical searches
+            query = _compile_search_query(search_params)
+            logger.debug(f"Search query cache: {_compile_frozen_search_query.cache_info()}")
+            
+            if query.use_query:
                 # Search within specific article
-                response = self.comments_table.query(
-                    IndexName='article_id-created_at-index',
-                    KeyConditionExpression=Key('article_id').eq(article_id),
-                    Limit=limit
-                )
+                response = self.comments_table.query(**query.request)
             else:
                 # Scan all comments (expensive operation)
-                response = self.comments_table.scan(Limit=limit)
+                response = self.comments_table.scan(**query.request)
             
             comments = response.get('Items', [])
             
@@ -284,22 +451,22 @@ class CommentSearchManager:
                 comment = self._convert_from_dynamodb_types(comment)
                 
                 # Author filter
-                if author and comment.get('author', '').lower() != author.lower():
+                if query.author and comment.get('author', '').lower() != query.author:
                     continue
                 
                 # Content search filter
-                if content_search and content_search not in comment.get('content', '').lower():
+                if query.content_search and query.content_search not in comment.get('content', '').lower():
                     continue
                 
                 # Date range filter
                 comment_date = comment.get('created_at', '')
-                if date_from and comment_date < date_from:
+                if query.date_from and comment_date < query.date_from:
                     continue
-                if date_to and comment_date > date_to:
+                if query.date_to and comment_date > query.date_to:
                     continue
                 
                 # Include/exclude replies filter
-                if not include_replies and comment.get('parent_comment_id'):
+                if not query.include_replies and comment.get('parent_comment_id'):
                     continue
                 
                 filtered_comments.append(comment)
@@ -327,24 +494,14 @@ class CommentSearchManager:
                 errors=[f"Search error: {str(e)}"]
             )
     
-    def _convert_from_dynamodb_types(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert DynamoDB types back to Python types."""
-        converted = {}
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                converted[key] = float(value)
-            elif isinstance(value, dict):
-                converted[key] = self._convert_from_dynamodb_types(value)
-            elif isinstance(value, list):
-                converted[key] = [
-                    self._convert_from_dynamodb_types(item) if isinstance(item, dict) 
-                    else float(item) if isinstance(item, Decimal) 
-                    else item 
-                    for item in value
-                ]
-            else:
-                converted[key] = value
-        return converted
+    _convert_from_dynamodb_types = staticmethod(_from_dynamodb_types)
+
+
+# DynamoDB BatchWriteItem limits and UnprocessedItems retry backoff
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BASE_DELAY = 0.2
+BATCH_WRITE_MAX_DELAY = 3.0
 
 
 class CommentaryAPI:
@@ -361,100 +518,24 @@ class CommentaryAPI:
                       visibility: str = 'public') -> CommentResult:
         """Create a new comment."""
         try:
-            comment_id = str(uuid.uuid4())
-            now = datetime.now(timezone.utc).isoformat()
-            
-            logger.info(f"Creating comment {comment_id} for article {article_id} by {author}")
+            logger.info(f"Creating comment for article {article_id} by {author}")
             
-            # Validate comment content
-            validation = CommentModerator.validate_comment_content(content)
-            if not validation['is_valid']:
-                return CommentResult(
-                    success=False,
-                    operation="create_comment",
-                    article_id=article_id,
-                    errors=[f"Content validation failed: {', '.join(validation['flags'])}"]
+            try:
+                # Article existence is enforced by the conditional write below
+                comment_item, validation = self._prepare_comment_item(
+                    article_id, author, content, parent_comment_id, visibility,
+                    check_article=False
                 )
-            
-            # Check if auto-moderation is needed
-            is_moderated = CommentModerator.should_auto_moderate(validation)
-            if is_moderated:
-                visibility = 'moderated'
-            
-            # Verify article exists
-            article_response = self.articles_table.get_item(Key={'article_id': article_id})
-            if 'Item' not in article_response:
+                self._write_new_comment(comment_item)
+            except CommentError as e:
                 return CommentResult(
                     success=False,
                     operation="create_comment",
                     article_id=article_id,
-                    errors=[f"Article {article_id} not found"]
+                    errors=[str(e)]
                 )
             
-            # Verify parent comment exists if specified
-            thread_id = comment_id  # Root comment is its own thread
-            depth = 0
-            
-            if parent_comment_id:
-                parent_response = self.comments_table.get_item(Key={'comment_id': parent_comment_id})
-                if 'Item' not in parent_response:
-                    return CommentResult(
-                        success=False,
-                        operation="create_comment",
-                        article_id=article_id,
-                        errors=[f"Parent comment {parent_comment_id} not found"]
-                    )
-                
-                parent_comment = parent_response['Item']
-                # Inherit thread_id from parent, or use parent's comment_id if it's a root comment
-                thread_id = parent_comment.get('thread_id', parent_comment_id)
-                depth = parent_comment.get('depth', 0) + 1
-                
-                # Limit nesting depth
-                if depth > 10:
-                    return CommentResult(
-                        success=False,
-                        operation="create_comment",
-                        article_id=article_id,
-                        errors=["Maximum comment nesting depth exceeded"]
-                    )
-            
-            # Create comment item
-            comment_item = {
-                'comment_id': comment_id,
-                'article_id': article_id,
-                'thread_id': thread_id,
-                'author': author,
-                'content': validation['sanitized_content'],
-                'parent_comment_id': parent_comment_id,
-                'depth': depth,
-                'visibility': visibility,
-                'is_moderated': is_moderated,
-                'moderation_flags': validation['flags'],
-                'created_at': now,
-                'updated_at': now,
-                'version': 1,
-                'like_count': 0,
-                'reply_count': 0
-            }
-            
-            # Store comment
-            self.comments_table.put_item(Item=comment_item)
-            
-            # Update parent comment reply count if this is a reply
-            if parent_comment_id:
-                self.comments_table.update_item(
-                    Key={'comment_id': parent_comment_id},
-                    UpdateExpression='ADD reply_count :inc',
-                    ExpressionAttributeValues={':inc': 1}
-                )
-            
-            # Update article comment count
-            self.articles_table.update_item(
-                Key={'article_id': article_id},
-                UpdateExpression='ADD comment_count :inc',
-                ExpressionAttributeValues={':inc': 1}
-            )
+            comment_id = comment_item['comment_id']
             
             logger.info(f"Successfully created comment {comment_id}")
             
@@ -463,12 +544,12 @@ class CommentaryAPI:
                 operation="create_comment",
                 comment_id=comment_id,
                 article_id=article_id,
-                thread_id=thread_id,
+                thread_id=comment_item['thread_id'],
                 metadata={
                     'author': author,
-                    'depth': depth,
-                    'visibility': visibility,
-                    'is_moderated': is_moderated,
+                    'depth': comment_item['depth'],
+                    'visibility': comment_item['visibility'],
+                    'is_moderated': comment_item['is_moderated'],
                     'moderation_flags': validation['flags'],
                     'warnings': validation['warnings']
                 }
@@ -483,6 +564,309 @@ class CommentaryAPI:
                 errors=[f"Creation error: {str(e)}"]
             )
     
+    def create_comments_batch(self, comments: List[Dict[str, Any]]) -> CommentResult:
+        """
+        Create multiple comments using DynamoDB BatchWriteItem.
+        
+        A comment may reply to an earlier comment of the same batch by giving its
+        position as parent_index instead of a parent_comment_id. Parents are
+        written before their replies, and replies to a parent that could not be
+        written are skipped.
+        """
+        try:
+            logger.info(f"Creating batch of {len(comments)} comments")
+            
+            errors = []
+            warnings = []
+            prepared: List[Optional[Dict[str, Any]]] = []
+            # Items grouped by reply depth within the batch, written in order
+            generations: List[List[Dict[str, Any]]] = []
+            generation_of: Dict[int, int] = {}
+            known_articles: Dict[str, bool] = {}
+            
+            for index, comment in enumerate(comments):
+                prepared.append(None)
+                article_id = comment.get('article_id')
+                author = comment.get('author')
+                content = comment.get('content')
+                parent_index = comment.get('parent_index')
+                
+                if not (article_id and author and content):
+                    errors.append(f"Comment {index}: article_id, author, and content are required")
+                    continue
+                
+                parent_item = None
+                if parent_index is not None:
+                    if not isinstance(parent_index, int) or not 0 <= parent_index < index:
+                        errors.append(
+                            f"Comment {index}: parent_index must refer to an earlier comment in the batch"
+                        )
+                        continue
+                    parent_item = prepared[parent_index]
+                    if parent_item is None:
+                        errors.append(f"Comment {index}: Parent comment {parent_index} in batch was not created")
+                        continue
+                
+                # Verify each distinct article once per batch
+                if article_id not in known_articles:
+                    article_response = self.articles_table.get_item(Key={'article_id': article_id})
+                    known_articles[article_id] = 'Item' in article_response
+                if not known_articles[article_id]:
+                    errors.append(f"Comment {index}: Article {article_id} not found")
+                    continue
+                
+                try:
+                    comment_item, validation = self._prepare_comment_item(
+                        article_id, author, content,
+                        parent_item['comment_id'] if parent_item else comment.get('parent_comment_id'),
+                        comment.get('visibility', 'public'),
+                        check_article=False,
+                        parent_comment=parent_item
+                    )
+                except CommentError as e:
+                    errors.append(f"Comment {index}: {e}")
+                    continue
+                
+                warnings.extend(f"Comment {index}: {warning}" for warning in validation['warnings'])
+                prepared[index] = comment_item
+                
+                generation = generation_of[parent_index] + 1 if parent_item else 0
+                generation_of[index] = generation
+                if generation == len(generations):
+                    generations.append([])
+                generations[generation].append(comment_item)
+            
+            created = []
+            failed_ids = set()
+            for items in generations:
+                writable = []
+                for item in items:
+                    if item['parent_comment_id'] in failed_ids:
+                        failed_ids.add(item['comment_id'])
+                        errors.append(f"Comment {item['comment_id']} skipped because its parent was not written")
+                    else:
+                        writable.append(item)
+                
+                unprocessed = self._batch_write_comments(writable)
+                unprocessed_ids = {item['comment_id'] for item in unprocessed}
+                failed_ids.update(unprocessed_ids)
+                created.extend(item for item in writable if item['comment_id'] not in unprocessed_ids)
+                for item in unprocessed:
+                    errors.append(f"Comment {item['comment_id']} was not written after retries")
+            
+            # Apply counter updates once per article / parent comment
+            article_counts: Dict[str, int] = {}
+            reply_counts: Dict[str, int] = {}
+            for item in created:
+                article_counts[item['article_id']] = article_counts.get(item['article_id'], 0) + 1
+                if item['parent_comment_id']:
+                    parent_id = item['parent_comment_id']
+                    reply_counts[parent_id] = reply_counts.get(parent_id, 0) + 1
+            
+            for parent_id, count in reply_counts.items():
+                self.comments_table.update_item(
+                    Key={'comment_id': parent_id},
+                    UpdateExpression='ADD reply_count :inc',
+                    ExpressionAttributeValues={':inc': count}
+                )
+            for article_id, count in article_counts.items():
+                self.articles_table.update_item(
+                    Key={'article_id': article_id},
+                    UpdateExpression='ADD comment_count :inc',
+                    ExpressionAttributeValues={':inc': count}
+                )
+            
+            logger.info(f"Created {len(created)} of {len(comments)} comments in batch")
+            
+            return CommentResult(
+                # An empty batch has nothing to fail
+                success=bool(created) or not comments,
+                operation="create_comments_batch",
+                comment_count=len(created),
+                errors=errors,
+                warnings=warnings,
+                metadata={
+                    'requested': len(comments),
+                    'created': len(created),
+                    'failed': len(comments) - len(created),
+                    'comment_ids': [item['comment_id'] for item in created],
+                    'article_ids': list(article_counts)
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"Error creating comment batch: {e}")
+            return CommentResult(
+                success=False,
+                operation="create_comments_batch",
+                errors=[f"Batch creation error: {str(e)}"]
+            )
+    
+    def _prepare_comment_item(self, article_id: str, author: str, content: str,
+                              parent_comment_id: Optional[str] = None,
+                              visibility: str = 'public',
+                              check_article: bool = True,
+                              parent_comment: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Validate a new comment and build its DynamoDB item.
+        
+        parent_comment is the parent's item when the caller already has it, such
+        as a parent created earlier in the same batch; it skips the parent lookup.
+        
+        Returns:
+            Tuple of (comment item, content validation result)
+            
+        Raises:
+            CommentError: If the comment cannot be created
+        """
+        comment_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+        
+        # Validate comment content
+        validation = CommentModerator.validate_comment_content(content)
+        if not validation['is_valid']:
+            raise CommentError(f"Content validation failed: {', '.join(validation['flags'])}")
+        
+        # Check if auto-moderation is needed
+        is_moderated = CommentModerator.should_auto_moderate(validation)
+        if is_moderated:
+            visibility = 'moderated'
+        
+        # Verify article exists
+        if check_article:
+            article_response = self.articles_table.get_item(Key={'article_id': article_id})
+            if 'Item' not in article_response:
+                raise CommentError(f"Article {article_id} not found")
+        
+        # Verify parent comment exists if specified
+        thread_id = comment_id  # Root comment is its own thread
+        depth = 0
+        
+        if parent_comment_id:
+            if parent_comment is None:
+                parent_response = self.comments_table.get_item(Key={'comment_id': parent_comment_id})
+                if 'Item' not in parent_response:
+                    raise CommentError(f"Parent comment {parent_comment_id} not found")
+                
+                parent_comment = parent_response['Item']
+            # Inherit thread_id from parent, or use parent's comment_id if it's a root comment
+            thread_id = parent_comment.get('thread_id', parent_comment_id)
+            depth = parent_comment.get('depth', 0) + 1
+            
+            # Limit nesting depth
+            if depth > 10:
+                raise CommentError("Maximum comment nesting depth exceeded")
+        
+        comment_item = {
+            'comment_id': comment_id,
+            'article_id': article_id,
+            'thread_id': thread_id,
+            'author': author,
+            'content': validation['sanitized_content'],
+            'parent_comment_id': parent_comment_id,
+            'depth': depth,
+            'visibility': visibility,
+            'is_moderated': is_moderated,
+            'moderation_flags': validation['flags'],
+            'created_at': now,
+            'updated_at': now,
+            'version': 1,
+            'like_count': 0,
+            'reply_count': 0
+        }
+        
+        return comment_item, validation
+    
+    def _write_new_comment(self, comment_item: Dict[str, Any]) -> None:
+        """
+        Store a new comment and bump its counters in a single TransactWriteItems call.
+        
+        The article comment count update is conditional on the article existing,
+        which replaces a separate GetItem on the articles table.
+        
+        Raises:
+            CommentError: If the article or parent comment does not exist
+        """
+        article_id = comment_item['article_id']
+        parent_comment_id = comment_item['parent_comment_id']
+        
+        transact_items = [
+            {
+                'Put': {
+                    'TableName': self.comments_table.name,
+                    'Item': comment_item,
+                    'ConditionExpression': 'attribute_not_exists(comment_id)'
+                }
+            },
+            {
+                'Update': {
+                    'TableName': self.articles_table.name,
+                    'Key': {'article_id': article_id},
+                    'UpdateExpression': 'ADD comment_count :inc',
+                    'ConditionExpression': 'attribute_exists(article_id)',
+                    'ExpressionAttributeValues': {':inc': 1}
+                }
+            }
+        ]
+        
+        # Update parent comment reply count if this is a reply
+        if parent_comment_id:
+            transact_items.append({
+                'Update': {
+                    'TableName': self.comments_table.name,
+                    'Key': {'comment_id': parent_comment_id},
+                    'UpdateExpression': 'ADD reply_count :inc',
+                    'ConditionExpression': 'attribute_exists(comment_id)',
+                    'ExpressionAttributeValues': {':inc': 1}
+                }
+            })
+        
+        try:
+            self.comments_table.meta.client.transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+                raise
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+            if len(reasons) > 1 and reasons[1] == 'ConditionalCheckFailed':
+                raise CommentError(f"Article {article_id} not found")
+            if len(reasons) > 2 and reasons[2] == 'ConditionalCheckFailed':
+                raise CommentError(f"Parent comment {parent_comment_id} not found")
+            raise
+    
+    def _batch_write_comments(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write comment items in BatchWriteItem chunks, retrying unprocessed items with backoff.
+        
+        Chunks are written sequentially so a large batch never floods the table.
+        
+        Returns:
+            Items that were still unprocessed after all retries
+        """
+        client = self.comments_table.meta.client
+        table_name = self.comments_table.name
+        failed = []
+        
+        for start in range(0, len(items), BATCH_WRITE_SIZE):
+            requests = [
+                {'PutRequest': {'Item': item}}
+                for item in items[start:start + BATCH_WRITE_SIZE]
+            ]
+            delay = BATCH_WRITE_BASE_DELAY
+            
+            for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+                response = client.batch_write_item(RequestItems={table_name: requests})
+                requests = response.get('UnprocessedItems', {}).get(table_name, [])
+                if not requests or attempt == BATCH_WRITE_MAX_RETRIES:
+                    break
+                
+                logger.warning(f"Retrying {len(requests)} unprocessed comment writes in {delay:.1f}s")
+                time.sleep(delay)
+                delay = min(delay * 2, BATCH_WRITE_MAX_DELAY)
+            
+            failed.extend(request['PutRequest']['Item'] for request in requests)
+        
+        return failed
+    
     def get_comments(self, article_id: str, include_moderated: bool = False,
                     format_as_tree: bool = True) -> CommentResult:
         """Get comments for an article."""
@@ -545,6 +929,16 @@ class CommentaryAPI:
     def update_comment(self, comment_id: str, updates: Dict[str, Any],
                       author: str) -> CommentResult:
         """Update an existing comment."""
+        # Nothing to change - skip the read and the write entirely
+        if not updates:
+            return CommentResult(
+                success=True,
+                operation="update_comment",
+                comment_id=comment_id,
+                warnings=["No updates provided; comment left unchanged"],
+                metadata={'updated_fields': []}
+            )
+        
         try:
             logger.info(f"Updating comment {comment_id}")
             
@@ -569,6 +963,9 @@ class CommentaryAPI:
                     errors=["Unauthorized to update this comment"]
                 )
             
+            # Work on a copy so the caller's updates are left untouched
+            updates = dict(updates)
+            
             # Validate content if being updated
             if 'content' in updates:
                 validation = CommentModerator.validate_comment_content(updates['content'])
@@ -696,144 +1093,222 @@ class CommentaryAPI:
                 errors=[f"Deletion error: {str(e)}"]
             )
     
-    def _convert_to_dynamodb_type(self, value: Any) -> Any:
-        """Convert Python types to DynamoDB compatible types."""
-        if isinstance(value, float):
-            return Decimal(str(value))
-        elif isinstance(value, dict):
-            return {k: self._convert_to_dynamodb_type(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [self._convert_to_dynamodb_type(item) for item in value]
-        else:
-            return value
-    
-    def _convert_from_dynamodb_types(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert DynamoDB types back to Python types."""
-        converted = {}
-        for key, value in item.items():
-            if isinstance(value, Decimal):
-                converted[key] = float(value)
-            elif isinstance(value, dict):
-                converted[key] = self._convert_from_dynamodb_types(value)
-            elif isinstance(value, list):
-                converted[key] = [
-                    self._convert_from_dynamodb_types(item) if isinstance(item, dict) 
-                    else float(item) if isinstance(item, Decimal) 
-                    else item 
-                    for item in value
+    def search_comments(self, search_params: Dict[str, Any]) -> CommentResult:
+        """Search comments with various filters."""
+        return self.search_manager.search_comments(search_params)
+    
+    # Resource-level Table API handles AttributeValue (de)serialization;
+    # these only map floats <-> Decimal and are shared module functions
+    _convert_to_dynamodb_type = staticmethod(_to_dynamodb_type)
+    _convert_from_dynamodb_types = staticmethod(_from_dynamodb_types)
+
+
+class CommentCache:
+    """In-process TTL cache of get_comments results for a warm Lambda container."""
+    
+    def __init__(self, ttl_seconds: float = 30.0, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[Tuple[str, bool, bool], Tuple[float, CommentResult]] = {}
+    
+    def get(self, key: Tuple[str, bool, bool]) -> Optional[CommentResult]:
+        """Get a cached result if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return result
+    
+    def put(self, key: Tuple[str, bool, bool], result: CommentResult) -> None:
+        """Cache a result, evicting the oldest entry when full."""
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+    
+    def invalidate(self, article_id: str) -> None:
+        """Drop all cached results for an article."""
+        for key in [k for k in self._entries if k[0] == article_id]:
+            del self._entries[key]
+    
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+
+# CloudWatch namespace for embedded metrics
+METRICS_NAMESPACE = 'Sentinel/Commentary'
+
+# Gzip responses for clients sending Accept-Encoding: gzip. The API Gateway
+# binary media types must cover the client's Accept type for API Gateway to
+# decode the base64 body, so this is opt-in.
+ENABLE_RESPONSE_COMPRESSION = os.environ.get('ENABLE_RESPONSE_COMPRESSION', 'false').lower() == 'true'
+MIN_COMPRESSION_BYTES = 1024
+
+# Table configuration, read once per container
+COMMENTS_TABLE = os.environ.get('COMMENTS_TABLE', 'sentinel-comments')
+ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'sentinel-articles')
+
+# get_comments result cache, shared across warm invocations
+ENABLE_COMMENTS_CACHE = os.environ.get('ENABLE_COMMENTS_CACHE', 'false').lower() == 'true'
+_comment_cache = CommentCache(float(os.environ.get('COMMENTS_CACHE_TTL_SECONDS', '30')))
+
+# Operations that change an article's comments and must invalidate the cache
+_MUTATING_OPERATIONS = frozenset({
+    'create_comment', 'create_comments_batch', 'update_comment', 'delete_comment'
+})
+
+
+@lru_cache(maxsize=1)
+def _get_api() -> 'CommentaryAPI':
+    """Get the CommentaryAPI instance cached for the warm Lambda container."""
+    return CommentaryAPI(COMMENTS_TABLE, ARTICLES_TABLE)
+
+
+class OperationSpec(NamedTuple):
+    """Routing entry for a commentary API operation."""
+    method: str
+    required: Tuple[str, ...]
+    defaults: Dict[str, Any]
+
+
+# Operation dispatch table: operation -> API method, required and optional event fields
+_OPERATIONS: Dict[str, OperationSpec] = {
+    'create_comment': OperationSpec(
+        'create_comment',
+        ('article_id', 'author', 'content'),
+        {'parent_comment_id': None, 'visibility': 'public'}
+    ),
+    'create_comments_batch': OperationSpec(
+        'create_comments_batch',
+        ('comments',),
+        {}
+    ),
+    'get_comments': OperationSpec(
+        'get_comments',
+        ('article_id',),
+        {'include_moderated': False, 'format_as_tree': True}
+    ),
+    'update_comment': OperationSpec(
+        'update_comment',
+        ('comment_id', 'author'),
+        {'updates': {}}
+    ),
+    'delete_comment': OperationSpec(
+        'delete_comment',
+        ('comment_id', 'author'),
+        {}
+    ),
+    'search_comments': OperationSpec(
+        'search_comments',
+        (),
+        {'search_params': {}}
+    ),
+}
+
+
+def _emit_metrics(operation: str, latency_ms: float, success: bool) -> None:
+    """
+    Emit per-operation metrics as a CloudWatch Embedded Metric Format log line.
+    
+    CloudWatch extracts the metrics from the log asynchronously, so no
+    PutMetricData round trip is made on the request path. The line is printed
+    rather than logged so the Lambda log prefix does not break the JSON.
+    """
+    print(_serialize_body({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Operation']],
+                'Metrics': [
+                    {'Name': 'Latency', 'Unit': 'Milliseconds'},
+                    {'Name': 'Success', 'Unit': 'Count'}
                 ]
-            else:
-                converted[key] = value
-        return converted
+            }]
+        },
+        # Unknown operations share one dimension value to bound metric cardinality
+        'Operation': operation if operation in _OPERATIONS else 'unknown',
+        'Latency': round(latency_ms, 3),
+        'Success': 1 if success else 0
+    }))
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Lambda handler for commentary API operations."""
+    started = time.perf_counter()
+    operation = event.get('operation', 'create_comment')
+    
+    response = _handle_operation(event, operation)
+    
+    if ENABLE_RESPONSE_COMPRESSION and _accepts_gzip(event):
+        response = _compress_response(response)
+    
+    _emit_metrics(operation, (time.perf_counter() - started) * 1000, response['statusCode'] == 200)
+    return response
+
+
+def _handle_operation(event: Dict[str, Any], operation: str) -> Dict[str, Any]:
+    """Route a commentary API event to its operation and build the response."""
     try:
-        # Extract operation
-        operation = event.get('operation', 'create_comment')
+        # Reuse commentary API across warm invocations
+        api = _get_api()
         
-        # Get configuration from environment
-        comments_table = os.environ.get('COMMENTS_TABLE', 'sentinel-comments')
-        articles_table = os.environ.get('ARTICLES_TABLE', 'sentinel-articles')
+        # Route to appropriate operation
+        spec = _OPERATIONS.get(operation)
+        if spec is None:
+            raise ValueError(f"Unknown operation: {operation}")
         
-        # Initialize commentary API
-        api = CommentaryAPI(comments_table, articles_table)
+        # Validate required fields in order, failing fast on the first missing one;
+        # an empty list is a valid (no-op) batch, an empty string is not
+        kwargs = {}
+        for field in spec.required:
+            value = event.get(field)
+            if value is None or (not value and not isinstance(value, list)):
+                raise ValueError(f"{field} is required")
+            kwargs[field] = value
+        for field, default in spec.defaults.items():
+            kwargs[field] = event.get(field, default)
         
-        # Route to appropriate operation
-        if operation == 'create_comment':
-            article_id = event.get('article_id')
-            author = event.get('author')
-            content = event.get('content')
-            parent_comment_id = event.get('parent_comment_id')
-            visibility = event.get('visibility', 'public')
-            
-            if not all([article_id, author, content]):
-                raise ValueError("article_id, author, and content are required")
-            
-            result = api.create_comment(article_id, author, content, parent_comment_id, visibility)
-            
-        elif operation == 'get_comments':
-            article_id = event.get('article_id')
-            include_moderated = event.get('include_moderated', False)
-            format_as_tree = event.get('format_as_tree', True)
-            
-            if not article_id:
-                raise ValueError("article_id is required")
-            
-            result = api.get_comments(article_id, include_moderated, format_as_tree)
-            
-        elif operation == 'update_comment':
-            comment_id = event.get('comment_id')
-            updates = event.get('updates', {})
-            author = event.get('author')
-            
-            if not all([comment_id, author]):
-                raise ValueError("comment_id and author are required")
-            
-            result = api.update_comment(comment_id, updates, author)
-            
-        elif operation == 'delete_comment':
-            comment_id = event.get('comment_id')
-            author = event.get('author')
-            
-            if not all([comment_id, author]):
-                raise ValueError("comment_id and author are required")
-            
-            result = api.delete_comment(comment_id, author)
-            
-        elif operation == 'search_comments':
-            search_params = event.get('search_params', {})
-            
-            result = api.search_manager.search_comments(search_params)
-            
+        if operation == 'get_comments' and ENABLE_COMMENTS_CACHE:
+            cache_key = (kwargs['article_id'], kwargs['include_moderated'], kwargs['format_as_tree'])
+            result = _comment_cache.get(cache_key)
+            if result is None:
+                result = api.get_comments(**kwargs)
+                if result.success:
+                    _comment_cache.put(cache_key, result)
         else:
-            raise ValueError(f"Unknown operation: {operation}")
+            result = getattr(api, spec.method)(**kwargs)
+            if operation in _MUTATING_OPERATIONS and result.success:
+                for article_id in result.metadata.get('article_ids', [result.article_id]):
+                    if article_id:
+                        _comment_cache.invalidate(article_id)
         
         # Format response
-        return {
-            'statusCode': 200 if result.success else 400,
-            'body': {
-                'success': result.success,
-                'operation': result.operation,
-                'comment_id': result.comment_id,
-                'article_id': result.article_id,
-                'thread_id': result.thread_id,
-                'comment_count': result.comment_count,
-                'comments': result.comments,
-                'errors': result.errors,
-                'warnings': result.warnings,
-                'metadata': result.metadata
-            }
-        }
+        return _response(
+            200 if result.success else 400,
+            dict(zip(_RESPONSE_FIELDS, _get_response_fields(result)))
+        )
+        
+    except ValueError as e:
+        # Bad request - the traceback adds nothing
+        logger.warning("Commentary API bad request for operation %s: %s", operation, e)
+        return _response(400, {
+            'success': False,
+            'error': str(e),
+            'error_type': type(e).__name__
+        })
         
     except Exception as e:
-        logger.error(f"Commentary API operation failed: {e}")
-        return {
-            'statusCode': 500,
-            'body': {
-                'success': False,
-                'error': str(e),
-                'error_type': type(e).__name__
-            }
-        }
-
+        logger.error(
+            "Commentary API operation %s failed (article_id=%s): %s",
+            operation, event.get('article_id'), e, exc_info=True
+        )
+        return _response(500, {
+            'success': False,
+            'error': str(e),
+            'error_type': type(e).__name__
+        })
 
-# For testing
-if __name__ == "__main__":
-    # Test event
-    test_event = {
-        "operation": "create_comment",
-        "article_id": "test-article-123",
-        "author": "analyst@example.com",
-        "content": "This article provides valuable insights into the Azure vulnerability. The CVE details are particularly useful for our security team.",
-        "visibility": "public"
-    }
-    
-    os.environ.update({
-        'COMMENTS_TABLE': 'test-comments',
-        'ARTICLES_TABLE': 'test-articles'
-    })
-    
-    result = lambda_handler(test_event, None)
-    print(json.dumps(result, indent=2))
\ No newline at end of file
@@ -9,28 +9,212 @@ OpenSearch k-NN search for comprehensive duplicate detection and cluster managem
 import hashlib
 import json
 import logging
+import os
 import re
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+import threading
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from math import sqrt
+from operator import itemgetter, mul
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass
 from urllib.parse import urlparse
 from difflib import SequenceMatcher
 
 import boto3
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from aws_requests_auth.aws_auth import AWSRequestsAuth
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # AWS clients
+boto_session = boto3.Session()
 bedrock_client = boto3.client('bedrock-runtime')
 dynamodb = boto3.resource('dynamodb')
 
+# Normalization patterns, compiled once per container
+_DATE_RE = re.compile(r'/\d{4}/\d{2}/\d{2}/')
+_NUMID_RE = re.compile(r'/\d+/')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+# ASCII characters _PUNCT_RE would replace, for the str.translate fast path
+_ASCII_PUNCT_TABLE = str.maketrans({c: ' ' for c in map(chr, range(128)) if _PUNCT_RE.match(c)})
+_PREFIX_RE = re.compile(r'^(?:(?:breaking|urgent|alert|update|exclusive):\s*)+')
+
+# Bedrock payload codecs; embedding responses carry ~1.5k floats, which orjson parses in C
+_dump_payload = orjson.dumps if orjson is not None else json.dumps
+_load_payload = orjson.loads if orjson is not None else json.loads
+
+# Embedding cache keyed by a hash of the model and embedded text. The in-memory
+# tier lives for the warm container; the optional DynamoDB tier is shared.
+# Both hold packed float32 arrays (~6 KB per 1536-dim embedding rather than
+# ~50 KB as a list of Python floats).
+EMBEDDINGS_CACHE_TABLE = os.environ.get('EMBEDDINGS_CACHE_TABLE')
+EMBEDDING_CACHE_MAX_SIZE = 1024
+EMBEDDING_CACHE_TTL_DAYS = 30
+_embedding_cache: Dict[str, array] = {}
+_embedding_cache_lock = threading.Lock()
+
+# Articles GSI partitioned by UTC publication day (YYYY-MM-DD), sorted by published_at.
+# Only articles carrying published_date are in it, so the index is read only once
+# the storage tool's backfill_published_dates operation has covered the table;
+# until then existing articles are scanned.
+PUBLISHED_DATE_INDEX = 'published_date-published_at-index'
+USE_PUBLISHED_DATE_INDEX = os.environ.get('USE_PUBLISHED_DATE_INDEX', 'false').lower() == 'true'
+EXISTING_ARTICLES_PROJECTION = 'article_id, #url, canonical_url, title, published_at, content_hash, cluster_id'
+SCAN_TOTAL_SEGMENTS = 8  # Parallel segments for the scan fallback
+
+# Decodes low-level DynamoDB items; the segment threads scan through the
+# thread-safe client rather than sharing a resource Table
+_ITEM_DESERIALIZER = TypeDeserializer()
+
+# Vector index settings; the Lucene engine uses SIMD for HNSW distance computations.
+# Byte vectors store each dimension as int8 (4x smaller than float32); indexed and
+# query vectors must use the same data type, so this only applies to new indexes.
+EMBEDDING_DIMENSION = 1536
+ENABLE_BYTE_VECTORS = os.environ.get('ENABLE_BYTE_VECTORS', 'false').lower() == 'true'
+VECTOR_DATA_TYPE = 'byte' if ENABLE_BYTE_VECTORS else 'float'
+VECTOR_INDEX_BODY = {
+    "settings": {"index": {"knn": True}},
+    "mappings": {
+        "properties": {
+            "article_id": {"type": "keyword"},
+            "title": {"type": "text"},
+            "url": {"type": "keyword"},
+            "published_at": {"type": "date"},
+            "indexed_at": {"type": "date"},
+            "embedding": {
+                "type": "knn_vector",
+                "dimension": EMBEDDING_DIMENSION,
+                "data_type": VECTOR_DATA_TYPE,
+                "method": {
+                    "name": "hnsw",
+                    "engine": "lucene",
+                    "space_type": "cosinesimil",
+                    "parameters": {"ef_construction": 256, "m": 16}
+                }
+            }
+        }
+    }
+}
+
+
+@lru_cache(maxsize=65536)
+def normalize_title(title: str) -> str:
+    """Normalize title for comparison."""
+    # Convert to lowercase
+    normalized = title.lower()
+    
+    # Remove common prefixes/suffixes (all of them end in a colon)
+    if ':' in normalized:
+        normalized = _PREFIX_RE.sub('', normalized, count=1)
+    
+    # Remove punctuation and extra whitespace; ASCII titles take the translate fast path
+    if normalized.isascii():
+        normalized = normalized.translate(_ASCII_PUNCT_TABLE)
+    else:
+        normalized = _PUNCT_RE.sub(' ', normalized)
+    
+    return ' '.join(normalized.split())
+
+
+@lru_cache(maxsize=65536)
+def normalize_url_path(url: str) -> str:
+    """Normalize URL path for comparison."""
+    try:
+        parsed = urlparse(url)
+        # Remove query parameters and fragments, normalize path
+        path = parsed.path.lower().strip('/')
+        # Remove common tracking parameters patterns
+        path = _DATE_RE.sub('/DATE/', path)  # Date patterns
+        path = _NUMID_RE.sub('/ID/', path)  # Numeric IDs
+        return path
+    except:
+        return url.lower()
+
+
+@lru_cache(maxsize=65536)
+def url_path_shingles(path: str, size: int = 4) -> FrozenSet[str]:
+    """Return the character n-grams of a normalized URL path for Jaccard comparison."""
+    if len(path) <= size:
+        return frozenset((path,)) if path else frozenset()
+    return frozenset(path[i:i + size] for i in range(len(path) - size + 1))
+
+
+def quantize_embedding(embedding: List[float]) -> List[int]:
+    """Scale an embedding into the int8 range for byte k-NN vectors (cosine is scale-invariant)."""
+    max_abs = max((abs(v) for v in embedding), default=0.0)
+    if not max_abs:
+        return [0] * len(embedding)
+    scale = 127.0 / max_abs
+    return [round(v * scale) for v in embedding]
+
+
+def _index_vector(embedding: List[float]) -> List[Any]:
+    """Return the embedding in the representation the vector index stores."""
+    if VECTOR_DATA_TYPE == 'byte':
+        return quantize_embedding(embedding)
+    return embedding
+
+
+@lru_cache(maxsize=65536)
+def parse_published_at(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, memoized since the same rows are re-read every invocation."""
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return the datetime in UTC, treating naive values as already UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _vector_norm(vector: List[float]) -> float:
+    """Return the Euclidean norm of a vector."""
+    return sqrt(sum(map(mul, vector, vector)))
+
+
+def _cosine_score(a: List[float], a_norm: float, b: List[float], b_norm: float) -> float:
+    """Cosine similarity rescaled to [0, 1], the scale of OpenSearch cosinesimil scores."""
+    if not a_norm or not b_norm:
+        return 0.0
+    return (1.0 + sum(map(mul, a, b)) / (a_norm * b_norm)) / 2.0
+
+
+def _fingerprint_hash(value: str) -> str:
+    """Return a 128-bit hex digest used for title/URL fingerprints."""
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
 
-@dataclass
+
+@dataclass(slots=True)
 class DuplicationResult:
     """Represents the result of deduplication analysis."""
     is_duplicate: bool
@@ -40,13 +224,26 @@ class DuplicationResult:
     method: str = "heuristic"  # "heuristic" or "semantic"
     rationale: str = ""
     similar_articles: List[Dict[str, Any]] = None
+    existing_cluster_id: Optional[str] = None  # duplicate_of's cluster, when already known
     
     def __post_init__(self):
         if self.similar_articles is None:
             self.similar_articles = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict without dataclasses.asdict's recursive deep copy."""
+        return {
+            'is_duplicate': self.is_duplicate,
+            'cluster_id': self.cluster_id,
+            'duplicate_of': self.duplicate_of,
+            'similarity_score': self.similarity_score,
+            'method': self.method,
+            'rationale': self.rationale,
+            'similar_articles': [dict(a) for a in self.similar_articles]
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ArticleFingerprint:
     """Represents key identifying features of an article for deduplication."""
     article_id: str
@@ -59,6 +256,41 @@ class ArticleFingerprint:
     content_hash: str
     title_hash: str
     url_hash: str
+    normalized_path: str = ""
+    path_shingles: FrozenSet[str] = frozenset()
+    cluster_id: Optional[str] = None
+
+
+class DomainBucket(NamedTuple):
+    """Existing articles of one domain, oldest first, with their UTC publication times."""
+    articles: List[ArticleFingerprint]
+    published: List[datetime]
+
+
+@lru_cache(maxsize=8)
+def _get_opensearch_client(opensearch_endpoint: str, region: str) -> OpenSearch:
+    """Build an OpenSearch client once per endpoint and reuse it across warm invocations."""
+    # Parse endpoint to get host and port
+    if opensearch_endpoint.startswith('https://'):
+        host = opensearch_endpoint[8:]
+        port = 443
+        use_ssl = True
+    else:
+        host = opensearch_endpoint
+        port = 9200
+        use_ssl = False
+    
+    # Create AWS auth; the shared session resolves the credential chain only once
+    credentials = boto_session.get_credentials()
+    awsauth = AWSRequestsAuth(credentials, region, 'es')
+    
+    return OpenSearch(
+        hosts=[{'host': host, 'port': port}],
+        http_auth=awsauth,
+        use_ssl=use_ssl,
+        verify_certs=True,
+        connection_class=RequestsHttpConnection
+    )
 
 
 class DedupToolError(Exception):
@@ -66,22 +298,37 @@ class DedupToolError(Exception):
     pass
 
 
+# Same-batch copy checks: method -> (similarity, rationale)
+_BATCH_COPY_MATCHES = {
+    'content_hash_match': (1.0, "Identical content hash found in the same batch"),
+    'exact_url_match': (1.0, "Exact URL match found in the same batch"),
+    'canonical_url_match': (0.95, "Canonical URL match found in the same batch"),
+}
+
+
 class HeuristicDeduplicator:
     """Handles heuristic-based deduplication using URL, title, and domain comparison."""
     
     def __init__(self):
         self.title_similarity_threshold = 0.85
-        self.url_similarity_threshold = 0.90
+        # URL paths are scored by 4-gram Jaccard, which runs well below a
+        # SequenceMatcher ratio: a one-character or one-ID edit scores ~0.64-0.85,
+        # while unrelated paths sharing a section prefix stay at or under ~0.5
+        self.url_similarity_threshold = 0.60
         self.time_window_hours = 72  # Consider articles within 72 hours for deduplication
     
     def find_heuristic_duplicates(self, article: ArticleFingerprint, 
-                                 existing_articles: List[ArticleFingerprint]) -> DuplicationResult:
+                                 existing_articles: List[ArticleFingerprint],
+                                 domain_index: Optional[Dict[str, DomainBucket]] = None
+                                 ) -> DuplicationResult:
         """
         Find duplicates using heuristic methods.
         
         Args:
             article: Article to check for duplicates
             existing_articles: List of existing articles to compare against
+            domain_index: Optional existing articles grouped by domain, as built by
+                build_domain_index; avoids rescanning every article for title checks
             
         Returns:
             DuplicationResult with heuristic analysis
@@ -93,6 +340,17 @@ class HeuristicDeduplicator:
             time_filtered = self._filter_by_time_window(article, existing_articles)
             logger.info(f"Checking against {len(time_filtered)} articles within time window")
             
+            # Identical content short-circuits every string comparison below
+            if article.content_hash:
+                content_duplicate = next(
+                    (a for a in time_filtered if a.content_hash == article.content_hash), None
+                )
+                if content_duplicate is not None:
+                    return self._create_duplicate_result(
+                        article, content_duplicate, 1.0, "content_hash_match",
+                        "Identical content hash found"
+                    )
+            
             # Check for exact URL matches
             url_duplicates = self._find_url_duplicates(article, time_filtered)
             if url_duplicates:
@@ -110,26 +368,31 @@ class HeuristicDeduplicator:
                 )
             
             # Check for title similarity within same domain
-            title_duplicates = self._find_title_duplicates(article, time_filtered)
-            if title_duplicates:
-                best_match = max(title_duplicates, key=lambda x: x['similarity'])
-                if best_match['similarity'] >= self.title_similarity_threshold:
-                    return self._create_duplicate_result(
-                        article, best_match['article'], best_match['similarity'], 
-                        "title_similarity",
-                        f"High title similarity ({best_match['similarity']:.2f}) within same domain"
-                    )
+            if domain_index is not None:
+                bucket = domain_index.get(article.domain)
+                same_domain = self._filter_by_time_window(
+                    article, bucket.articles, bucket.published
+                ) if bucket else []
+            else:
+                same_domain = time_filtered
+            title_match = self._find_title_duplicates(article, same_domain)
+            if title_match:
+                candidate, similarity = title_match
+                return self._create_duplicate_result(
+                    article, candidate, similarity,
+                    "title_similarity",
+                    f"High title similarity ({similarity:.2f}) within same domain"
+                )
             
             # Check for URL pattern similarity
-            url_pattern_duplicates = self._find_url_pattern_duplicates(article, time_filtered)
-            if url_pattern_duplicates:
-                best_match = max(url_pattern_duplicates, key=lambda x: x['similarity'])
-                if best_match['similarity'] >= self.url_similarity_threshold:
-                    return self._create_duplicate_result(
-                        article, best_match['article'], best_match['similarity'],
-                        "url_pattern_similarity",
-                        f"High URL pattern similarity ({best_match['similarity']:.2f})"
-                    )
+            url_pattern_match = self._find_url_pattern_duplicates(article, time_filtered)
+            if url_pattern_match:
+                candidate, similarity = url_pattern_match
+                return self._create_duplicate_result(
+                    article, candidate, similarity,
+                    "url_pattern_similarity",
+                    f"High URL pattern similarity ({similarity:.2f})"
+                )
             
             # No duplicates found
             return DuplicationResult(
@@ -143,10 +406,71 @@ class HeuristicDeduplicator:
             logger.error(f"Heuristic deduplication failed: {e}")
             raise DedupToolError(f"Heuristic deduplication failed: {e}")
     
+    def mark_batch_copies(self, articles: List[ArticleFingerprint],
+                          results: List[DuplicationResult]) -> None:
+        """
+        Point later copies of a story within one batch at its first occurrence.
+        
+        Batch articles are not stored yet, so the checks against existing
+        articles cannot see each other; identical content hashes, URLs and
+        canonical URLs are matched here. Results are replaced in place.
+        """
+        first_seen: Dict[Tuple[str, str], ArticleFingerprint] = {}
+        for i, article in enumerate(articles):
+            if results[i].is_duplicate:
+                continue
+            
+            keys = [
+                (method, value) for method, value in (
+                    ('content_hash_match', article.content_hash),
+                    ('exact_url_match', article.url),
+                    ('canonical_url_match', article.canonical_url)
+                ) if value
+            ]
+            match = next((key for key in keys if key in first_seen), None)
+            if match is not None:
+                method, _ = match
+                similarity, rationale = _BATCH_COPY_MATCHES[method]
+                results[i] = self._create_duplicate_result(
+                    article, first_seen[match], similarity, method, rationale
+                )
+                continue
+            
+            for key in keys:
+                first_seen.setdefault(key, article)
+    
+    def build_domain_index(self, articles: List[ArticleFingerprint]) -> Dict[str, DomainBucket]:
+        """
+        Group articles by domain so title checks only touch one bucket.
+        
+        Buckets are sorted by published_at and carry a parallel list of UTC
+        publication times, so the time window is applied with a binary search
+        instead of comparing every article. Build the index once and reuse it.
+        """
+        index: Dict[str, DomainBucket] = {}
+        for published, a in sorted(
+            ((_as_utc(a.published_at), a) for a in articles), key=itemgetter(0)
+        ):
+            bucket = index.get(a.domain)
+            if bucket is None:
+                bucket = index[a.domain] = DomainBucket([], [])
+            bucket.articles.append(a)
+            bucket.published.append(published)
+        return index
+    
     def _filter_by_time_window(self, article: ArticleFingerprint, 
-                              existing_articles: List[ArticleFingerprint]) -> List[ArticleFingerprint]:
-        """Filter articles within the time window."""
+                              existing_articles: List[ArticleFingerprint],
+                              published: Optional[List[datetime]] = None) -> List[ArticleFingerprint]:
+        """
+        Filter articles within the time window.
+        
+        When the articles are sorted by publication time, pass their UTC
+        publication times as published to locate the window by binary search.
+        """
         time_threshold = article.published_at - timedelta(hours=self.time_window_hours)
+        if published is not None:
+            start = bisect_left(published, _as_utc(time_threshold))
+            return [a for a in existing_articles[start:] if a.article_id != article.article_id]
         return [
             a for a in existing_articles 
             if a.published_at >= time_threshold and a.article_id != article.article_id
@@ -163,58 +487,109 @@ class HeuristicDeduplicator:
         return [a for a in candidates if a.canonical_url == article.canonical_url]
     
     def _find_title_duplicates(self, article: ArticleFingerprint,
-                             candidates: List[ArticleFingerprint]) -> List[Dict[str, Any]]:
-        """Find title-based duplicates within the same domain."""
-        duplicates = []
-        
+                             candidates: List[ArticleFingerprint]
+                             ) -> Optional[Tuple[ArticleFingerprint, float]]:
+        """Find the most similar title within the same domain, if above threshold."""
         # Only check articles from the same domain
         same_domain_articles = [a for a in candidates if a.domain == article.domain]
         
-        for candidate in same_domain_articles:
-            similarity = self._calculate_title_similarity(article.normalized_title, 
-                                                        candidate.normalized_title)
-            if similarity >= self.title_similarity_threshold:
-                duplicates.append({
-                    'article': candidate,
-                    'similarity': similarity
-                })
-        
-        return duplicates
+        return self._best_candidate(
+            article.normalized_title,
+            [a.normalized_title for a in same_domain_articles],
+            same_domain_articles,
+            self.title_similarity_threshold
+        )
     
     def _find_url_pattern_duplicates(self, article: ArticleFingerprint,
-                                   candidates: List[ArticleFingerprint]) -> List[Dict[str, Any]]:
-        """Find URL pattern-based duplicates."""
-        duplicates = []
-        article_path = self._normalize_url_path(article.url)
+                                   candidates: List[ArticleFingerprint]
+                                   ) -> Optional[Tuple[ArticleFingerprint, float]]:
+        """Find the most similar URL pattern, if above threshold."""
+        best_match = None
+        best_similarity = self.url_similarity_threshold
+        article_path = article.normalized_path or self._normalize_url_path(article.url)
+        article_shingles = article.path_shingles or url_path_shingles(article_path)
         
         for candidate in candidates:
-            candidate_path = self._normalize_url_path(candidate.url)
-            similarity = SequenceMatcher(None, article_path, candidate_path).ratio()
+            candidate_path = candidate.normalized_path or self._normalize_url_path(candidate.url)
+            if candidate_path == article_path:
+                return candidate, 1.0
             
-            if similarity >= self.url_similarity_threshold:
-                duplicates.append({
-                    'article': candidate,
-                    'similarity': similarity
-                })
+            candidate_shingles = candidate.path_shingles or url_path_shingles(candidate_path)
+            overlap = len(article_shingles & candidate_shingles)
+            union = len(article_shingles) + len(candidate_shingles) - overlap
+            similarity = overlap / union if union else 0.0
+            
+            if similarity > best_similarity or (best_match is None and similarity == best_similarity):
+                best_match = candidate
+                best_similarity = similarity
+        
+        return (best_match, best_similarity) if best_match is not None else None
+    
+    def _best_candidate(self, query: str, choices: List[str],
+                        candidates: List[ArticleFingerprint],
+                        threshold: float) -> Optional[Tuple[ArticleFingerprint, float]]:
+        """
+        Find the candidate whose string is most similar to the query.
+        
+        Identical strings return immediately with 1.0. Otherwise RapidFuzz scores
+        all choices in one extractOne call when available, falling back to a
+        reused SequenceMatcher that prunes on upper bounds against the best score
+        seen so far. Ties keep the earliest candidate.
+        
+        Args:
+            query: Normalized string for the article being checked
+            choices: Normalized strings, parallel to candidates
+            candidates: Candidate articles
+            threshold: Minimum similarity (0.0-1.0) to report
+            
+        Returns:
+            (candidate, similarity) for the best match at or above threshold, or None
+        """
+        if not choices:
+            return None
+        
+        try:
+            return candidates[choices.index(query)], 1.0
+        except ValueError:
+            pass
+        
+        if process is not None:
+            match = process.extractOne(
+                query, choices, scorer=fuzz.ratio, score_cutoff=threshold * 100
+            )
+            if match is None:
+                return None
+            _, score, index = match
+            return candidates[index], score / 100.0
         
-        return duplicates
+        # SequenceMatcher caches its analysis of seq2, so keep the query there and
+        # reject candidates on the cheap upper bounds before computing ratio()
+        best_match = None
+        best_similarity = threshold
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query)
+        for index, choice in enumerate(choices):
+            matcher.set_seq1(choice)
+            if matcher.real_quick_ratio() < best_similarity or matcher.quick_ratio() < best_similarity:
+                continue
+            similarity = matcher.ratio()
+            if similarity > best_similarity or (best_match is None and similarity == best_similarity):
+                best_match = candidates[index]
+                best_similarity = similarity
+        
+        return (best_match, best_similarity) if best_match is not None else None
     
     def _calculate_title_similarity(self, title1: str, title2: str) -> float:
         """Calculate similarity between two normalized titles."""
+        if title1 == title2:
+            return 1.0
+        if fuzz is not None:
+            return fuzz.ratio(title1, title2) / 100.0
         return SequenceMatcher(None, title1, title2).ratio()
     
     def _normalize_url_path(self, url: str) -> str:
         """Normalize URL path for comparison."""
-        try:
-            parsed = urlparse(url)
-            # Remove query parameters and fragments, normalize path
-            path = parsed.path.lower().strip('/')
-            # Remove common tracking parameters patterns
-            path = re.sub(r'/\d{4}/\d{2}/\d{2}/', '/DATE/', path)  # Date patterns
-            path = re.sub(r'/\d+/', '/ID/', path)  # Numeric IDs
-            return path
-        except:
-            return url.lower()
+        return normalize_url_path(url)
     
     def _create_duplicate_result(self, article: ArticleFingerprint, 
                                duplicate_article: ArticleFingerprint,
@@ -232,7 +607,8 @@ class HeuristicDeduplicator:
                 'url': duplicate_article.url,
                 'similarity': similarity,
                 'published_at': duplicate_article.published_at.isoformat()
-            }]
+            }],
+            existing_cluster_id=duplicate_article.cluster_id
         )
 
 
@@ -246,6 +622,7 @@ class SemanticDeduplicator:
         self.embedding_model = embedding_model
         self.semantic_similarity_threshold = 0.85
         self.max_search_results = 10
+        self.max_embedding_workers = 16
         
         # Initialize OpenSearch client
         self.opensearch_client = self._create_opensearch_client()
@@ -253,37 +630,16 @@ class SemanticDeduplicator:
     def _create_opensearch_client(self) -> OpenSearch:
         """Create OpenSearch client with AWS authentication."""
         try:
-            import os
             region = os.environ.get('AWS_REGION', 'us-east-1')
-            
-            # Parse endpoint to get host and port
-            if self.opensearch_endpoint.startswith('https://'):
-                host = self.opensearch_endpoint[8:]
-                port = 443
-                use_ssl = True
-            else:
-                host = self.opensearch_endpoint
-                port = 9200
-                use_ssl = False
-            
-            # Create AWS auth
-            credentials = boto3.Session().get_credentials()
-            awsauth = AWSRequestsAuth(credentials, region, 'es')
-            
-            return OpenSearch(
-                hosts=[{'host': host, 'port': port}],
-                http_auth=awsauth,
-                use_ssl=use_ssl,
-                verify_certs=True,
-                connection_class=RequestsHttpConnection
-            )
+            return _get_opensearch_client(self.opensearch_endpoint, region)
             
         except Exception as e:
             logger.error(f"Failed to create OpenSearch client: {e}")
             raise DedupToolError(f"OpenSearch client creation failed: {e}")
     
     def find_semantic_duplicates(self, article_content: str, article_title: str,
-                               article_id: str) -> DuplicationResult:
+                               article_id: str,
+                               embedding: Optional[List[float]] = None) -> DuplicationResult:
         """
         Find semantic duplicates using embeddings and k-NN search.
         
@@ -291,6 +647,7 @@ class SemanticDeduplicator:
             article_content: Article content for embedding
             article_title: Article title
             article_id: Article ID to exclude from results
+            embedding: Precomputed embedding, e.g. from generate_embeddings_batch
             
         Returns:
             DuplicationResult with semantic analysis
@@ -299,116 +656,313 @@ class SemanticDeduplicator:
             logger.info(f"Running semantic deduplication for article: {article_id}")
             
             # Generate embedding for the article
-            embedding = self._generate_embedding(article_content, article_title)
+            if embedding is None:
+                embedding = self._generate_embedding(article_content, article_title)
             
             # Search for similar articles using k-NN
             similar_articles = self._search_similar_articles(embedding, article_id)
             
-            if not similar_articles:
-                return DuplicationResult(
-                    is_duplicate=False,
-                    similarity_score=0.0,
-                    method="semantic",
-                    rationale="No semantically similar articles found"
-                )
-            
-            # Find the best match
-            best_match = similar_articles[0]
-            similarity_score = best_match['_score']
-            
-            if similarity_score >= self.semantic_similarity_threshold:
-                return DuplicationResult(
-                    is_duplicate=True,
-                    duplicate_of=best_match['_source']['article_id'],
-                    similarity_score=similarity_score,
-                    method="semantic",
-                    rationale=f"High semantic similarity ({similarity_score:.3f}) found",
-                    similar_articles=[{
-                        'article_id': hit['_source']['article_id'],
-                        'title': hit['_source']['title'],
-                        'url': hit['_source']['url'],
-                        'similarity': hit['_score'],
-                        'published_at': hit['_source']['published_at']
-                    } for hit in similar_articles[:5]]
-                )
-            else:
-                return DuplicationResult(
-                    is_duplicate=False,
-                    similarity_score=similarity_score,
-                    method="semantic",
-                    rationale=f"Semantic similarity ({similarity_score:.3f}) below threshold",
-                    similar_articles=[{
-                        'article_id': hit['_source']['article_id'],
-                        'title': hit['_source']['title'],
-                        'url': hit['_source']['url'],
-                        'similarity': hit['_score'],
-                        'published_at': hit['_source']['published_at']
-                    } for hit in similar_articles[:3]]
-                )
+            return self._build_semantic_result(similar_articles)
                 
         except Exception as e:
             logger.error(f"Semantic deduplication failed: {e}")
             # Return non-duplicate result on failure to avoid blocking pipeline
+            return self._semantic_failure_result(e)
+    
+    def find_semantic_duplicates_batch(self, articles: List[Tuple[str, str, str]],
+                                       embeddings: Optional[List[Optional[List[float]]]] = None
+                                       ) -> List[DuplicationResult]:
+        """
+        Find semantic duplicates for several articles with one msearch round trip.
+        
+        Articles are not indexed yet, so the k-NN search cannot see other
+        articles of the same batch; the vectors of articles that are not
+        duplicates are also compared with each other, in input order.
+        
+        Args:
+            articles: (content, title, article_id) tuples
+            embeddings: Precomputed embeddings parallel to articles, None where
+                unavailable, e.g. from generate_embeddings_batch
+            
+        Returns:
+            DuplicationResult per article, in input order
+        """
+        if not articles:
+            return []
+        
+        try:
+            logger.info(f"Running batch semantic deduplication for {len(articles)} articles")
+            
+            if embeddings is None:
+                embeddings = self.generate_embeddings_batch([(content, title) for content, title, _ in articles])
+            results: List[Optional[DuplicationResult]] = [None] * len(articles)
+            searches = []
+            
+            for i, ((_, _, article_id), embedding) in enumerate(zip(articles, embeddings)):
+                if embedding is None:
+                    results[i] = self._semantic_failure_result("embedding generation failed")
+                    continue
+                searches.append(i)
+            
+            if searches:
+                body = []
+                for i in searches:
+                    body.append({'index': self.opensearch_index})
+                    body.append(self._build_knn_query(embeddings[i], articles[i][2]))
+                
+                response = self.opensearch_client.msearch(body=body)
+                
+                unique = []
+                for i, item in zip(searches, response['responses']):
+                    if 'error' in item:
+                        results[i] = self._semantic_failure_result(item['error'])
+                    else:
+                        results[i] = self._build_semantic_result(item['hits']['hits'])
+                        if not results[i].is_duplicate:
+                            unique.append(i)
+                
+                # Earlier unique articles of this batch, as (index, vector, norm)
+                batch_originals = []
+                for i in unique:
+                    norm = _vector_norm(embeddings[i])
+                    batch_match = self._find_batch_semantic_duplicate(
+                        articles, embeddings[i], norm, batch_originals
+                    )
+                    if batch_match is not None:
+                        results[i] = batch_match
+                        continue
+                    batch_originals.append((i, embeddings[i], norm))
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch semantic deduplication failed: {e}")
+            return [self._semantic_failure_result(e) for _ in articles]
+    
+    def _find_batch_semantic_duplicate(self, articles: List[Tuple[str, str, str]],
+                                       embedding: List[float], norm: float,
+                                       batch_originals: List[Tuple[int, List[float], float]]
+                                       ) -> Optional[DuplicationResult]:
+        """Return a duplicate result for the most similar earlier batch article above threshold."""
+        best_index = None
+        best_score = self.semantic_similarity_threshold
+        for index, other, other_norm in batch_originals:
+            score = _cosine_score(embedding, norm, other, other_norm)
+            if score > best_score or (best_index is None and score == best_score):
+                best_index = index
+                best_score = score
+        
+        if best_index is None:
+            return None
+        
+        _, title, article_id = articles[best_index]
+        return DuplicationResult(
+            is_duplicate=True,
+            duplicate_of=article_id,
+            similarity_score=best_score,
+            method="semantic",
+            rationale=f"High semantic similarity ({best_score:.3f}) to an article in the same batch",
+            similar_articles=[{
+                'article_id': article_id,
+                'title': title,
+                'similarity': best_score
+            }]
+        )
+    
+    def _build_semantic_result(self, similar_articles: List[Dict[str, Any]]) -> DuplicationResult:
+        """Turn k-NN hits into a DuplicationResult."""
+        if not similar_articles:
             return DuplicationResult(
                 is_duplicate=False,
                 similarity_score=0.0,
                 method="semantic",
-                rationale=f"Semantic analysis failed: {str(e)}"
+                rationale="No semantically similar articles found"
             )
+        
+        # Find the best match
+        best_match = similar_articles[0]
+        similarity_score = best_match['_score']
+        
+        if similarity_score >= self.semantic_similarity_threshold:
+            return DuplicationResult(
+                is_duplicate=True,
+                duplicate_of=best_match['_source']['article_id'],
+                similarity_score=similarity_score,
+                method="semantic",
+                rationale=f"High semantic similarity ({similarity_score:.3f}) found",
+                similar_articles=[{
+                    'article_id': hit['_source']['article_id'],
+                    'title': hit['_source']['title'],
+                    'url': hit['_source']['url'],
+                    'similarity': hit['_score'],
+                    'published_at': hit['_source']['published_at']
+                } for hit in similar_articles[:5]]
+            )
+        else:
+            return DuplicationResult(
+                is_duplicate=False,
+                similarity_score=similarity_score,
+                method="semantic",
+                rationale=f"Semantic similarity ({similarity_score:.3f}) below threshold",
+                similar_articles=[{
+                    'article_id': hit['_source']['article_id'],
+                    'title': hit['_source']['title'],
+                    'url': hit['_source']['url'],
+                    'similarity': hit['_score'],
+                    'published_at': hit['_source']['published_at']
+                } for hit in similar_articles[:3]]
+            )
+    
+    def _semantic_failure_result(self, error: Any) -> DuplicationResult:
+        """Non-duplicate result used when semantic analysis cannot run."""
+        return DuplicationResult(
+            is_duplicate=False,
+            similarity_score=0.0,
+            method="semantic",
+            rationale=f"Semantic analysis failed: {str(error)}"
+        )
     
     def _generate_embedding(self, content: str, title: str) -> List[float]:
-        """Generate embedding using Bedrock."""
+        """Generate embedding using Bedrock, reusing cached vectors for identical text."""
         try:
             # Combine title and content for embedding
             text_to_embed = f"{title}\n\n{content[:2000]}"  # Limit content length
             
+            cache_key = _fingerprint_hash(f"{self.embedding_model}\n{text_to_embed}")
+            cached = self._get_cached_embedding(cache_key)
+            if cached is not None:
+                return cached
+            
             response = bedrock_client.invoke_model(
                 modelId=self.embedding_model,
-                body=json.dumps({
+                body=_dump_payload({
                     "inputText": text_to_embed
                 })
             )
             
-            response_body = json.loads(response['body'].read())
-            return response_body['embedding']
+            response_body = _load_payload(response['body'].read())
+            embedding = response_body['embedding']
+            self._cache_embedding(cache_key, embedding)
+            return embedding
             
         except ClientError as e:
             logger.error(f"Bedrock embedding generation failed: {e}")
             raise DedupToolError(f"Embedding generation failed: {e}")
     
-    def _search_similar_articles(self, embedding: List[float], 
-                               exclude_article_id: str) -> List[Dict[str, Any]]:
-        """Search for similar articles using k-NN."""
+    def _get_cached_embedding(self, cache_key: str) -> Optional[List[float]]:
+        """Look up an embedding in memory, then in the DynamoDB cache table."""
+        with _embedding_cache_lock:
+            packed = _embedding_cache.get(cache_key)
+        if packed is not None:
+            return packed.tolist()
+        if not EMBEDDINGS_CACHE_TABLE:
+            return None
+        
         try:
-            query = {
-                "size": self.max_search_results,
-                "query": {
-                    "bool": {
-                        "must": [
-                            {
-                                "knn": {
-                                    "embedding": {
-                                        "vector": embedding,
-                                        "k": self.max_search_results
-                                    }
+            response = dynamodb.Table(EMBEDDINGS_CACHE_TABLE).get_item(
+                Key={'content_hash': cache_key},
+                ProjectionExpression='embedding'
+            )
+        except ClientError as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return None
+        
+        if 'Item' not in response:
+            return None
+        
+        packed = array('f', bytes(response['Item']['embedding']))
+        self._remember_embedding(cache_key, packed)
+        return packed.tolist()
+    
+    def _cache_embedding(self, cache_key: str, embedding: List[float]) -> None:
+        """Store an embedding in memory and, if configured, in DynamoDB."""
+        packed = array('f', embedding)
+        self._remember_embedding(cache_key, packed)
+        if not EMBEDDINGS_CACHE_TABLE:
+            return
+        
+        try:
+            dynamodb.Table(EMBEDDINGS_CACHE_TABLE).put_item(Item={
+                'content_hash': cache_key,
+                'embedding': packed.tobytes(),
+                'model': self.embedding_model,
+                'ttl': int((datetime.utcnow() + timedelta(days=EMBEDDING_CACHE_TTL_DAYS)).timestamp())
+            })
+        except ClientError as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+    
+    def _remember_embedding(self, cache_key: str, packed: array) -> None:
+        """Add a packed embedding to the in-memory cache, evicting the oldest entry when full."""
+        with _embedding_cache_lock:
+            if cache_key not in _embedding_cache and len(_embedding_cache) >= EMBEDDING_CACHE_MAX_SIZE:
+                del _embedding_cache[next(iter(_embedding_cache))]
+            _embedding_cache[cache_key] = packed
+    
+    def generate_embeddings_batch(self, articles: List[Tuple[str, str]]) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for several articles concurrently.
+        
+        Bedrock calls are network-bound, so they are fanned out over a thread
+        pool rather than issued one after another.
+        
+        Args:
+            articles: (content, title) pairs
+            
+        Returns:
+            Embeddings in input order; None where generation failed
+        """
+        if not articles:
+            return []
+        
+        def embed(article: Tuple[str, str]) -> Optional[List[float]]:
+            try:
+                return self._generate_embedding(*article)
+            except Exception as e:
+                logger.warning(f"Batch embedding generation failed: {e}")
+                return None
+        
+        if len(articles) == 1:
+            return [embed(articles[0])]
+        
+        max_workers = min(self.max_embedding_workers, len(articles))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(embed, articles))
+    
+    def _build_knn_query(self, embedding: List[float], exclude_article_id: str) -> Dict[str, Any]:
+        """Build the k-NN query body for an embedding."""
+        return {
+            "size": self.max_search_results,
+            "query": {
+                "bool": {
+                    "must": [
+                        {
+                            "knn": {
+                                "embedding": {
+                                    "vector": _index_vector(embedding),
+                                    "k": self.max_search_results
                                 }
                             }
-                        ],
-                        "must_not": [
-                            {
-                                "term": {
-                                    "article_id": exclude_article_id
-                                }
+                        }
+                    ],
+                    "must_not": [
+                        {
+                            "term": {
+                                "article_id": exclude_article_id
                             }
-                        ]
-                    }
-                },
-                "_source": ["article_id", "title", "url", "published_at"]
-            }
-            
+                        }
+                    ]
+                }
+            },
+            "_source": ["article_id", "title", "url", "published_at"]
+        }
+    
+    def _search_similar_articles(self, embedding: List[float], 
+                               exclude_article_id: str) -> List[Dict[str, Any]]:
+        """Search for similar articles using k-NN."""
+        try:
             response = self.opensearch_client.search(
                 index=self.opensearch_index,
-                body=query
+                body=self._build_knn_query(embedding, exclude_article_id)
             )
             
             return response['hits']['hits']
@@ -417,12 +971,32 @@ class SemanticDeduplicator:
             logger.error(f"OpenSearch k-NN search failed: {e}")
             raise DedupToolError(f"Semantic search failed: {e}")
     
+    def create_vector_index(self) -> bool:
+        """
+        Create the vector index with the Lucene HNSW engine if it does not exist.
+        
+        Returns:
+            True if the index was created, False if it already existed
+        """
+        if self.opensearch_client.indices.exists(index=self.opensearch_index):
+            return False
+        
+        self.opensearch_client.indices.create(index=self.opensearch_index, body=VECTOR_INDEX_BODY)
+        logger.info(f"Created vector index {self.opensearch_index}")
+        return True
+    
     def store_article_embedding(self, article_id: str, title: str, content: str,
-                              url: str, published_at: str) -> bool:
-        """Store article embedding in OpenSearch for future comparisons."""
+                              url: str, published_at: str,
+                              embedding: Optional[List[float]] = None) -> bool:
+        """
+        Store article embedding in OpenSearch for future comparisons.
+        
+        Pass the embedding the article was searched with; it is only generated
+        through Bedrock when not given.
+        """
         try:
-            # Generate embedding
-            embedding = self._generate_embedding(content, title)
+            if embedding is None:
+                embedding = self._generate_embedding(content, title)
             
             # Store in OpenSearch
             doc = {
@@ -430,7 +1004,7 @@ class SemanticDeduplicator:
                 "title": title,
                 "url": url,
                 "published_at": published_at,
-                "embedding": embedding,
+                "embedding": _index_vector(embedding),
                 "indexed_at": datetime.utcnow().isoformat()
             }
             
@@ -467,11 +1041,10 @@ class ClusterManager:
         """
         try:
             if duplicate_result.is_duplicate and duplicate_result.duplicate_of:
-                # Get cluster ID from the duplicate article
-                cluster_id = self._get_article_cluster(duplicate_result.duplicate_of)
-                if not cluster_id:
-                    # Create new cluster with the original article as canonical
-                    cluster_id = self._create_cluster(duplicate_result.duplicate_of)
+                # Reuse the original's cluster when the lookup already returned it;
+                # otherwise read it, creating it if it has none
+                cluster_id = (duplicate_result.existing_cluster_id
+                              or self._claim_cluster(duplicate_result.duplicate_of))
                 
                 # Update current article with cluster assignment
                 self._update_article_cluster(article_id, cluster_id, duplicate_result.duplicate_of)
@@ -488,21 +1061,31 @@ class ClusterManager:
             logger.error(f"Cluster assignment failed: {e}")
             raise DedupToolError(f"Cluster assignment failed: {e}")
     
-    def _get_article_cluster(self, article_id: str) -> Optional[str]:
-        """Get cluster ID for an article."""
+    def _claim_cluster(self, canonical_article_id: str) -> str:
+        """
+        Return the article's cluster ID, creating one if it has none.
+        
+        A single conditional update both reads and, when missing, sets the
+        cluster so concurrent assignments to the same original agree on one ID.
+        """
         try:
-            response = self.articles_table.get_item(
-                Key={'article_id': article_id},
-                ProjectionExpression='cluster_id'
+            response = self.articles_table.update_item(
+                Key={'article_id': canonical_article_id},
+                UpdateExpression=(
+                    "SET cluster_id = if_not_exists(cluster_id, :cluster_id), "
+                    "is_duplicate = if_not_exists(is_duplicate, :is_duplicate)"
+                ),
+                ExpressionAttributeValues={
+                    ':cluster_id': f"cluster_{canonical_article_id}",
+                    ':is_duplicate': False
+                },
+                ReturnValues='UPDATED_NEW'
             )
-            
-            if 'Item' in response:
-                return response['Item'].get('cluster_id')
-            return None
+            return response['Attributes']['cluster_id']
             
         except ClientError as e:
-            logger.error(f"Failed to get article cluster: {e}")
-            return None
+            logger.error(f"Failed to claim article cluster: {e}")
+            raise DedupToolError(f"Article cluster update failed: {e}")
     
     def _create_cluster(self, canonical_article_id: str) -> str:
         """Create a new cluster with the given article as canonical."""
@@ -562,15 +1145,11 @@ class DedupTool:
             article_id = article_data['article_id']
             logger.info(f"Starting deduplication analysis for article: {article_id}")
             
-            # Create article fingerprint
-            fingerprint = self._create_article_fingerprint(article_data)
-            
-            # Get existing articles for comparison
-            existing_articles = self._get_existing_articles(fingerprint.published_at)
-            
             # Step 1: Heuristic deduplication
+            fingerprint = self._create_article_fingerprint(article_data)
+            existing_articles, domain_index = self._load_existing_articles([fingerprint])
             heuristic_result = self.heuristic_deduplicator.find_heuristic_duplicates(
-                fingerprint, existing_articles
+                fingerprint, existing_articles, domain_index
             )
             
             if heuristic_result.is_duplicate:
@@ -579,10 +1158,12 @@ class DedupTool:
             
             # Step 2: Semantic deduplication (if enabled and heuristic didn't find duplicates)
             try:
+                content = article_data.get('normalized_content', '')
+                title = article_data.get('title', '')
+                # Embedded here so the searched vector is the one stored
+                [embedding] = self.semantic_deduplicator.generate_embeddings_batch([(content, title)])
                 semantic_result = self.semantic_deduplicator.find_semantic_duplicates(
-                    article_data.get('normalized_content', ''),
-                    article_data.get('title', ''),
-                    article_id
+                    content, title, article_id, embedding=embedding
                 )
                 
                 if semantic_result.is_duplicate:
@@ -590,13 +1171,7 @@ class DedupTool:
                     return semantic_result
                 
                 # Store embedding for future comparisons
-                self.semantic_deduplicator.store_article_embedding(
-                    article_id,
-                    article_data.get('title', ''),
-                    article_data.get('normalized_content', ''),
-                    article_data.get('url', ''),
-                    article_data.get('published_at', '')
-                )
+                self._store_embedding(article_data, embedding)
                 
                 return semantic_result
                 
@@ -608,6 +1183,98 @@ class DedupTool:
             logger.error(f"Deduplication analysis failed: {e}")
             raise DedupToolError(f"Deduplication failed: {e}")
     
+    def find_duplicates_batch(self, articles: List[Dict[str, Any]]) -> List[DuplicationResult]:
+        """
+        Perform deduplication analysis for several articles.
+        
+        Existing articles are read and indexed once for the whole batch, then
+        heuristics run per article and later copies of a batch article are
+        matched to it; the articles left over are embedded concurrently,
+        searched with a single OpenSearch msearch request and compared with
+        each other.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            DuplicationResult per article, in input order
+        """
+        try:
+            logger.info(f"Starting batch deduplication analysis for {len(articles)} articles")
+            
+            if not articles:
+                return []
+            
+            fingerprints = [self._create_article_fingerprint(article_data) for article_data in articles]
+            existing_articles, domain_index = self._load_existing_articles(fingerprints)
+            results = [
+                self.heuristic_deduplicator.find_heuristic_duplicates(
+                    fingerprint, existing_articles, domain_index
+                )
+                for fingerprint in fingerprints
+            ]
+            self.heuristic_deduplicator.mark_batch_copies(fingerprints, results)
+            pending = [i for i, result in enumerate(results) if not result.is_duplicate]
+            
+            if not pending:
+                return results
+            
+            try:
+                semantic_inputs = [
+                    (
+                        articles[i].get('normalized_content', ''),
+                        articles[i].get('title', ''),
+                        articles[i]['article_id']
+                    )
+                    for i in pending
+                ]
+                # Kept here so each stored vector is the one that was searched
+                embeddings = self.semantic_deduplicator.generate_embeddings_batch(
+                    [(content, title) for content, title, _ in semantic_inputs]
+                )
+                semantic_results = self.semantic_deduplicator.find_semantic_duplicates_batch(
+                    semantic_inputs, embeddings
+                )
+                
+                for i, embedding, semantic_result in zip(pending, embeddings, semantic_results):
+                    if not semantic_result.is_duplicate:
+                        self._store_embedding(articles[i], embedding)
+                    results[i] = semantic_result
+                    
+            except Exception as e:
+                logger.warning(f"Batch semantic deduplication failed, using heuristic results: {e}")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch deduplication analysis failed: {e}")
+            raise DedupToolError(f"Deduplication failed: {e}")
+    
+    def _load_existing_articles(self, fingerprints: List[ArticleFingerprint]
+                                ) -> Tuple[List[ArticleFingerprint], Dict[str, DomainBucket]]:
+        """
+        Read the existing articles covering every fingerprint's time window once
+        and index them by domain, so a batch shares one read and one index.
+        """
+        published = [fingerprint.published_at for fingerprint in fingerprints]
+        existing_articles = self._get_existing_articles(
+            max(published, key=_as_utc), earliest=min(published, key=_as_utc)
+        )
+        domain_index = self.heuristic_deduplicator.build_domain_index(existing_articles)
+        return existing_articles, domain_index
+    
+    def _store_embedding(self, article_data: Dict[str, Any],
+                         embedding: Optional[List[float]] = None) -> bool:
+        """Store an article's embedding for future comparisons."""
+        return self.semantic_deduplicator.store_article_embedding(
+            article_data['article_id'],
+            article_data.get('title', ''),
+            article_data.get('normalized_content', ''),
+            article_data.get('url', ''),
+            article_data.get('published_at', ''),
+            embedding=embedding
+        )
+    
     def assign_cluster(self, article_id: str, duplicate_result: DuplicationResult) -> str:
         """Assign article to appropriate cluster."""
         return self.cluster_manager.assign_cluster(article_id, duplicate_result)
@@ -624,14 +1291,15 @@ class DedupTool:
         domain = self._extract_domain(url)
         
         # Parse publication date
-        published_at = datetime.fromisoformat(
-            article_data.get('published_at', datetime.utcnow().isoformat()).replace('Z', '+00:00')
+        published_at = parse_published_at(
+            article_data.get('published_at', datetime.utcnow().isoformat())
         )
         
         # Generate hashes
         content_hash = article_data.get('content_hash', '')
-        title_hash = hashlib.md5(normalized_title.encode()).hexdigest()
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        title_hash = _fingerprint_hash(normalized_title)
+        normalized_path = normalize_url_path(url)
+        url_hash = _fingerprint_hash(url)
         
         return ArticleFingerprint(
             article_id=article_data['article_id'],
@@ -643,25 +1311,14 @@ class DedupTool:
             published_at=published_at,
             content_hash=content_hash,
             title_hash=title_hash,
-            url_hash=url_hash
+            url_hash=url_hash,
+            normalized_path=normalized_path,
+            path_shingles=url_path_shingles(normalized_path)
         )
     
     def _normalize_title(self, title: str) -> str:
         """Normalize title for comparison."""
-        # Convert to lowercase
-        normalized = title.lower()
-        
-        # Remove common prefixes/suffixes
-        prefixes = ['breaking:', 'urgent:', 'alert:', 'update:', 'exclusive:']
-        for prefix in prefixes:
-            if normalized.startswith(prefix):
-                normalized = normalized[len(prefix):].strip()
-        
-        # Remove punctuation and extra whitespace
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return normalize_title(title)
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
@@ -672,25 +1329,34 @@ class DedupTool:
             return ''
     
     def _get_existing_articles(self, published_at: datetime, 
-                             days_back: int = 7) -> List[ArticleFingerprint]:
-        """Get existing articles for comparison."""
+                             days_back: int = 7,
+                             earliest: Optional[datetime] = None) -> List[ArticleFingerprint]:
+        """
+        Get existing articles for comparison.
+        
+        The range ends at published_at and starts days_back before earliest,
+        which defaults to published_at; a batch passes its oldest article.
+        """
         try:
             # Calculate time range
-            start_time = published_at - timedelta(days=days_back)
+            start_time = (earliest or published_at) - timedelta(days=days_back)
             
-            # Query DynamoDB for recent articles
-            response = self.articles_table.scan(
-                FilterExpression='published_at BETWEEN :start_time AND :end_time',
-                ExpressionAttributeValues={
-                    ':start_time': start_time.isoformat(),
-                    ':end_time': published_at.isoformat()
-                },
-                ProjectionExpression='article_id, #url, canonical_url, title, published_at, content_hash'
-            )
+            items = None
+            if USE_PUBLISHED_DATE_INDEX:
+                try:
+                    items = self._query_articles_by_day(start_time, published_at)
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ValidationException':
+                        raise
+                    # Index not deployed on this table yet
+                    logger.warning(f"{PUBLISHED_DATE_INDEX} unavailable, falling back to scan: {e}")
+            if items is None:
+                items = self._scan_articles(start_time, published_at)
             
             articles = []
-            for item in response.get('Items', []):
+            for item in items:
                 try:
+                    normalized_path = normalize_url_path(item.get('url', ''))
                     fingerprint = ArticleFingerprint(
                         article_id=item['article_id'],
                         url=item.get('url', ''),
@@ -698,10 +1364,13 @@ class DedupTool:
                         title=item.get('title', ''),
                         normalized_title=self._normalize_title(item.get('title', '')),
                         domain=self._extract_domain(item.get('url', '')),
-                        published_at=datetime.fromisoformat(item['published_at'].replace('Z', '+00:00')),
+                        published_at=parse_published_at(item['published_at']),
                         content_hash=item.get('content_hash', ''),
                         title_hash='',
-                        url_hash=''
+                        url_hash='',
+                        normalized_path=normalized_path,
+                        path_shingles=url_path_shingles(normalized_path),
+                        cluster_id=item.get('cluster_id')
                     )
                     articles.append(fingerprint)
                 except Exception as e:
@@ -714,6 +1383,68 @@ class DedupTool:
         except ClientError as e:
             logger.error(f"Failed to retrieve existing articles: {e}")
             return []
+    
+    def _query_articles_by_day(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        """Query the published-date index one UTC day partition at a time."""
+        items = []
+        start_time = _as_utc(start_time)
+        end_time = _as_utc(end_time)
+        start_iso = start_time.isoformat()
+        end_iso = end_time.isoformat()
+        
+        day = start_time.date()
+        while day <= end_time.date():
+            query_kwargs = {
+                'IndexName': PUBLISHED_DATE_INDEX,
+                'KeyConditionExpression': (
+                    Key('published_date').eq(day.isoformat()) &
+                    Key('published_at').between(start_iso, end_iso)
+                ),
+                'ProjectionExpression': EXISTING_ARTICLES_PROJECTION,
+                'ExpressionAttributeNames': {'#url': 'url'}
+            }
+            while True:
+                response = self.articles_table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            day += timedelta(days=1)
+        
+        return items
+    
+    def _scan_articles(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        """Scan the articles table for the time range using parallel segments."""
+        client = self.articles_table.meta.client
+        scan_kwargs = {
+            'TableName': self.articles_table.name,
+            'FilterExpression': 'published_at BETWEEN :start_time AND :end_time',
+            'ExpressionAttributeValues': {
+                ':start_time': {'S': start_time.isoformat()},
+                ':end_time': {'S': end_time.isoformat()}
+            },
+            'ProjectionExpression': EXISTING_ARTICLES_PROJECTION,
+            'ExpressionAttributeNames': {'#url': 'url'},
+            'TotalSegments': SCAN_TOTAL_SEGMENTS
+        }
+        
+        def scan_segment(segment: int) -> List[Dict[str, Any]]:
+            segment_items = []
+            segment_kwargs = dict(scan_kwargs, Segment=segment)
+            while True:
+                response = client.scan(**segment_kwargs)
+                segment_items.extend(
+                    {name: _ITEM_DESERIALIZER.deserialize(value) for name, value in item.items()}
+                    for item in response.get('Items', [])
+                )
+                if 'LastEvaluatedKey' not in response:
+                    return segment_items
+                segment_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        with ThreadPoolExecutor(max_workers=SCAN_TOTAL_SEGMENTS) as executor:
+            segments = list(executor.map(scan_segment, range(SCAN_TOTAL_SEGMENTS)))
+        
+        return [item for segment_items in segments for item in segment_items]
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -730,16 +1461,24 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         "content_hash": "string",
         "normalized_content": "string"
     }
+    
+    A batch can be sent as {"articles": [<article>, ...]}; embeddings for the
+    batch are generated concurrently and the body carries a "results" list.
     """
     try:
+        articles = event.get('articles')
+        batch = articles is not None
+        if not batch:
+            articles = [event]
+        
         # Validate required parameters
         required_fields = ['article_id', 'url', 'title', 'published_at']
-        for field in required_fields:
-            if not event.get(field):
-                raise ValueError(f"Required field '{field}' is missing")
+        for article in articles:
+            for field in required_fields:
+                if not article.get(field):
+                    raise ValueError(f"Required field '{field}' is missing")
         
         # Get configuration from environment
-        import os
         articles_table_name = os.environ.get('ARTICLES_TABLE')
         opensearch_endpoint = os.environ.get('OPENSEARCH_ENDPOINT')
         opensearch_index = os.environ.get('OPENSEARCH_INDEX_VECTORS', 'sentinel-vectors')
@@ -756,24 +1495,35 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dedup_tool = DedupTool(articles_table_name, opensearch_endpoint, opensearch_index)
         
         # Perform deduplication analysis
-        result = dedup_tool.find_duplicates(event)
+        if batch:
+            results = dedup_tool.find_duplicates_batch(articles)
+        else:
+            results = [dedup_tool.find_duplicates(event)]
         
-        # Assign cluster if needed
-        cluster_id = None
-        if result.is_duplicate or not result.is_duplicate:  # Always assign cluster
-            cluster_id = dedup_tool.assign_cluster(event['article_id'], result)
-            result.cluster_id = cluster_id
+        # Always assign a cluster, new or existing
+        body_results = []
+        for article, result in zip(articles, results):
+            result.cluster_id = dedup_tool.assign_cluster(article['article_id'], result)
+            body_results.append({
+                'article_id': article['article_id'],
+                'cluster_id': result.cluster_id,
+                'result': result.to_dict()
+            })
         
-        # Convert result to dictionary
-        result_dict = asdict(result)
+        if batch:
+            return {
+                'statusCode': 200,
+                'body': {
+                    'success': True,
+                    'results': body_results
+                }
+            }
         
         return {
             'statusCode': 200,
             'body': {
                 'success': True,
-                'article_id': event['article_id'],
-                'cluster_id': cluster_id,
-                'result': result_dict
+                **body_results[0]
             }
         }
         
@@ -802,7 +1552,6 @@ if __name__ == "__main__":
         "normalized_content": "A major security breach has been discovered affecting thousands of users..."
     }
     
-    import os
     os.environ['ARTICLES_TABLE'] = 'test-articles'
     os.environ['OPENSEARCH_ENDPOINT'] = 'https://test-opensearch.us-east-1.es.amazonaws.com'
     
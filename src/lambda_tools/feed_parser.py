@@ -5,19 +5,41 @@ This Lambda function handles RSS/Atom feed parsing, HTML content normalization,
 metadata extraction, and S3 storage with content hashing.
 """
 
+import gzip
 import hashlib
+import html
 import json
 import logging
+import os
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import boto3
 import feedparser
 import requests
-from bs4 import BeautifulSoup
 from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from feedparser.datetimes import _date_handlers as _FEEDPARSER_DATE_HANDLERS
+except ImportError:
+    _FEEDPARSER_DATE_HANDLERS = None
+
+try:
+    import lxml.html as lxml_html
+    from lxml.etree import HTMLParser
+except ImportError:
+    lxml_html = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,64 +48,295 @@ logger.setLevel(logging.INFO)
 # AWS clients
 s3_client = boto3.client('s3')
 
+# Raw/normalized S3 puts run on a shared pool so uploads overlap with
+# parsing; threads are started lazily and reused across warm invocations
+S3_UPLOAD_WORKERS = 16
+_s3_upload_pool = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS)
+
+# HTTP session shared across warm invocations so pooled connections and TLS
+# sessions to feed hosts survive between handler calls
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Sentinel-Cybersecurity-Triage/1.0 (RSS Feed Parser)',
+    'Accept-Encoding': 'gzip, deflate'
+})
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount('https://', _http_adapter)
+_SESSION.mount('http://', _http_adapter)
+
+# Bytes fed to the incremental HTML parser, or read from the feed socket, per step
+STREAM_CHUNK_SIZE = 65536
+
+# gzip level for raw HTML / normalized JSON uploads; 5 trades little CPU
+# for most of the size reduction of level 9
+S3_GZIP_LEVEL = 5
+
+# Without lxml, text-only normalization of documents below this many
+# characters uses regexes instead of building a BeautifulSoup tree
+REGEX_FAST_PATH_MAX_CHARS = 65536
+
+# (connect, read) timeouts for feed downloads, in seconds
+FEED_REQUEST_TIMEOUT = (5, 30)
+
+# Title/meta/link/image metadata is only written to the normalized S3 JSON;
+# turn it off when nothing downstream reads it
+EXTRACT_METADATA = os.environ.get('FEED_PARSER_EXTRACT_METADATA', 'true').lower() == 'true'
+
+
+def _dump_json(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson's C encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# Precompiled patterns shared by every ContentNormalizer
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+_URL_RE = re.compile(r'https?://[^\s<>"\')]+')
+
+# Cap on distinct URLs kept per article, alongside the links/images limits
+MAX_EXTRACTED_URLS = 50
+
 
 class FeedParserError(Exception):
     """Custom exception for feed parsing errors."""
     pass
 
 
+def _make_soup(html_content: str) -> Any:
+    """Parse HTML with the C-backed lxml parser, falling back to html.parser."""
+    # bs4 only backs the non-lxml fallback, so keep it off the cold-start path
+    from bs4 import BeautifulSoup, FeatureNotFound
+    
+    try:
+        return BeautifulSoup(html_content, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(html_content, 'html.parser')
+
+
+@lru_cache(maxsize=2048)
+def _resolve_canonical(url: str, base_url: str) -> str:
+    """Resolve a possibly relative entry URL against the feed link (memoized)."""
+    try:
+        if not url:
+            return url
+        
+        parsed = urlparse(url)
+        if parsed.netloc:  # Already absolute
+            return url
+        
+        # Resolve relative URL
+        if base_url:
+            return urljoin(base_url, url)
+        
+        return url
+    except:
+        return url
+
+
+class _HTMLStreamCollector:
+    """
+    lxml parser target that collects text and metadata as the HTML streams in.
+    
+    No tree is built: text outside <script>/<style> is accumulated from data
+    events in document order, and title/meta/link/image metadata is captured
+    from start/end events unless ``extract_metadata`` is False.
+    """
+    
+    def __init__(self, extract_metadata: bool = True):
+        self.extract_metadata = extract_metadata
+        self.text_parts = []
+        self.metadata = {}
+        self.links = []
+        self.images = []
+        self._skip_depth = 0
+        self._title_parts = None
+        self._open_links = []
+    
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag in ('script', 'style'):
+            self._skip_depth += 1
+        elif not self.extract_metadata:
+            return
+        elif tag == 'title':
+            if 'html_title' not in self.metadata and self._title_parts is None:
+                self._title_parts = []
+        elif tag == 'meta':
+            name = attrib.get('name') or attrib.get('property')
+            content = attrib.get('content')
+            if name and content:
+                self.metadata[f'meta_{name}'] = content
+        elif tag == 'a':
+            href = attrib.get('href')
+            link = {'url': href, 'text': []} if href is not None else None
+            if link is not None:
+                self.links.append(link)
+            self._open_links.append(link)
+        elif tag == 'img':
+            src = attrib.get('src')
+            if src is not None:
+                self.images.append({
+                    'src': src,
+                    'alt': attrib.get('alt', ''),
+                    'title': attrib.get('title', '')
+                })
+    
+    def end(self, tag: str) -> None:
+        if tag in ('script', 'style'):
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == 'title' and self._title_parts is not None:
+            self.metadata['html_title'] = ''.join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag == 'a' and self._open_links:
+            self._open_links.pop()
+    
+    def data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self.text_parts.append(data)
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        for link in self._open_links:
+            if link is not None:
+                link['text'].append(data)
+    
+    def close(self) -> Tuple[str, Dict[str, Any]]:
+        metadata = self.metadata
+        metadata['links'] = [
+            {'url': link['url'], 'text': ''.join(link['text']).strip()}
+            for link in self.links[:10]  # Limit to first 10 links
+        ]
+        metadata['images'] = self.images[:5]  # Limit to first 5 images
+        return ''.join(self.text_parts), metadata
+
+
 class ContentNormalizer:
     """Handles HTML content normalization and metadata extraction."""
     
-    def __init__(self):
-        self.html_tag_pattern = re.compile(r'<[^>]+>')
-        self.whitespace_pattern = re.compile(r'\s+')
-        self.url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
-    
-    def normalize_html(self, html_content: str) -> Dict[str, Any]:
+    def normalize_html(self, html_content: str, extract_metadata: bool = True) -> Dict[str, Any]:
         """
         Normalize HTML content to clean text and extract metadata.
         
         Args:
             html_content: Raw HTML content
+            extract_metadata: When False, skip metadata collection and omit
+                the ``metadata`` key from the result
             
         Returns:
             Dictionary with normalized content and metadata
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Plain-text bodies (summary/title fallbacks) need no parser
+            if '<' not in html_content:
+                metadata = {'links': [], 'images': []} if extract_metadata else None
+                return self._build_normalized(html.unescape(html_content), metadata)
             
-            # Extract metadata
-            metadata = self._extract_metadata(soup)
+            if lxml_html is not None:
+                text, metadata = self._collect_with_lxml(html_content.encode('utf-8'), extract_metadata)
+            elif not extract_metadata and len(html_content) < REGEX_FAST_PATH_MAX_CHARS:
+                text, metadata = self._parse_with_regex(html_content), None
+            else:
+                text, metadata = self._parse_with_soup(html_content, extract_metadata)
             
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            return self._build_normalized(text, metadata)
             
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            clean_text = ' '.join(chunk for chunk in chunks if chunk)
+        except Exception as e:
+            logger.error(f"Error normalizing HTML content: {e}")
+            raise FeedParserError(f"HTML normalization failed: {e}")
+    
+    def normalize_html_stream(self, content: bytes, extract_metadata: bool = True) -> Dict[str, Any]:
+        """
+        Normalize UTF-8 encoded HTML by feeding it to lxml incrementally.
+        
+        Produces the same result as normalize_html without materializing a
+        DOM, so peak memory stays bounded on very large articles.
+        
+        Args:
+            content: Raw HTML content as UTF-8 bytes
+            extract_metadata: When False, skip metadata collection and omit
+                the ``metadata`` key from the result
             
-            # Extract URLs from content
-            urls = self.url_pattern.findall(clean_text)
+        Returns:
+            Dictionary with normalized content and metadata
+        """
+        if lxml_html is None:
+            return self.normalize_html(content.decode('utf-8', errors='replace'), extract_metadata)
+        
+        try:
+            if b'<' not in content:
+                text = html.unescape(content.decode('utf-8', errors='replace'))
+                metadata = {'links': [], 'images': []} if extract_metadata else None
+                return self._build_normalized(text, metadata)
             
-            return {
-                'normalized_text': clean_text,
-                'metadata': metadata,
-                'extracted_urls': list(set(urls)),
-                'word_count': len(clean_text.split()),
-                'character_count': len(clean_text)
-            }
+            return self._build_normalized(*self._collect_with_lxml(content, extract_metadata))
             
         except Exception as e:
             logger.error(f"Error normalizing HTML content: {e}")
             raise FeedParserError(f"HTML normalization failed: {e}")
     
-    def _extract_metadata(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _collect_with_lxml(self, content: bytes,
+                           extract_metadata: bool = True) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Extract text and metadata by streaming UTF-8 HTML through an lxml parser target.
+        
+        The single lxml path for both normalize_html and normalize_html_stream;
+        content must be non-empty, which callers ensure by checking for '<'.
+        """
+        parser = HTMLParser(target=_HTMLStreamCollector(extract_metadata), encoding='utf-8')
+        view = memoryview(content)
+        for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+            parser.feed(bytes(view[offset:offset + STREAM_CHUNK_SIZE]))
+        
+        text, metadata = parser.close()
+        return text, metadata if extract_metadata else None
+    
+    def _build_normalized(self, text: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Clean extracted text and assemble the normalized content dictionary."""
+        # Collapse all whitespace runs in a single regex pass
+        clean_text = _WS_RE.sub(' ', text).strip()
+        
+        # Extract distinct URLs in first-seen order, stopping at the cap
+        urls = {}
+        if 'http' in clean_text:
+            for match in _URL_RE.finditer(clean_text):
+                urls[match.group()] = None
+                if len(urls) >= MAX_EXTRACTED_URLS:
+                    break
+        
+        normalized = {
+            'normalized_text': clean_text,
+            'extracted_urls': list(urls),
+            'word_count': clean_text.count(' ') + 1 if clean_text else 0,
+            'character_count': len(clean_text)
+        }
+        if metadata is not None:
+            normalized['metadata'] = metadata
+        return normalized
+    
+    def _parse_with_regex(self, html_content: str) -> str:
+        """Extract text by stripping script/style blocks and tags with regexes."""
+        stripped = _SCRIPT_STYLE_RE.sub('', html_content)
+        return html.unescape(_HTML_TAG_RE.sub(' ', stripped))
+    
+    def _parse_with_soup(self, html_content: str,
+                         extract_metadata: bool = True) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Extract text and metadata through BeautifulSoup."""
+        soup = _make_soup(html_content)
+        metadata = self._extract_metadata(soup) if extract_metadata else None
+        
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        return soup.get_text(), metadata
+    
+    def _extract_metadata(self, soup: Any) -> Dict[str, Any]:
         """Extract metadata from HTML soup."""
         metadata = {}
         
@@ -125,13 +378,14 @@ class ContentNormalizer:
 class FeedParser:
     """Main feed parser class."""
     
-    def __init__(self, content_bucket: str):
+    def __init__(self, content_bucket: str, extract_metadata: Optional[bool] = None):
         self.content_bucket = content_bucket
+        self.extract_metadata = EXTRACT_METADATA if extract_metadata is None else extract_metadata
         self.normalizer = ContentNormalizer()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Sentinel-Cybersecurity-Triage/1.0 (RSS Feed Parser)'
-        })
+        self.session = _SESSION
+        # feedparser date handler that last parsed a string date; feeds use
+        # one format throughout, so it is tried before the full handler chain
+        self._winning_date_parser = None
     
     def parse_feed(self, feed_url: str, feed_id: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
@@ -148,29 +402,46 @@ class FeedParser:
         try:
             logger.info(f"Parsing feed: {feed_url}")
             
-            # Fetch feed content
-            response = self.session.get(feed_url, timeout=30)
-            response.raise_for_status()
+            # Fetch feed content, decompressing as chunks arrive off the socket
+            response = self.session.get(feed_url, stream=True, timeout=FEED_REQUEST_TIMEOUT)
+            try:
+                response.raise_for_status()
+                feed_content = b''.join(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            finally:
+                response.close()
             
             # Parse feed
-            feed = feedparser.parse(response.content)
+            feed = feedparser.parse(feed_content)
             
-            if feed.bozo and feed.bozo_exception:
-                logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
+            if feed.get('bozo') and feed.get('bozo_exception'):
+                logger.warning(f"Feed parsing warning for {feed_url}: {feed.get('bozo_exception')}")
             
             # Extract feed metadata
             feed_metadata = self._extract_feed_metadata(feed)
             
-            # Process entries
-            articles = []
-            for entry in feed.entries:
+            # Process entries, leaving their S3 uploads in flight
+            pending = []
+            all_uploads = []
+            for entry in feed.get('entries', []):
+                uploads = []
                 try:
-                    article = self._process_entry(entry, feed_id, feed_metadata, since)
+                    article = self._process_entry(entry, feed_id, feed_metadata, since, uploads)
                     if article:
-                        articles.append(article)
+                        pending.append((entry, article, uploads))
                 except Exception as e:
-                    logger.error(f"Error processing entry {getattr(entry, 'id', 'unknown')}: {e}")
-                    continue
+                    logger.error(f"Error processing entry {entry.get('id', 'unknown')}: {e}")
+                finally:
+                    all_uploads.extend(uploads)
+            
+            # Let every upload settle, then keep only articles whose content made it to S3
+            wait(all_uploads)
+            articles = []
+            for entry, article, uploads in pending:
+                error = next((upload.exception() for upload in uploads if upload.exception()), None)
+                if error:
+                    logger.error(f"Error processing entry {entry.get('id', 'unknown')}: {error}")
+                else:
+                    articles.append(article)
             
             logger.info(f"Successfully parsed {len(articles)} articles from {feed_url}")
             return articles
@@ -186,28 +457,36 @@ class FeedParser:
         """Extract metadata from feed."""
         metadata = {}
         
-        if hasattr(feed, 'feed'):
-            feed_info = feed.feed
+        # FeedParserDict.get skips the failed attribute lookup that getattr pays first
+        feed_info = feed.get('feed')
+        if feed_info is not None:
             metadata.update({
-                'title': getattr(feed_info, 'title', ''),
-                'description': getattr(feed_info, 'description', ''),
-                'link': getattr(feed_info, 'link', ''),
-                'language': getattr(feed_info, 'language', ''),
-                'updated': getattr(feed_info, 'updated', ''),
-                'generator': getattr(feed_info, 'generator', ''),
-                'rights': getattr(feed_info, 'rights', ''),
-                'tags': [tag.term for tag in getattr(feed_info, 'tags', [])]
+                'title': feed_info.get('title', ''),
+                'description': feed_info.get('description', ''),
+                'link': feed_info.get('link', ''),
+                'language': feed_info.get('language', ''),
+                'updated': feed_info.get('updated', ''),
+                'generator': feed_info.get('generator', ''),
+                'rights': feed_info.get('rights', ''),
+                'tags': [tag['term'] for tag in feed_info.get('tags', [])]
             })
         
         return metadata
     
-    def _process_entry(self, entry: Any, feed_id: str, feed_metadata: Dict[str, Any], 
-                      since: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
-        """Process a single feed entry."""
+    def _process_entry(self, entry: feedparser.FeedParserDict, feed_id: str, feed_metadata: Dict[str, Any], 
+                      since: Optional[datetime] = None,
+                      uploads: Optional[List[Future]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Process a single feed entry.
+        
+        When an ``uploads`` list is given, the S3 puts are submitted to the
+        upload pool and their futures appended to it for the caller to await;
+        otherwise the content is stored synchronously.
+        """
         try:
             # Extract basic information
-            title = getattr(entry, 'title', '').strip()
-            link = getattr(entry, 'link', '').strip()
+            title = entry.get('title', '').strip()
+            link = entry.get('link', '').strip()
             
             if not title or not link:
                 logger.warning("Skipping entry with missing title or link")
@@ -224,22 +503,37 @@ class FeedParser:
                 logger.warning(f"No content found for entry: {title}")
                 return None
             
-            # Generate content hash
-            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            # Encode once; the bytes feed the normalizer, the raw hash and the raw upload
+            content_bytes = content.encode('utf-8')
+            raw_hash = hashlib.sha256(content_bytes).hexdigest()
             
             # Normalize content
-            normalized = self.normalizer.normalize_html(content)
+            normalized = self.normalizer.normalize_html_stream(content_bytes, self.extract_metadata)
+            
+            # Hash the normalized text so syndicated copies that differ only in
+            # markup/boilerplate collide at the cheap hash tier of dedup
+            normalized_text = normalized['normalized_text']
+            if normalized_text:
+                content_hash = hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+            else:
+                content_hash = raw_hash
             
             # Store raw and normalized content in S3
-            raw_s3_uri = self._store_content_s3(content, f"raw/{feed_id}/{content_hash}.html")
-            normalized_s3_uri = self._store_content_s3(
-                json.dumps(normalized, indent=2), 
-                f"normalized/{feed_id}/{content_hash}.json"
-            )
+            raw_key = f"raw/{feed_id}/{raw_hash}.html"
+            normalized_key = f"normalized/{feed_id}/{content_hash}.json"
+            normalized_json = _dump_json(normalized)
+            if uploads is None:
+                raw_s3_uri = self._store_content_s3(content_bytes, raw_key)
+                normalized_s3_uri = self._store_content_s3(normalized_json, normalized_key)
+            else:
+                uploads.append(_s3_upload_pool.submit(self._store_content_s3, content_bytes, raw_key))
+                uploads.append(_s3_upload_pool.submit(self._store_content_s3, normalized_json, normalized_key))
+                raw_s3_uri = self._s3_uri(raw_key)
+                normalized_s3_uri = self._s3_uri(normalized_key)
             
             # Extract additional metadata
-            author = getattr(entry, 'author', '') or getattr(entry, 'author_detail', {}).get('name', '')
-            tags = [tag.term for tag in getattr(entry, 'tags', [])]
+            author = entry.get('author', '') or entry.get('author_detail', {}).get('name', '')
+            tags = [tag['term'] for tag in entry.get('tags', [])]
             
             # Build canonical URL
             canonical_url = self._get_canonical_url(link, feed_metadata.get('link', ''))
@@ -251,6 +545,7 @@ class FeedParser:
                 'published_at': published_at.isoformat() if published_at else None,
                 'author': author,
                 'content_hash': content_hash,
+                'raw_hash': raw_hash,
                 'raw_s3_uri': raw_s3_uri,
                 'normalized_s3_uri': normalized_s3_uri,
                 'normalized_content': normalized['normalized_text'],
@@ -259,8 +554,8 @@ class FeedParser:
                 'extracted_urls': normalized['extracted_urls'],
                 'tags': tags,
                 'feed_metadata': feed_metadata,
-                'entry_id': getattr(entry, 'id', link),
-                'summary': getattr(entry, 'summary', '').strip()
+                'entry_id': entry.get('id', link),
+                'summary': entry.get('summary', '').strip()
             }
             
             return article
@@ -269,13 +564,13 @@ class FeedParser:
             logger.error(f"Error processing entry: {e}")
             raise
     
-    def _parse_date(self, entry: Any) -> Optional[datetime]:
+    def _parse_date(self, entry: feedparser.FeedParserDict) -> Optional[datetime]:
         """Parse publication date from entry."""
         # Try different date fields
         date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
         
         for field in date_fields:
-            date_tuple = getattr(entry, field, None)
+            date_tuple = entry.get(field)
             if date_tuple:
                 try:
                     return datetime(*date_tuple[:6], tzinfo=timezone.utc)
@@ -285,11 +580,11 @@ class FeedParser:
         # Try string date fields
         string_fields = ['published', 'updated', 'created']
         for field in string_fields:
-            date_str = getattr(entry, field, None)
+            date_str = entry.get(field)
             if date_str:
                 try:
                     # feedparser usually handles this, but just in case
-                    parsed = feedparser._parse_date(date_str)
+                    parsed = self._parse_date_string(date_str)
                     if parsed:
                         return datetime(*parsed[:6], tzinfo=timezone.utc)
                 except:
@@ -297,18 +592,45 @@ class FeedParser:
         
         return None
     
-    def _extract_content(self, entry: Any) -> Optional[str]:
+    def _parse_date_string(self, date_str: str) -> Optional[Tuple[int, ...]]:
+        """
+        Parse a date string into a 9-tuple with feedparser's date handlers.
+        
+        Mirrors feedparser's own dispatcher, but tries the handler that won
+        the previous call first so consistently formatted feeds skip the
+        chain of failing handlers.
+        """
+        if _FEEDPARSER_DATE_HANDLERS is None:
+            return feedparser._parse_date(date_str)
+        
+        winner = self._winning_date_parser
+        handlers = _FEEDPARSER_DATE_HANDLERS
+        if winner is not None:
+            handlers = [winner] + [h for h in handlers if h is not winner]
+        
+        for handler in handlers:
+            try:
+                date9tuple = handler(date_str)
+            except (KeyError, OverflowError, ValueError, AttributeError):
+                continue
+            if date9tuple and len(date9tuple) == 9:
+                self._winning_date_parser = handler
+                return date9tuple
+        
+        return None
+    
+    def _extract_content(self, entry: feedparser.FeedParserDict) -> Optional[str]:
         """Extract content from entry."""
         # Try different content fields in order of preference
         content_fields = [
-            ('content', lambda x: x[0].value if x else None),
+            ('content', lambda x: x[0]['value'] if x else None),
             ('description', lambda x: x),
             ('summary', lambda x: x),
             ('title', lambda x: x)
         ]
         
         for field, extractor in content_fields:
-            content = getattr(entry, field, None)
+            content = entry.get(field)
             if content:
                 try:
                     extracted = extractor(content)
@@ -321,34 +643,52 @@ class FeedParser:
     
     def _get_canonical_url(self, url: str, base_url: str) -> str:
         """Get canonical URL by resolving relative URLs."""
-        try:
-            if not url:
-                return url
-            
-            parsed = urlparse(url)
-            if parsed.netloc:  # Already absolute
-                return url
-            
-            # Resolve relative URL
-            if base_url:
-                return urljoin(base_url, url)
-            
-            return url
-        except:
-            return url
+        return _resolve_canonical(url, base_url)
     
-    def _store_content_s3(self, content: str, key: str) -> str:
-        """Store content in S3 and return URI."""
+    def store_articles_manifest(self, articles: List[Dict[str, Any]], feed_id: str) -> str:
+        """
+        Write parsed articles to S3 as newline-delimited JSON and return its URI.
+        
+        Callers read the manifest line by line (or through S3 Select) instead of
+        receiving every article inline in the Lambda response.
+        """
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+        key = f"manifests/{feed_id}/{timestamp}.ndjson"
+        body = b'\n'.join(_dump_json(article) for article in articles)
+        return self._store_content_s3(body, key)
+    
+    def _s3_uri(self, key: str) -> str:
+        """Build the S3 URI for a key in the content bucket."""
+        return f"s3://{self.content_bucket}/{key}"
+    
+    def _store_content_s3(self, content: Union[str, bytes], key: str) -> str:
+        """
+        Store content (str or already UTF-8 encoded bytes) in S3 and return URI.
+        
+        HTML and JSON bodies are gzipped and stored with Content-Encoding: gzip.
+        """
         try:
+            body = content.encode('utf-8') if isinstance(content, str) else content
+            extra_args = {}
+            if key.endswith(('.html', '.json')):
+                body = gzip.compress(body, compresslevel=S3_GZIP_LEVEL)
+                extra_args['ContentEncoding'] = 'gzip'
+            if key.endswith('.html'):
+                content_type = 'text/html'
+            elif key.endswith('.ndjson'):
+                content_type = 'application/x-ndjson'
+            else:
+                content_type = 'application/json'
             s3_client.put_object(
                 Bucket=self.content_bucket,
                 Key=key,
-                Body=content.encode('utf-8'),
-                ContentType='text/html' if key.endswith('.html') else 'application/json',
-                ServerSideEncryption='AES256'
+                Body=body,
+                ContentType=content_type,
+                ServerSideEncryption='AES256',
+                **extra_args
             )
             
-            return f"s3://{self.content_bucket}/{key}"
+            return self._s3_uri(key)
             
         except ClientError as e:
             logger.error(f"Error storing content to S3: {e}")
@@ -363,8 +703,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     {
         "feed_id": "string",
         "feed_url": "string", 
-        "since": "ISO8601 datetime string (optional)"
+        "since": "ISO8601 datetime string (optional)",
+        "return_manifest": "boolean (optional)"
     }
+    
+    With "return_manifest" set, articles are written to an NDJSON manifest in
+    the content bucket and the body carries its "manifest_s3_uri" instead of
+    the inline "articles" list, keeping large feeds under the response limit.
     """
     try:
         # Extract parameters
@@ -384,7 +729,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 logger.warning(f"Invalid since parameter: {since_str}, ignoring: {e}")
         
         # Get S3 bucket from environment
-        import os
         content_bucket = os.environ.get('CONTENT_BUCKET')
         if not content_bucket:
             raise ValueError("CONTENT_BUCKET environment variable is required")
@@ -393,15 +737,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         parser = FeedParser(content_bucket)
         articles = parser.parse_feed(feed_url, feed_id, since)
         
+        body = {
+            'success': True,
+            'feed_id': feed_id,
+            'feed_url': feed_url,
+            'articles_count': len(articles)
+        }
+        if event.get('return_manifest'):
+            body['manifest_s3_uri'] = parser.store_articles_manifest(articles, feed_id)
+        else:
+            body['articles'] = articles
+        
         return {
             'statusCode': 200,
-            'body': {
-                'success': True,
-                'feed_id': feed_id,
-                'feed_url': feed_url,
-                'articles_count': len(articles),
-                'articles': articles
-            }
+            'body': body
         }
         
     except Exception as e:
@@ -425,7 +774,6 @@ if __name__ == "__main__":
         "since": "2024-01-01T00:00:00Z"
     }
     
-    import os
     os.environ['CONTENT_BUCKET'] = 'test-bucket'
     
     result = lambda_handler(test_event, None)
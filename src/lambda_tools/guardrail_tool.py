@@ -6,26 +6,184 @@ validation, PII detection and redaction, CVE format validation, hallucination de
 and bias/sensationalism filtering to ensure content quality and safety.
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from dataclasses import dataclass, replace
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import jsonschema
-from jsonschema import validate, ValidationError
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# AWS clients
-bedrock_client = boto3.client('bedrock-runtime')
-comprehend_client = boto3.client('comprehend')
+# Deadlines for the network-bound detections. Past them validation continues
+# without the result: PII falls back to the local patterns and bias to the
+# lexical checks, and the degraded result is not cached.
+#
+# The LLM bias prompt asks for a ~100-token JSON verdict, so Sonnet usually
+# answers in 2-4s. Below that the verdict is nearly always dropped; above it
+# every article waits longer whenever Bedrock is slow. Tune per deployment.
+PII_TIMEOUT_SECONDS = float(os.environ.get('GUARDRAIL_PII_TIMEOUT_SECONDS', '5.0'))
+LLM_BIAS_TIMEOUT_SECONDS = float(os.environ.get('GUARDRAIL_LLM_TIMEOUT_SECONDS', '6.0'))
+
+# Output cap for the LLM bias verdict; enough for the JSON object it returns
+LLM_BIAS_MAX_TOKENS = 200
+
+# AWS clients (keep-alive connections are reused across warm invocations).
+# Read timeouts match the deadlines above. A late Bedrock call is not retried,
+# so an abandoned call frees its worker soon after validation stops waiting;
+# Comprehend keeps standard-mode retries since batch PII detection fans out
+# calls in parallel and is prone to throttling.
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    connect_timeout=2
+)
+bedrock_client = boto3.client(
+    'bedrock-runtime',
+    config=_CLIENT_CONFIG.merge(Config(
+        read_timeout=LLM_BIAS_TIMEOUT_SECONDS,
+        retries={'max_attempts': 1, 'mode': 'standard'}
+    ))
+)
+comprehend_client = boto3.client(
+    'comprehend',
+    config=_CLIENT_CONFIG.merge(Config(
+        read_timeout=PII_TIMEOUT_SECONDS,
+        retries={'max_attempts': 3, 'mode': 'standard'}
+    ))
+)
+
+# Lowercase ASCII words, for whole-word sensational language checks
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Bedrock payload codecs; orjson encodes and parses in C when available
+_dump_payload = orjson.dumps if orjson is not None else json.dumps
+_load_payload = orjson.loads if orjson is not None else json.loads
+
+# Decodes the JSON object embedded in LLM responses in place
+_JSON_DECODER = json.JSONDecoder()
+
+# Every validation stage enabled; read-only since it is shared across calls
+DEFAULT_VALIDATION_CONFIG = MappingProxyType({
+    'validate_schema': True,
+    'detect_pii': True,
+    'validate_cves': True,
+    'detect_bias': True
+})
+
+_violation_confidence = attrgetter('confidence')
+
+# Rationale templates, filled with the per-type violation counts
+_RATIONALE_PASSED = "Content passed with minor issues: {}"
+_RATIONALE_FAILED = "Content failed validation due to: {}"
+
+# Quality check bounds
+TITLE_MIN_LENGTH = 10
+TITLE_MAX_LENGTH = 200
+CONTENT_MIN_LENGTH = 50
+
+# http(s) URL with a non-empty host of at most 253 characters (the DNS limit).
+# Anchored, and the host class excludes '/', so a failed match backtracks at
+# most 253 steps.
+_URL_RE = re.compile(r'\Ahttps?://[^\s/]{1,253}(?:/|\Z)')
+
+# UTF-8 bytes of text sent to Comprehend per PII detection call
+COMPREHEND_MAX_BYTES = 5000
+
+# Comprehend PII and Bedrock bias calls run here while the local checks proceed.
+# Separate pools keep slow LLM calls, which may outlive their deadline, from
+# queueing ahead of PII detection.
+_pii_pool = ThreadPoolExecutor(max_workers=4)
+_llm_pool = ThreadPoolExecutor(max_workers=2)
+
+# Results of recent validations keyed by a hash of the article and config, so
+# retries and reprocessing in a warm container skip the scans and LLM call.
+# Callers only ever receive copies, so a cached result is never mutated.
+RESULT_CACHE_MAX_SIZE = 1024
+_result_cache: Dict[str, 'GuardrailResult'] = {}
+_result_cache_lock = threading.Lock()
+
+# Regex sources for pattern-based PII detection, keyed by PII type.
+# Possessive quantifiers (Python 3.11+) mark runs that can never usefully give
+# characters back, so long digit/alphanumeric runs fail without backtracking.
+PII_PATTERNS = {
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'phone': r'\b(?:\+?1[-.\s]?+)?\(?[0-9]{3}\)?+[-.\s]?+[0-9]{3}[-.\s]?+[0-9]{4}\b',
+    'ssn': r'\b\d{3}-?\d{2}-?\d{4}\b',
+    'credit_card': r'\b(?:\d{4}[-\s]?){3}\d{4}\b',
+    'ip_address': r'\b(?:[0-9]{1,3}+\.){3}[0-9]{1,3}+\b',
+    'api_key': r'\b[A-Za-z0-9]{32,}+\b',
+    'password_hash': r'\$[0-9a-z]+\$[0-9]+\$[A-Za-z0-9+/=.]{22,}',
+}
+
+# Hyperscan never backtracks and rejects possessive syntax; drop the markers
+_POSSESSIVE_RE = re.compile(r'(?<=[?}])\+')
+
+# PII types in Hyperscan expression-id order
+_PII_TYPES = tuple(PII_PATTERNS)
+
+# All PII patterns as one alternation; lastgroup names the PII type matched
+_PII_COMBINED_RE = re.compile(
+    '|'.join(f'(?P<{pii_type}>{pattern})' for pii_type, pattern in PII_PATTERNS.items())
+)
+
+
+def _build_pii_database() -> Optional[Any]:
+    """Compile every PII pattern into one Hyperscan database, if available."""
+    if hyperscan is None:
+        return None
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[
+                _POSSESSIVE_RE.sub('', pattern).encode()
+                for pattern in PII_PATTERNS.values()
+            ],
+            ids=list(range(len(PII_PATTERNS))),
+            elements=len(PII_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(PII_PATTERNS)
+        )
+        return database
+    except hyperscan.HyperscanError as e:
+        logger.warning(f"Hyperscan PII database unavailable, using re: {e}")
+        return None
 
 
 class GuardrailViolationType(str, Enum):
@@ -49,6 +207,17 @@ class GuardrailViolation:
     location: Optional[str] = None
     suggested_fix: Optional[str] = None
     confidence: float = 1.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a response dict; the fields are flat, so no asdict deep copy."""
+        return {
+            'violation_type': self.violation_type.value,
+            'severity': self.severity,
+            'description': self.description,
+            'location': self.location,
+            'suggested_fix': self.suggested_fix,
+            'confidence': self.confidence
+        }
 
 
 @dataclass
@@ -58,6 +227,7 @@ class PIIDetectionResult:
     pii_entities: List[Dict[str, Any]]
     redacted_content: str
     confidence: float
+    complete: bool = True  # False when AWS Comprehend gave no answer and only patterns ran
 
 
 @dataclass
@@ -80,7 +250,24 @@ class JSONSchemaValidator:
     """Validates structured outputs against JSON schemas."""
     
     def __init__(self):
+        # jsonschema costs ~80ms to import; only load it once schemas are needed
+        from jsonschema import Draft202012Validator
+        
         self.schemas = self._load_schemas()
+        # Check and compile each schema once; validate_schema reuses the validators
+        self._validators = {}
+        for name, schema in self.schemas.items():
+            Draft202012Validator.check_schema(schema)
+            self._validators[name] = Draft202012Validator(schema)
+        
+        # fastjsonschema code-generated checks answer the common valid case;
+        # formats stay unchecked to match jsonschema's default behaviour
+        self._compiled = {}
+        if fastjsonschema is not None:
+            for name, schema in self.schemas.items():
+                self._compiled[name] = fastjsonschema.compile(
+                    schema, use_default=False, use_formats=False
+                )
     
     def _load_schemas(self) -> Dict[str, Dict]:
         """Load JSON schemas for validation."""
@@ -144,7 +331,8 @@ class JSONSchemaValidator:
         violations = []
         
         try:
-            if schema_name not in self.schemas:
+            validator = self._validators.get(schema_name)
+            if validator is None:
                 violations.append(GuardrailViolation(
                     violation_type=GuardrailViolationType.SCHEMA_VIOLATION,
                     severity="medium",
@@ -153,20 +341,27 @@ class JSONSchemaValidator:
                 ))
                 return violations
             
-            schema = self.schemas[schema_name]
-            validate(instance=data, schema=schema)
+            compiled = self._compiled.get(schema_name)
+            if compiled is not None:
+                try:
+                    compiled(data)
+                    logger.info(f"Schema validation passed for {schema_name}")
+                    return violations
+                except fastjsonschema.JsonSchemaException:
+                    pass  # Collect every error with jsonschema below
             
-            logger.info(f"Schema validation passed for {schema_name}")
+            for error in validator.iter_errors(data):
+                violations.append(GuardrailViolation(
+                    violation_type=GuardrailViolationType.SCHEMA_VIOLATION,
+                    severity="high",
+                    description=f"Schema validation failed: {error.message}",
+                    location=f"Path: {'.'.join(str(p) for p in error.absolute_path)}",
+                    suggested_fix="Fix the data structure to match the required schema",
+                    confidence=1.0
+                ))
             
-        except ValidationError as e:
-            violations.append(GuardrailViolation(
-                violation_type=GuardrailViolationType.SCHEMA_VIOLATION,
-                severity="high",
-                description=f"Schema validation failed: {e.message}",
-                location=f"Path: {'.'.join(str(p) for p in e.absolute_path)}",
-                suggested_fix="Fix the data structure to match the required schema",
-                confidence=1.0
-            ))
+            if not violations:
+                logger.info(f"Schema validation passed for {schema_name}")
             
         except Exception as e:
             violations.append(GuardrailViolation(
@@ -179,6 +374,27 @@ class JSONSchemaValidator:
         return violations
 
 
+@lru_cache(maxsize=1)
+def _get_schema_validator() -> JSONSchemaValidator:
+    """Get the JSONSchemaValidator cached for the warm Lambda container."""
+    return JSONSchemaValidator()
+
+
+_PII_DATABASE = _build_pii_database()
+
+# A Hyperscan scratch space serves one scan at a time, and detect_pii runs on
+# the detection pool as well as the caller's thread, so each thread has its own
+_pii_scratch = threading.local()
+
+
+def _get_pii_scratch() -> Any:
+    """Return this thread's scratch space for the PII database."""
+    scratch = getattr(_pii_scratch, 'scratch', None)
+    if scratch is None:
+        scratch = _pii_scratch.scratch = hyperscan.Scratch(_PII_DATABASE)
+    return scratch
+
+
 class PIIDetector:
     """Detects and redacts personally identifiable information."""
     
@@ -188,18 +404,11 @@ class PIIDetector:
             'PERSON', 'EMAIL', 'PHONE', 'SSN', 'CREDIT_CARD', 'BANK_ACCOUNT',
             'ADDRESS', 'DATE_TIME', 'PASSPORT_NUMBER', 'DRIVER_ID'
         ]
+        self.max_comprehend_workers = 8
     
     def _compile_pii_patterns(self) -> Dict[str, re.Pattern]:
         """Compile regex patterns for PII detection."""
-        return {
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'phone': re.compile(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'),
-            'ssn': re.compile(r'\b\d{3}-?\d{2}-?\d{4}\b'),
-            'credit_card': re.compile(r'\b(?:\d{4}[-\s]?){3}\d{4}\b'),
-            'ip_address': re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'),
-            'api_key': re.compile(r'\b[A-Za-z0-9]{32,}\b'),
-            'password_hash': re.compile(r'\$[0-9a-z]+\$[0-9]+\$[A-Za-z0-9+/=.]{22,}'),
-        }
+        return {pii_type: re.compile(pattern) for pii_type, pattern in PII_PATTERNS.items()}
     
     def detect_pii(self, content: str, title: str = "") -> PIIDetectionResult:
         """
@@ -212,20 +421,58 @@ class PIIDetector:
         Returns:
             PIIDetectionResult with detection results and redacted content
         """
-        try:
-            full_text = f"{title}\n\n{content}" if title else content
+        full_text = f"{title}\n\n{content}" if title else content
+        return self._build_result(full_text, content, self._detect_with_comprehend(full_text))
+    
+    def detect_pii_with_patterns(self, content: str, title: str = "") -> PIIDetectionResult:
+        """Detect PII with the local patterns only, skipping AWS Comprehend."""
+        full_text = f"{title}\n\n{content}" if title else content
+        return self._build_result(full_text, content, None)
+    
+    def detect_pii_batch(self, articles: List[Tuple[str, str]]) -> List[PIIDetectionResult]:
+        """
+        Detect PII in several articles, overlapping their Comprehend calls.
+        
+        Comprehend has no batch PII API, so the network-bound calls are fanned
+        out over a thread pool while pattern detection stays in this thread.
+        
+        Args:
+            articles: (content, title) pairs
             
+        Returns:
+            PIIDetectionResults in input order
+        """
+        if not articles:
+            return []
+        
+        full_texts = [f"{title}\n\n{content}" if title else content for content, title in articles]
+        max_workers = min(self.max_comprehend_workers, len(full_texts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            comprehend_results = list(executor.map(self._detect_with_comprehend, full_texts))
+        
+        return [
+            self._build_result(full_text, content, comprehend_entities)
+            for full_text, (content, _), comprehend_entities
+            in zip(full_texts, articles, comprehend_results)
+        ]
+    
+    def _build_result(self, full_text: str, content: str,
+                      comprehend_entities: Optional[List[Dict[str, Any]]]) -> PIIDetectionResult:
+        """
+        Combine pattern and AWS Comprehend entities into a redacted detection result.
+        
+        comprehend_entities is None when Comprehend gave no answer; the result
+        then holds pattern matches only and is marked incomplete.
+        """
+        try:
             # Step 1: Pattern-based detection
             pattern_entities = self._detect_with_patterns(full_text)
             
-            # Step 2: AWS Comprehend detection (if available)
-            comprehend_entities = self._detect_with_comprehend(full_text)
-            
             # Combine results
-            all_entities = pattern_entities + comprehend_entities
+            all_entities = pattern_entities + (comprehend_entities or [])
             
             # Remove duplicates and sort by position
-            unique_entities = self._deduplicate_entities(all_entities)
+            unique_entities = self._deduplicate_entities(all_entities, full_text)
             
             # Generate redacted content
             redacted_content = self._redact_content(full_text, unique_entities)
@@ -237,7 +484,8 @@ class PIIDetector:
                 has_pii=len(unique_entities) > 0,
                 pii_entities=unique_entities,
                 redacted_content=redacted_content,
-                confidence=confidence
+                confidence=confidence,
+                complete=comprehend_entities is not None
             )
             
         except Exception as e:
@@ -247,34 +495,71 @@ class PIIDetector:
                 has_pii=False,
                 pii_entities=[],
                 redacted_content=content,
-                confidence=0.5
+                confidence=0.5,
+                complete=False
             )
     
     def _detect_with_patterns(self, text: str) -> List[Dict[str, Any]]:
         """Detect PII using regex patterns."""
-        entities = []
+        # Hyperscan reports byte offsets, which only equal str offsets for ASCII
+        if _PII_DATABASE is not None and text.isascii():
+            return self._detect_with_hyperscan(text)
         
-        for pii_type, pattern in self.pii_patterns.items():
-            for match in pattern.finditer(text):
-                entities.append({
-                    'type': pii_type,
-                    'text': match.group(),
-                    'start': match.start(),
-                    'end': match.end(),
-                    'confidence': 0.9,
-                    'method': 'pattern'
-                })
+        # One finditer over the combined alternation instead of one per pattern
+        return [
+            {
+                'type': match.lastgroup,
+                'text': match.group(),
+                'start': match.start(),
+                'end': match.end(),
+                'confidence': 0.9,
+                'method': 'pattern'
+            }
+            for match in _PII_COMBINED_RE.finditer(text)
+        ]
+    
+    def _detect_with_hyperscan(self, text: str) -> List[Dict[str, Any]]:
+        """Detect PII with one Hyperscan pass over the text for all patterns."""
+        matches = []
+        _PII_DATABASE.scan(
+            text.encode('ascii'),
+            match_event_handler=lambda pattern_id, start, end, flags, context:
+                matches.append((pattern_id, start, -end)),
+            scratch=_get_pii_scratch()
+        )
+        
+        # Hyperscan reports every match end; keep the leftmost-longest,
+        # non-overlapping matches per pattern as finditer would
+        entities = []
+        matches.sort()
+        last_id = None
+        last_end = 0
+        for pattern_id, start, neg_end in matches:
+            if pattern_id != last_id:
+                last_id, last_end = pattern_id, 0
+            if start < last_end:
+                continue
+            last_end = -neg_end
+            entities.append({
+                'type': _PII_TYPES[pattern_id],
+                'text': text[start:last_end],
+                'start': start,
+                'end': last_end,
+                'confidence': 0.9,
+                'method': 'pattern'
+            })
         
         return entities
     
-    def _detect_with_comprehend(self, text: str) -> List[Dict[str, Any]]:
-        """Detect PII using AWS Comprehend."""
+    def _detect_with_comprehend(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Detect PII using AWS Comprehend; None if the call fails."""
         entities = []
         
         try:
-            # Limit text length for Comprehend API
-            if len(text) > 5000:
-                text = text[:5000]
+            # Limit the UTF-8 size sent to Comprehend, cutting on a character
+            # boundary; returned offsets are code points, i.e. str indices
+            if len(text) > COMPREHEND_MAX_BYTES // 4:  # Could exceed the cap in UTF-8
+                text = text.encode('utf-8')[:COMPREHEND_MAX_BYTES].decode('utf-8', errors='ignore')
             
             response = comprehend_client.detect_pii_entities(
                 Text=text,
@@ -294,43 +579,53 @@ class PIIDetector:
                     
         except ClientError as e:
             logger.warning(f"Comprehend PII detection failed: {e}")
+            return None
         except Exception as e:
             logger.warning(f"Comprehend PII detection error: {e}")
+            return None
         
         return entities
     
-    def _deduplicate_entities(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate PII entities."""
+    def _deduplicate_entities(self, entities: List[Dict[str, Any]],
+                              text: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Merge duplicate and overlapping PII entities into non-overlapping spans.
+        
+        A merged span covers every match it absorbs, so redaction never leaves
+        part of a match exposed, and takes its type from the most confident one.
+        """
         unique_entities = []
-        seen_spans = set()
         
-        # Sort by start position
-        entities.sort(key=lambda x: x['start'])
+        # Sort by start position, longest span first
+        entities.sort(key=lambda x: (x['start'], -x['end']))
         
         for entity in entities:
-            span = (entity['start'], entity['end'])
-            if span not in seen_spans:
-                unique_entities.append(entity)
-                seen_spans.add(span)
+            if unique_entities and entity['start'] < unique_entities[-1]['end']:
+                kept = unique_entities[-1]
+                best = entity if entity.get('confidence', 0.0) > kept.get('confidence', 0.0) else kept
+                merged = {**best, 'start': kept['start'], 'end': max(kept['end'], entity['end'])}
+                if text is not None:
+                    merged['text'] = text[merged['start']:merged['end']]
+                unique_entities[-1] = merged
+                continue
+            unique_entities.append(entity)
         
         return unique_entities
     
     def _redact_content(self, text: str, entities: List[Dict[str, Any]]) -> str:
-        """Redact PII from content."""
+        """Redact non-overlapping PII entities from content in one forward pass."""
         if not entities:
             return text
         
-        # Sort entities by start position in reverse order
-        entities.sort(key=lambda x: x['start'], reverse=True)
-        
-        redacted_text = text
-        for entity in entities:
-            redaction = f"[REDACTED_{entity['type'].upper()}]"
-            redacted_text = (redacted_text[:entity['start']] + 
-                           redaction + 
-                           redacted_text[entity['end']:])
+        parts = []
+        pos = 0
+        for entity in sorted(entities, key=lambda x: x['start']):
+            parts.append(text[pos:entity['start']])
+            parts.append(f"[REDACTED_{entity['type'].upper()}]")
+            pos = entity['end']
+        parts.append(text[pos:])
         
-        return redacted_text
+        return ''.join(parts)
     
     def _calculate_pii_confidence(self, entities: List[Dict[str, Any]]) -> float:
         """Calculate overall confidence in PII detection."""
@@ -341,12 +636,33 @@ class PIIDetector:
         return avg_confidence
 
 
+# (computed_at, years) for _known_cve_years; refreshed hourly so a warm
+# container picks up the new year without rebuilding the set per validator
+KNOWN_CVE_YEARS_TTL_SECONDS = 3600
+_known_cve_years_cache: Tuple[float, FrozenSet[int]] = (float('-inf'), frozenset())
+
+
+def _known_cve_years() -> FrozenSet[int]:
+    """Return the valid CVE years, 1999 through next year."""
+    global _known_cve_years_cache
+    computed_at, years = _known_cve_years_cache
+    now = time.monotonic()
+    if now - computed_at > KNOWN_CVE_YEARS_TTL_SECONDS:
+        years = frozenset(range(1999, datetime.now().year + 2))  # Allow next year
+        _known_cve_years_cache = (now, years)
+    return years
+
+
 class CVEValidator:
     """Validates CVE references and detects potential hallucinations."""
     
     def __init__(self):
         self.cve_pattern = re.compile(r'CVE-(\d{4})-(\d{4,})')
-        self.known_cve_years = set(range(1999, datetime.now().year + 2))  # Allow next year
+    
+    @property
+    def known_cve_years(self) -> FrozenSet[int]:
+        """CVE years considered valid, shared across validators."""
+        return _known_cve_years()
     
     def validate_cves(self, content: str, extracted_cves: List[str]) -> List[GuardrailViolation]:
         """
@@ -367,9 +683,11 @@ class CVEValidator:
                 format_violations = self._validate_cve_format(cve)
                 violations.extend(format_violations)
             
+            # Scan content for CVEs once; both checks below use the set
+            content_cves = set(self._extract_cves_from_content(content))
+            
             # Check for CVEs mentioned in content but not extracted
-            content_cves = self._extract_cves_from_content(content)
-            missing_cves = set(content_cves) - set(extracted_cves)
+            missing_cves = content_cves.difference(extracted_cves)
             
             if missing_cves:
                 violations.append(GuardrailViolation(
@@ -381,7 +699,7 @@ class CVEValidator:
                 ))
             
             # Check for potential hallucinated CVEs
-            hallucination_violations = self._detect_cve_hallucinations(extracted_cves, content)
+            hallucination_violations = self._detect_cve_hallucinations(extracted_cves, content_cves)
             violations.extend(hallucination_violations)
             
         except Exception as e:
@@ -438,12 +756,13 @@ class CVEValidator:
         matches = self.cve_pattern.findall(content)
         return [f"CVE-{year}-{number}" for year, number in matches]
     
-    def _detect_cve_hallucinations(self, extracted_cves: List[str], content: str) -> List[GuardrailViolation]:
+    def _detect_cve_hallucinations(self, extracted_cves: List[str],
+                                   content_cves: Set[str]) -> List[GuardrailViolation]:
         """Detect potential CVE hallucinations."""
         violations = []
         
         for cve in extracted_cves:
-            if cve not in content:
+            if cve not in content_cves:
                 violations.append(GuardrailViolation(
                     violation_type=GuardrailViolationType.HALLUCINATION,
                     severity="high",
@@ -474,14 +793,47 @@ class BiasAndSensationalismDetector:
         self.banned_terms = {
             'offensive', 'discriminatory', 'hate speech', 'profanity'
         }
+        
+        # Sensational words match whole words; bias and banned phrases match anywhere
+        self._sensational_set = frozenset(self.sensational_words)
+        self._terms = self.banned_terms | {
+            indicator for indicators in self.bias_indicators.values() for indicator in indicators
+        }
+        self._term_automaton = self._build_term_automaton()
+        # Without pyahocorasick, one alternation scan; the lookahead reports
+        # matches at every position so overlapping phrases are all found
+        self._term_pattern = re.compile(
+            '(?=(' + '|'.join(map(re.escape, sorted(self._terms, key=len, reverse=True))) + '))'
+        )
     
-    def detect_bias_and_sensationalism(self, content: str, title: str = "") -> List[GuardrailViolation]:
+    def _build_term_automaton(self) -> Optional[Any]:
+        """Build one Aho-Corasick automaton over the bias and banned phrases, if available."""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for term in self._terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_terms(self, text_lower: str) -> Set[str]:
+        """Return the watched terms occurring in already-lowercased text."""
+        if self._term_automaton is not None:
+            found = {term for _, term in self._term_automaton.iter(text_lower)}
+        else:
+            found = set(self._term_pattern.findall(text_lower))
+        return found.union(self._sensational_set.intersection(_WORD_RE.findall(text_lower)))
+    
+    def detect_bias_and_sensationalism(self, content: str, title: str = "",
+                                       use_llm: bool = True) -> List[GuardrailViolation]:
         """
         Detect bias and sensationalism in content.
         
         Args:
             content: Text content to analyze
             title: Optional title to analyze
+            use_llm: Whether to include the Bedrock bias assessment
             
         Returns:
             List of violations found
@@ -490,21 +842,26 @@ class BiasAndSensationalismDetector:
         full_text = f"{title}\n\n{content}" if title else content
         
         try:
+            # Lowercase once; one scan finds every watched term for the three keyword checks
+            text_lower = full_text.lower()
+            found_terms = self._find_terms(text_lower)
+            
             # Check for sensationalism
-            sensational_violations = self._detect_sensationalism(full_text, title)
+            sensational_violations = self._detect_sensationalism(full_text, title, found_terms)
             violations.extend(sensational_violations)
             
             # Check for bias indicators
-            bias_violations = self._detect_bias(full_text)
+            bias_violations = self._detect_bias(full_text, found_terms)
             violations.extend(bias_violations)
             
             # Check for banned terms
-            banned_violations = self._detect_banned_terms(full_text)
+            banned_violations = self._detect_banned_terms(full_text, found_terms)
             violations.extend(banned_violations)
             
             # Use LLM for advanced bias detection
-            llm_violations = self._detect_bias_with_llm(content, title)
-            violations.extend(llm_violations)
+            if use_llm:
+                llm_violations = self._detect_bias_with_llm(content, title)
+                violations.extend(llm_violations or [])
             
         except Exception as e:
             logger.error(f"Bias/sensationalism detection failed: {e}")
@@ -517,19 +874,20 @@ class BiasAndSensationalismDetector:
         
         return violations
     
-    def _detect_sensationalism(self, text: str, title: str) -> List[GuardrailViolation]:
+    def _detect_sensationalism(self, text: str, title: str,
+                               found_terms: Optional[Set[str]] = None) -> List[GuardrailViolation]:
         """Detect sensational language."""
         violations = []
-        text_lower = text.lower()
+        if found_terms is None:
+            found_terms = self._find_terms(text.lower())
         
         # Count sensational words in full text
-        sensational_count = sum(1 for word in self.sensational_words if word in text_lower)
+        sensational_count = len(found_terms & self.sensational_words)
         
         # Check density in title (more critical)
         if title:
             title_words = len(title.split())
-            title_lower = title.lower()
-            title_sensational = sum(1 for word in self.sensational_words if word in title_lower)
+            title_sensational = len(self._find_terms(title.lower()) & self.sensational_words)
             
             if title_words > 0 and title_sensational / title_words > 0.15:  # Lowered threshold
                 violations.append(GuardrailViolation(
@@ -553,13 +911,14 @@ class BiasAndSensationalismDetector:
         
         return violations
     
-    def _detect_bias(self, text: str) -> List[GuardrailViolation]:
+    def _detect_bias(self, text: str, found_terms: Optional[Set[str]] = None) -> List[GuardrailViolation]:
         """Detect bias indicators."""
         violations = []
-        text_lower = text.lower()
+        if found_terms is None:
+            found_terms = self._find_terms(text.lower())
         
         for bias_type, indicators in self.bias_indicators.items():
-            found_indicators = [word for word in indicators if word in text_lower]
+            found_indicators = [word for word in indicators if word in found_terms]
             
             if found_indicators:
                 violations.append(GuardrailViolation(
@@ -572,26 +931,27 @@ class BiasAndSensationalismDetector:
         
         return violations
     
-    def _detect_banned_terms(self, text: str) -> List[GuardrailViolation]:
+    def _detect_banned_terms(self, text: str, found_terms: Optional[Set[str]] = None) -> List[GuardrailViolation]:
         """Detect banned terms."""
         violations = []
-        text_lower = text.lower()
+        if found_terms is None:
+            found_terms = self._find_terms(text.lower())
         
-        found_terms = [term for term in self.banned_terms if term in text_lower]
+        found_banned = [term for term in self.banned_terms if term in found_terms]
         
-        if found_terms:
+        if found_banned:
             violations.append(GuardrailViolation(
                 violation_type=GuardrailViolationType.BANNED_TERMS,
                 severity="high",
-                description=f"Banned terms found: {found_terms}",
+                description=f"Banned terms found: {found_banned}",
                 suggested_fix="Remove or replace banned terms",
                 confidence=0.9
             ))
         
         return violations
     
-    def _detect_bias_with_llm(self, content: str, title: str) -> List[GuardrailViolation]:
-        """Use LLM for advanced bias detection."""
+    def _detect_bias_with_llm(self, content: str, title: str) -> Optional[List[GuardrailViolation]]:
+        """Use LLM for advanced bias detection; None if the call fails."""
         violations = []
         
         try:
@@ -621,53 +981,99 @@ Return your assessment in JSON format:
             
             response = bedrock_client.invoke_model(
                 modelId="anthropic.claude-3-5-sonnet-20241022-v2:0",
-                body=json.dumps({
+                body=_dump_payload({
                     "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1000,
+                    "max_tokens": LLM_BIAS_MAX_TOKENS,
                     "messages": [{"role": "user", "content": prompt}],
                     "temperature": 0.1
                 })
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = _load_payload(response['body'].read())
             result_text = response_body['content'][0]['text']
             
-            # Parse JSON response
-            json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group(0))
-                
-                if result.get('has_bias', False):
-                    violations.append(GuardrailViolation(
-                        violation_type=GuardrailViolationType.BIAS_DETECTED,
-                        severity=result.get('severity', 'medium'),
-                        description=f"LLM detected {result.get('bias_type', 'unknown')} bias: {result.get('description', '')}",
-                        confidence=result.get('confidence', 0.7)
-                    ))
+            # Parse the first JSON object in the response; models often add prose after it
+            json_start = result_text.find('{')
+            if json_start == -1:
+                logger.warning("LLM bias detection returned no JSON verdict")
+                return None
+            result, _ = _JSON_DECODER.raw_decode(result_text, json_start)
+            
+            if result.get('has_bias', False):
+                violations.append(GuardrailViolation(
+                    violation_type=GuardrailViolationType.BIAS_DETECTED,
+                    severity=result.get('severity', 'medium'),
+                    description=f"LLM detected {result.get('bias_type', 'unknown')} bias: {result.get('description', '')}",
+                    confidence=result.get('confidence', 0.7)
+                ))
                     
         except Exception as e:
             logger.warning(f"LLM bias detection failed: {e}")
+            return None
         
         return violations
 
 
+def _result_cache_key(article_data: Dict[str, Any], validation_config: Dict[str, Any]) -> Optional[str]:
+    """
+    Return a 128-bit hex digest of everything a validation result depends on.
+    
+    Returns None when the article cannot be serialized (e.g. integers beyond
+    64 bits for orjson, or mixed key types), in which case it is not cached.
+    """
+    key_data = [article_data, dict(validation_config)]
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(key_data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(key_data, sort_keys=True, default=str).encode()
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Guardrail result not cacheable: {e}")
+        return None
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _get_cached_result(cache_key: Optional[str]) -> Optional[GuardrailResult]:
+    """Return a copy of the cached result for a key, or None on a miss."""
+    if cache_key is None:
+        return None
+    with _result_cache_lock:
+        cached = _result_cache.get(cache_key)
+    return _copy_result(cached) if cached is not None else None
+
+
+def _copy_result(result: GuardrailResult) -> GuardrailResult:
+    """Copy a result deeply enough that callers cannot alter a cached one."""
+    return replace(
+        result,
+        violations=[replace(v) for v in result.violations],
+        flags=list(result.flags)
+    )
+
+
 class GuardrailTool:
     """Main guardrail validation tool."""
     
     def __init__(self):
-        self.schema_validator = JSONSchemaValidator()
         self.pii_detector = PIIDetector()
         self.cve_validator = CVEValidator()
         self.bias_detector = BiasAndSensationalismDetector()
     
+    @property
+    def schema_validator(self) -> JSONSchemaValidator:
+        """Shared schema validator, built on first use."""
+        return _get_schema_validator()
+    
     def validate_content(self, article_data: Dict[str, Any], 
-                        validation_config: Optional[Dict[str, Any]] = None) -> GuardrailResult:
+                        validation_config: Optional[Dict[str, Any]] = None,
+                        pii_result: Optional[PIIDetectionResult] = None) -> GuardrailResult:
         """
         Perform comprehensive content validation.
         
         Args:
             article_data: Article data to validate
             validation_config: Optional validation configuration
+            pii_result: Optional precomputed PII detection for this article
             
         Returns:
             GuardrailResult with validation results
@@ -675,112 +1081,248 @@ class GuardrailTool:
         try:
             logger.info(f"Starting guardrail validation for article: {article_data.get('article_id')}")
             
-            all_violations = []
-            flags = []
-            
             # Set default validation config if not provided
             if validation_config is None:
-                validation_config = {
-                    'validate_schema': True,
-                    'detect_pii': True,
-                    'validate_cves': True,
-                    'detect_bias': True
-                }
+                validation_config = DEFAULT_VALIDATION_CONFIG
             
-            # Extract content for validation
-            content = article_data.get('normalized_content', '')
-            title = article_data.get('title', '')
+            cache_key = _result_cache_key(article_data, validation_config)
+            cached = _get_cached_result(cache_key)
+            if cached is not None:
+                logger.info("Guardrail validation served from cache")
+                return cached
             
-            # 1. JSON Schema Validation
-            if validation_config.get('validate_schema', True):
-                schema_violations = self.schema_validator.validate_schema(
-                    article_data, 'article_schema'
-                )
-                all_violations.extend(schema_violations)
-                if schema_violations:
-                    flags.append('schema_issues')
+            local_checks = self._run_local_checks(article_data, validation_config)
+            return self._validate_uncached(article_data, validation_config, cache_key,
+                                           local_checks, pii_result)
             
-            # 2. PII Detection and Redaction
-            if validation_config.get('detect_pii', True):
-                pii_result = self.pii_detector.detect_pii(content, title)
-                if pii_result.has_pii:
-                    all_violations.append(GuardrailViolation(
-                        violation_type=GuardrailViolationType.PII_DETECTED,
-                        severity="high",
-                        description=f"PII detected: {len(pii_result.pii_entities)} entities",
-                        suggested_fix="Review and redact PII before publication",
-                        confidence=pii_result.confidence
-                    ))
-                    flags.append('pii_detected')
-            
-            # 3. CVE Validation
-            if validation_config.get('validate_cves', True):
-                extracted_cves = []
-                entities = article_data.get('entities', {})
-                if isinstance(entities, dict):
-                    extracted_cves = entities.get('cves', [])
-                
-                cve_violations = self.cve_validator.validate_cves(content, extracted_cves)
-                all_violations.extend(cve_violations)
-                if cve_violations:
-                    flags.append('cve_issues')
-            
-            # 4. Bias and Sensationalism Detection
-            if validation_config.get('detect_bias', True):
-                bias_violations = self.bias_detector.detect_bias_and_sensationalism(content, title)
-                all_violations.extend(bias_violations)
-                if bias_violations:
-                    flags.append('bias_detected')
-            
-            # 5. Quality Checks
-            quality_violations = self._perform_quality_checks(article_data)
-            all_violations.extend(quality_violations)
-            if quality_violations:
-                flags.append('quality_issues')
-            
-            # Determine overall result
-            passed = self._determine_pass_status(all_violations)
-            confidence = self._calculate_overall_confidence(all_violations)
-            rationale = self._generate_rationale(all_violations, passed)
-            
-            # Generate redacted content if PII was detected
-            redacted_content = None
-            if any(v.violation_type == GuardrailViolationType.PII_DETECTED for v in all_violations):
-                pii_result = self.pii_detector.detect_pii(content, title)
-                redacted_content = pii_result.redacted_content
-            
-            result = GuardrailResult(
-                passed=passed,
-                violations=all_violations,
-                flags=flags,
-                confidence=confidence,
-                rationale=rationale,
-                redacted_content=redacted_content
-            )
+        except Exception as e:
+            logger.error(f"Guardrail validation failed: {e}")
+            raise GuardrailToolError(f"Validation failed: {e}")
+    
+    def validate_content_batch(self, articles: List[Dict[str, Any]],
+                               validation_config: Optional[Dict[str, Any]] = None) -> List[GuardrailResult]:
+        """
+        Validate several articles, detecting their PII together.
+        
+        Cached articles and articles rejected by the local checks are settled
+        first, so only the remaining ones are sent for PII detection.
+        
+        Args:
+            articles: Article data to validate
+            validation_config: Optional validation configuration shared by all articles
+            
+        Returns:
+            GuardrailResults in input order
+        """
+        try:
+            if validation_config is None:
+                validation_config = DEFAULT_VALIDATION_CONFIG
             
-            logger.info(f"Guardrail validation complete: passed={passed}, "
-                       f"violations={len(all_violations)}, flags={flags}")
+            results: List[Optional[GuardrailResult]] = [None] * len(articles)
+            pending = []
+            for index, article in enumerate(articles):
+                logger.info(f"Starting guardrail validation for article: {article.get('article_id')}")
+                cache_key = _result_cache_key(article, validation_config)
+                cached = _get_cached_result(cache_key)
+                if cached is not None:
+                    logger.info("Guardrail validation served from cache")
+                    results[index] = cached
+                else:
+                    pending.append((index, cache_key, self._run_local_checks(article, validation_config)))
             
-            return result
+            pii_results = {}
+            if validation_config.get('detect_pii', True):
+                to_scan = [index for index, _, local_checks in pending if not local_checks[2]]
+                if to_scan:
+                    pii_results = dict(zip(to_scan, self.pii_detector.detect_pii_batch([
+                        (articles[index].get('normalized_content', ''), articles[index].get('title', ''))
+                        for index in to_scan
+                    ])))
+            
+            for index, cache_key, local_checks in pending:
+                results[index] = self._validate_uncached(
+                    articles[index], validation_config, cache_key, local_checks, pii_results.get(index)
+                )
+            return results
             
         except Exception as e:
-            logger.error(f"Guardrail validation failed: {e}")
+            logger.error(f"Guardrail batch validation failed: {e}")
             raise GuardrailToolError(f"Validation failed: {e}")
     
+    def _run_local_checks(self, article_data: Dict[str, Any], validation_config: Dict[str, Any]
+                          ) -> Tuple[List[GuardrailViolation], List[GuardrailViolation], bool]:
+        """
+        Run the cheap lexical bias and schema checks.
+        
+        Returns:
+            The lexical bias violations, the schema violations, and whether
+            they reject the article outright
+        """
+        content = article_data.get('normalized_content', '')
+        title = article_data.get('title', '')
+        
+        # A banned term or a critical schema violation rejects the article,
+        # so the PII, CVE and LLM stages are skipped
+        lexical_bias_violations = []
+        if validation_config.get('detect_bias', True):
+            lexical_bias_violations = self.bias_detector.detect_bias_and_sensationalism(
+                content, title, use_llm=False
+            )
+        schema_violations = []
+        if validation_config.get('validate_schema', True):
+            schema_violations = self.schema_validator.validate_schema(
+                article_data, 'article_schema'
+            )
+        rejected = any(
+            v.severity == 'critical' or v.violation_type == GuardrailViolationType.BANNED_TERMS
+            for v in lexical_bias_violations + schema_violations
+        )
+        if rejected:
+            logger.info("Critical guardrail violation found; skipping remaining checks")
+        return lexical_bias_violations, schema_violations, rejected
+    
+    def _validate_uncached(self, article_data: Dict[str, Any], validation_config: Dict[str, Any],
+                           cache_key: Optional[str],
+                           local_checks: Tuple[List[GuardrailViolation], List[GuardrailViolation], bool],
+                           pii_result: Optional[PIIDetectionResult]) -> GuardrailResult:
+        """Finish validating an article that missed the result cache."""
+        all_violations = []
+        flags = []
+        
+        # Extract content for validation
+        content = article_data.get('normalized_content', '')
+        title = article_data.get('title', '')
+        
+        detect_bias = validation_config.get('detect_bias', True)
+        lexical_bias_violations, schema_violations, rejected = local_checks
+        
+        # Start the network-bound detections so they overlap the CVE and quality checks
+        pii_future = None
+        if validation_config.get('detect_pii', True) and pii_result is None and not rejected:
+            pii_future = _pii_pool.submit(self.pii_detector.detect_pii, content, title)
+        llm_future = None
+        llm_violations = None
+        if detect_bias and not rejected:
+            llm_future = _llm_pool.submit(self.bias_detector._detect_bias_with_llm, content, title)
+        
+        # 1. JSON Schema Validation
+        all_violations.extend(schema_violations)
+        if schema_violations:
+            flags.append('schema_issues')
+        
+        # 2. PII Detection and Redaction
+        if not validation_config.get('detect_pii', True) or rejected:
+            pii_result = None
+        else:
+            if pii_result is None:
+                pii_result = self._await_pii(pii_future)
+            if pii_result is None:
+                pii_result = self.pii_detector.detect_pii_with_patterns(content, title)
+            if pii_result.has_pii:
+                all_violations.append(GuardrailViolation(
+                    violation_type=GuardrailViolationType.PII_DETECTED,
+                    severity="high",
+                    description=f"PII detected: {len(pii_result.pii_entities)} entities",
+                    suggested_fix="Review and redact PII before publication",
+                    confidence=pii_result.confidence
+                ))
+                flags.append('pii_detected')
+        
+        # 3. CVE Validation
+        if validation_config.get('validate_cves', True) and not rejected:
+            extracted_cves = []
+            entities = article_data.get('entities', {})
+            if isinstance(entities, dict):
+                extracted_cves = entities.get('cves', [])
+            
+            cve_violations = self.cve_validator.validate_cves(content, extracted_cves)
+            all_violations.extend(cve_violations)
+            if cve_violations:
+                flags.append('cve_issues')
+        
+        # 4. Bias and Sensationalism Detection
+        if detect_bias:
+            bias_violations = lexical_bias_violations
+            if llm_future is not None:
+                llm_violations = self._await_llm_bias(llm_future)
+                bias_violations.extend(llm_violations or [])
+            all_violations.extend(bias_violations)
+            if bias_violations:
+                flags.append('bias_detected')
+        
+        # 5. Quality Checks
+        quality_violations = self._perform_quality_checks(article_data)
+        all_violations.extend(quality_violations)
+        if quality_violations:
+            flags.append('quality_issues')
+        
+        # Determine overall result
+        passed = self._determine_pass_status(all_violations)
+        confidence = self._calculate_overall_confidence(all_violations)
+        rationale = self._generate_rationale(all_violations, passed)
+        
+        # Reuse the step 2 redaction if PII was detected
+        redacted_content = pii_result.redacted_content if pii_result and pii_result.has_pii else None
+        
+        result = GuardrailResult(
+            passed=passed,
+            violations=all_violations,
+            flags=flags,
+            confidence=confidence,
+            rationale=rationale,
+            redacted_content=redacted_content
+        )
+        
+        logger.info(f"Guardrail validation complete: passed={passed}, "
+                   f"violations={len(all_violations)}, flags={flags}")
+        
+        # Cache only when every network check that ran gave an answer; a result
+        # missing its Comprehend or LLM verdict is not worth replaying
+        network_complete = (
+            (pii_result is None or pii_result.complete)
+            and (llm_future is None or llm_violations is not None)
+        )
+        if cache_key is not None and network_complete:
+            snapshot = _copy_result(result)
+            with _result_cache_lock:
+                if cache_key not in _result_cache and len(_result_cache) >= RESULT_CACHE_MAX_SIZE:
+                    del _result_cache[next(iter(_result_cache))]
+                _result_cache[cache_key] = snapshot
+        
+        return result
+    
+    def _await_pii(self, pii_future: Future) -> Optional[PIIDetectionResult]:
+        """Return the PII detection result, or None if it misses the deadline."""
+        try:
+            return pii_future.result(timeout=PII_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            pii_future.cancel()
+            logger.warning(f"PII detection exceeded {PII_TIMEOUT_SECONDS}s; using pattern detection only")
+            return None
+    
+    def _await_llm_bias(self, llm_future: Future) -> Optional[List[GuardrailViolation]]:
+        """Return the LLM bias violations, or None if they miss the deadline."""
+        try:
+            return llm_future.result(timeout=LLM_BIAS_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            llm_future.cancel()
+            logger.warning(f"LLM bias detection exceeded {LLM_BIAS_TIMEOUT_SECONDS}s; using lexical checks only")
+            return None
+    
     def _perform_quality_checks(self, article_data: Dict[str, Any]) -> List[GuardrailViolation]:
         """Perform basic quality checks."""
         violations = []
         
         # Check title length
-        title = article_data.get('title', '')
-        if len(title) < 10:
+        title_length = len(article_data.get('title', ''))
+        if title_length < TITLE_MIN_LENGTH:
             violations.append(GuardrailViolation(
                 violation_type=GuardrailViolationType.QUALITY_ISSUES,
                 severity="medium",
                 description="Title too short",
                 confidence=1.0
             ))
-        elif len(title) > 200:
+        elif title_length > TITLE_MAX_LENGTH:
             violations.append(GuardrailViolation(
                 violation_type=GuardrailViolationType.QUALITY_ISSUES,
                 severity="low",
@@ -789,8 +1331,7 @@ class GuardrailTool:
             ))
         
         # Check content length
-        content = article_data.get('normalized_content', '')
-        if len(content) < 50:
+        if len(article_data.get('normalized_content', '')) < CONTENT_MIN_LENGTH:
             violations.append(GuardrailViolation(
                 violation_type=GuardrailViolationType.QUALITY_ISSUES,
                 severity="high",
@@ -800,7 +1341,7 @@ class GuardrailTool:
         
         # Check URL validity
         url = article_data.get('url', '')
-        if not url or not url.startswith(('http://', 'https://')):
+        if not url or not _URL_RE.match(url):
             violations.append(GuardrailViolation(
                 violation_type=GuardrailViolationType.QUALITY_ISSUES,
                 severity="high",
@@ -812,17 +1353,17 @@ class GuardrailTool:
     
     def _determine_pass_status(self, violations: List[GuardrailViolation]) -> bool:
         """Determine if content passes guardrail validation."""
-        # Fail if any critical or high severity violations
-        critical_violations = [v for v in violations if v.severity in ['critical', 'high']]
-        
-        # Allow some medium/low violations but not too many
-        medium_violations = [v for v in violations if v.severity == 'medium']
-        
-        if critical_violations:
-            return False
-        
-        if len(medium_violations) > 3:
-            return False
+        medium_count = 0
+        for violation in violations:
+            severity = violation.severity
+            # Fail on any critical or high severity violation
+            if severity == 'critical' or severity == 'high':
+                return False
+            # Allow some medium/low violations but not too many
+            if severity == 'medium':
+                medium_count += 1
+                if medium_count > 3:
+                    return False
         
         return True
     
@@ -832,7 +1373,7 @@ class GuardrailTool:
             return 0.95
         
         # Average confidence of all violations
-        avg_confidence = sum(v.confidence for v in violations) / len(violations)
+        avg_confidence = sum(map(_violation_confidence, violations)) / len(violations)
         
         # Adjust based on number of violations
         confidence_penalty = min(0.3, len(violations) * 0.05)
@@ -844,19 +1385,29 @@ class GuardrailTool:
         if not violations:
             return "Content passed all guardrail validations"
         
-        violation_summary = {}
-        for violation in violations:
-            vtype = violation.violation_type.value
-            if vtype not in violation_summary:
-                violation_summary[vtype] = 0
-            violation_summary[vtype] += 1
-        
-        summary_parts = [f"{count} {vtype}" for vtype, count in violation_summary.items()]
+        # Counter keeps first-seen order, so types are listed as they occurred
+        violation_summary = Counter(v.violation_type.value for v in violations)
+        summary = ', '.join(f"{count} {vtype}" for vtype, count in violation_summary.items())
         
-        if passed:
-            return f"Content passed with minor issues: {', '.join(summary_parts)}"
-        else:
-            return f"Content failed validation due to: {', '.join(summary_parts)}"
+        return (_RATIONALE_PASSED if passed else _RATIONALE_FAILED).format(summary)
+
+
+@lru_cache(maxsize=1)
+def _get_guardrail_tool() -> GuardrailTool:
+    """Get the GuardrailTool instance cached for the warm Lambda container."""
+    return GuardrailTool()
+
+
+def _result_to_dict(result: GuardrailResult) -> Dict[str, Any]:
+    """Convert a GuardrailResult to the handler's response shape."""
+    return {
+        'passed': result.passed,
+        'violations': [v.to_dict() for v in result.violations],
+        'flags': result.flags,
+        'confidence': result.confidence,
+        'rationale': result.rationale,
+        'redacted_content': result.redacted_content
+    }
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -880,41 +1431,34 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "detect_bias": true
         }
     }
+    
+    Several articles can be validated in one invocation by sending
+    "articles": [{"article_id": ..., "article_data": {...}}, ...] in place of
+    article_id/article_data; validation_config then applies to all of them.
     """
     try:
         # Extract parameters
+        validation_config = event.get('validation_config', DEFAULT_VALIDATION_CONFIG)
+        
+        articles = event.get('articles')
+        if articles is not None:
+            return _handle_batch(articles, validation_config)
+        
         article_id = event.get('article_id')
         article_data = event.get('article_data', {})
-        validation_config = event.get('validation_config', {
-            'validate_schema': True,
-            'detect_pii': True,
-            'validate_cves': True,
-            'detect_bias': True
-        })
         
         if not article_id or not article_data:
             raise ValueError("article_id and article_data are required")
         
-        # Initialize guardrail tool and perform validation
-        guardrail_tool = GuardrailTool()
-        result = guardrail_tool.validate_content(article_data, validation_config)
-        
-        # Convert result to dictionary
-        result_dict = {
-            'passed': result.passed,
-            'violations': [asdict(v) for v in result.violations],
-            'flags': result.flags,
-            'confidence': result.confidence,
-            'rationale': result.rationale,
-            'redacted_content': result.redacted_content
-        }
+        # Perform validation with the tool cached for the warm container
+        result = _get_guardrail_tool().validate_content(article_data, validation_config)
         
         return {
             'statusCode': 200,
             'body': {
                 'success': True,
                 'article_id': article_id,
-                'result': result_dict
+                'result': _result_to_dict(result)
             }
         }
         
@@ -930,6 +1474,29 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
+def _handle_batch(articles: List[Dict[str, Any]], validation_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a batch of articles with one shared tool and batched PII detection."""
+    if not isinstance(articles, list) or not articles:
+        raise ValueError("articles must be a non-empty list")
+    if any(not article.get('article_id') or not article.get('article_data') for article in articles):
+        raise ValueError("each article requires article_id and article_data")
+    
+    results = _get_guardrail_tool().validate_content_batch(
+        [article['article_data'] for article in articles], validation_config
+    )
+    
+    return {
+        'statusCode': 200,
+        'body': {
+            'success': True,
+            'results': [
+                {'article_id': article['article_id'], 'result': _result_to_dict(result)}
+                for article, result in zip(articles, results)
+            ]
+        }
+    }
+
+
 # For testing
 if __name__ == "__main__":
     # Test event
@@ -27,6 +27,26 @@ dynamodb = boto3.resource('dynamodb')
 s3_client = boto3.client('s3')
 
 
+def published_day(published_at: Any) -> Optional[str]:
+    """
+    Return the UTC day (YYYY-MM-DD) of an ISO 8601 timestamp, or None if unparseable.
+    
+    This is the partition key of the published_date-published_at-index GSI.
+    Timestamps without an offset are taken as UTC.
+    """
+    if not isinstance(published_at, str):
+        return None
+    try:
+        value = datetime.fromisoformat(
+            published_at[:-1] + '+00:00' if published_at.endswith('Z') else published_at
+        )
+    except ValueError:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().isoformat()
+
+
 @dataclass
 class StorageResult:
     """Result of storage operations."""
@@ -112,6 +132,11 @@ class DynamoDBManager:
                 'version': 1
             })
             
+            # Day bucket for the published_date-published_at-index GSI
+            published_date = published_day(item.get('published_at'))
+            if published_date:
+                item['published_date'] = published_date
+            
             # Create article with condition to prevent overwrites
             self.articles_table.put_item(
                 Item=item,
@@ -175,6 +200,12 @@ class DynamoDBManager:
             # Add updated_at timestamp
             updates['updated_at'] = datetime.now(timezone.utc).isoformat()
             
+            # Keep the GSI day bucket in step with published_at
+            if 'published_at' in updates:
+                published_date = published_day(updates['published_at'])
+                if published_date:
+                    updates['published_date'] = published_date
+            
             for key, value in updates.items():
                 # Handle reserved keywords
                 attr_name = f"#{key}"
@@ -320,6 +351,70 @@ class DynamoDBManager:
                 errors=[f"State update error: {str(e)}"]
             )
     
+    def backfill_published_dates(self, max_items: int = 1000,
+                                 exclusive_start_key: Optional[Dict[str, Any]] = None) -> StorageResult:
+        """
+        Set published_date on articles stored before it was written.
+        
+        Articles without it are missing from the published_date GSI, so dedup
+        cannot see them through the index. Runs until about max_items articles
+        are scanned; metadata['last_evaluated_key'] resumes the next run and is
+        None once the whole table has been covered.
+        """
+        try:
+            scan_kwargs = {
+                'FilterExpression': Attr('published_date').not_exists() & Attr('published_at').exists(),
+                'ProjectionExpression': 'article_id, published_at'
+            }
+            if exclusive_start_key:
+                scan_kwargs['ExclusiveStartKey'] = exclusive_start_key
+            
+            updated = 0
+            scanned = 0
+            warnings = []
+            while True:
+                response = self.articles_table.scan(**scan_kwargs)
+                scanned += response.get('ScannedCount', 0)
+                
+                for item in response.get('Items', []):
+                    published_date = published_day(item.get('published_at'))
+                    if not published_date:
+                        warnings.append(f"Article {item['article_id']} has unparseable published_at")
+                        continue
+                    try:
+                        self.articles_table.update_item(
+                            Key={'article_id': item['article_id']},
+                            UpdateExpression='SET published_date = :published_date',
+                            ConditionExpression=Attr('published_date').not_exists(),
+                            ExpressionAttributeValues={':published_date': published_date}
+                        )
+                        updated += 1
+                    except ClientError as e:
+                        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                            raise
+                
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key or scanned >= max_items:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = last_key
+            
+            logger.info(f"Backfilled published_date on {updated} articles ({scanned} scanned)")
+            return StorageResult(
+                success=True,
+                operation="backfill_published_dates",
+                items_processed=updated,
+                warnings=warnings,
+                metadata={'scanned': scanned, 'last_evaluated_key': last_key}
+            )
+            
+        except ClientError as e:
+            logger.error(f"DynamoDB error backfilling published dates: {e}")
+            return StorageResult(
+                success=False,
+                operation="backfill_published_dates",
+                errors=[f"DynamoDB error: {str(e)}"]
+            )
+    
     def _validate_article_data(self, article_data: Dict[str, Any]) -> StorageResult:
         """Validate article data before storage."""
         required_fields = ['title', 'url', 'source', 'feed_id']
@@ -557,6 +652,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 raise ValueError("article_id and state are required for update_state")
             result = storage_tool.dynamodb_manager.update_article_state(article_id, new_state, metadata)
             
+        elif operation == 'backfill_published_dates':
+            result = storage_tool.dynamodb_manager.backfill_published_dates(
+                event.get('max_items', 1000), event.get('exclusive_start_key')
+            )
+            
         elif operation == 'store_content':
             content = event.get('content', '')
             key = event.get('key', '')
@@ -0,0 +1,38 @@
+"""
+Manual smoke test for the CommentaryAPI Lambda handler.
+
+Invokes lambda_handler with a sample create_comment event against real
+DynamoDB tables. Not collected by pytest; run directly with AWS credentials:
+
+    python tests/smoke_commentary_api.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lambda_tools import commentary_api
+
+
+def main() -> None:
+    """Run a sample create_comment event through the handler."""
+    commentary_api.COMMENTS_TABLE = os.environ.get('COMMENTS_TABLE', 'test-comments')
+    commentary_api.ARTICLES_TABLE = os.environ.get('ARTICLES_TABLE', 'test-articles')
+
+    test_event = {
+        "operation": "create_comment",
+        "article_id": "test-article-123",
+        "author": "analyst@example.com",
+        "content": "This article provides valuable insights into the Azure vulnerability. The CVE details are particularly useful for our security team.",
+        "visibility": "public"
+    }
+
+    result = commentary_api.lambda_handler(test_event, None)
+    print(result['statusCode'])
+    print(json.dumps(json.loads(result['body']), indent=2))
+
+
+if __name__ == "__main__":
+    main()
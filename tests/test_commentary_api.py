@@ -5,12 +5,16 @@ Tests comment creation and management, threaded discussion support,
 comment moderation, search and filtering capabilities.
 """
 
+import base64
+import gzip
 import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timezone
 from decimal import Decimal
 
+from botocore.exceptions import ClientError
+
 # Import the module under test
 import sys
 import os
@@ -22,7 +26,10 @@ from lambda_tools.commentary_api import (
     ThreadManager,
     CommentSearchManager,
     CommentResult,
-    lambda_handler
+    CommentCache,
+    lambda_handler,
+    _get_api,
+    _comment_cache
 )
 
 
@@ -84,7 +91,17 @@ class TestCommentModerator:
         
         assert result['is_valid'] is False
         assert 'potential_xss' in result['flags']
-    
+
+    def test_validate_comment_content_stops_after_auto_moderate_word(self):
+        """Test banned-word scan stops at the first auto-moderate term."""
+        content = "This spam comment is also offensive."
+
+        result = CommentModerator.validate_comment_content(content)
+
+        assert 'banned_word_spam' in result['flags']
+        assert 'banned_word_offensive' not in result['flags']
+        assert CommentModerator.should_auto_moderate(result) is True
+
     def test_validate_comment_content_html_sanitization(self):
         """Test HTML sanitization."""
         content = "This is <b>bold</b> and this is <i>italic</i>"
@@ -160,6 +177,25 @@ class TestThreadManager:
         assert tree[0]['children'][0]['depth'] == 1
         assert tree[0]['children'][0]['children'][0]['depth'] == 2
     
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_build_comment_tree_unordered_input(self, mock_dynamodb):
+        """Test tree building when replies precede their parents in the input."""
+        manager = ThreadManager('test-comments')
+        
+        comments = [
+            {'comment_id': 'c3', 'parent_comment_id': 'c2', 'created_at': '2024-01-01T10:10:00Z'},
+            {'comment_id': 'c2', 'parent_comment_id': 'c1', 'created_at': '2024-01-01T10:05:00Z'},
+            {'comment_id': 'c4', 'parent_comment_id': 'c1', 'created_at': '2024-01-01T10:02:00Z'},
+            {'comment_id': 'c1', 'parent_comment_id': None, 'created_at': '2024-01-01T10:00:00Z'}
+        ]
+        
+        tree = manager.build_comment_tree(comments)
+        
+        assert [c['comment_id'] for c in tree] == ['c1']
+        assert [c['comment_id'] for c in tree[0]['children']] == ['c4', 'c2']
+        assert tree[0]['children'][1]['children'][0]['comment_id'] == 'c3'
+        assert tree[0]['children'][1]['children'][0]['depth'] == 2
+    
     @patch('lambda_tools.commentary_api.dynamodb')
     def test_flatten_comment_tree(self, mock_dynamodb):
         """Test flattening comment tree."""
@@ -301,6 +337,37 @@ class TestCommentSearchManager:
         assert result.comment_count == 1
         assert result.comments[0]['author'] == 'user1'
 
+    
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_search_comments_reuses_compiled_query(self, mock_dynamodb):
+        """Test identical searches reuse the compiled query."""
+        mock_table = Mock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.query.return_value = {'Items': []}
+        
+        manager = CommentSearchManager('test-comments')
+        
+        manager.search_comments({'article_id': 'article-cache', 'author': 'User1'})
+        result = manager.search_comments({'author': 'User1', 'article_id': 'article-cache'})
+        
+        assert result.success is True
+        first_call, second_call = mock_table.query.call_args_list
+        assert first_call[1]['KeyConditionExpression'] is second_call[1]['KeyConditionExpression']
+    
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_search_comments_unhashable_params(self, mock_dynamodb):
+        """Test unhashable search parameters are compiled without the cache."""
+        mock_table = Mock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.query.return_value = {'Items': []}
+        
+        manager = CommentSearchManager('test-comments')
+        
+        result = manager.search_comments({'article_id': 'article-1', 'tags': {'a', 'b'}})
+        
+        assert result.success is True
+        mock_table.query.assert_called_once()
+
 
 class TestCommentaryAPI:
     """Test main commentary API."""
@@ -314,10 +381,8 @@ class TestCommentaryAPI:
             mock_comments_table if 'comments' in name else mock_articles_table
         )
         
-        # Mock article exists
-        mock_articles_table.get_item.return_value = {
-            'Item': {'article_id': 'test-article', 'title': 'Test Article'}
-        }
+        mock_comments_table.name = 'test-comments'
+        mock_articles_table.name = 'test-articles'
         
         api = CommentaryAPI('test-comments', 'test-articles')
         
@@ -329,11 +394,15 @@ class TestCommentaryAPI:
         assert result.article_id == 'test-article'
         assert result.comment_id is not None
         
-        # Verify comment was stored
-        mock_comments_table.put_item.assert_called_once()
-        
-        # Verify article comment count was updated
-        mock_articles_table.update_item.assert_called_once()
+        # Comment stored and article count updated in one conditional transaction
+        mock_articles_table.get_item.assert_not_called()
+        transact = mock_comments_table.meta.client.transact_write_items
+        transact.assert_called_once()
+        put, article_update = transact.call_args[1]['TransactItems']
+        assert put['Put']['TableName'] == 'test-comments'
+        assert put['Put']['Item']['comment_id'] == result.comment_id
+        assert article_update['Update']['TableName'] == 'test-articles'
+        assert article_update['Update']['ConditionExpression'] == 'attribute_exists(article_id)'
     
     @patch('lambda_tools.commentary_api.dynamodb')
     def test_create_comment_article_not_found(self, mock_dynamodb):
@@ -344,8 +413,14 @@ class TestCommentaryAPI:
             mock_comments_table if 'comments' in name else mock_articles_table
         )
         
-        # Mock article doesn't exist
-        mock_articles_table.get_item.return_value = {}
+        # Mock article doesn't exist - the conditional article update fails
+        mock_comments_table.meta.client.transact_write_items.side_effect = ClientError(
+            {
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'cancelled'},
+                'CancellationReasons': [{'Code': 'None'}, {'Code': 'ConditionalCheckFailed'}]
+            },
+            'TransactWriteItems'
+        )
         
         api = CommentaryAPI('test-comments', 'test-articles')
         
@@ -383,11 +458,6 @@ class TestCommentaryAPI:
             mock_comments_table if 'comments' in name else mock_articles_table
         )
         
-        # Mock article exists
-        mock_articles_table.get_item.return_value = {
-            'Item': {'article_id': 'test-article', 'title': 'Test Article'}
-        }
-        
         # Mock parent comment exists
         mock_comments_table.get_item.return_value = {
             'Item': {
@@ -407,8 +477,102 @@ class TestCommentaryAPI:
         assert result.success is True
         assert result.metadata['depth'] == 1
         
-        # Verify parent comment reply count was updated
-        assert mock_comments_table.update_item.call_count == 1
+        # Verify parent comment reply count was updated in the same transaction
+        transact = mock_comments_table.meta.client.transact_write_items
+        transact.assert_called_once()
+        transact_items = transact.call_args[1]['TransactItems']
+        assert len(transact_items) == 3
+        assert transact_items[2]['Update']['Key'] == {'comment_id': 'parent-comment'}
+    
+    @patch('lambda_tools.commentary_api.time.sleep')
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_create_comments_batch(self, mock_dynamodb, mock_sleep):
+        """Test batch creation retries unprocessed items and aggregates counters."""
+        mock_comments_table = Mock()
+        mock_comments_table.name = 'test-comments'
+        mock_articles_table = Mock()
+        mock_dynamodb.Table.side_effect = lambda name: (
+            mock_comments_table if 'comments' in name else mock_articles_table
+        )
+        
+        mock_articles_table.get_item.side_effect = lambda Key: (
+            {'Item': Key} if Key['article_id'] == 'test-article' else {}
+        )
+        
+        # First call leaves one item unprocessed, the retry succeeds
+        mock_client = mock_comments_table.meta.client
+        mock_client.batch_write_item.side_effect = [
+            {'UnprocessedItems': {'test-comments': [{'PutRequest': {'Item': {'comment_id': 'x'}}}]}},
+            {'UnprocessedItems': {}}
+        ]
+        
+        api = CommentaryAPI('test-comments', 'test-articles')
+        
+        result = api.create_comments_batch([
+            {'article_id': 'test-article', 'author': 'a@example.com', 'content': 'First comment'},
+            {'article_id': 'test-article', 'author': 'b@example.com', 'content': 'Second comment'},
+            {'article_id': 'missing-article', 'author': 'c@example.com', 'content': 'Orphan comment'}
+        ])
+        
+        assert result.success is True
+        assert result.comment_count == 2
+        assert result.metadata['failed'] == 1
+        assert 'not found' in result.errors[0]
+        assert mock_client.batch_write_item.call_count == 2
+        mock_sleep.assert_called_once()
+        
+        # Article counter updated once for both comments
+        mock_articles_table.update_item.assert_called_once()
+        assert mock_articles_table.update_item.call_args[1]['ExpressionAttributeValues'] == {':inc': 2}
+    
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_create_comments_batch_empty(self, mock_dynamodb):
+        """Test an empty batch succeeds without writing anything."""
+        api = CommentaryAPI('test-comments', 'test-articles')
+        
+        result = api.create_comments_batch([])
+        
+        assert result.success is True
+        assert result.comment_count == 0
+        mock_dynamodb.Table.return_value.meta.client.batch_write_item.assert_not_called()
+    
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_create_comments_batch_reply_to_batch_parent(self, mock_dynamodb):
+        """Test a reply to an earlier batch comment is written after its parent."""
+        mock_comments_table = Mock()
+        mock_comments_table.name = 'test-comments'
+        mock_articles_table = Mock()
+        mock_dynamodb.Table.side_effect = lambda name: (
+            mock_comments_table if 'comments' in name else mock_articles_table
+        )
+        mock_articles_table.get_item.return_value = {'Item': {'article_id': 'test-article'}}
+        mock_client = mock_comments_table.meta.client
+        mock_client.batch_write_item.return_value = {'UnprocessedItems': {}}
+        
+        api = CommentaryAPI('test-comments', 'test-articles')
+        
+        result = api.create_comments_batch([
+            {'article_id': 'test-article', 'author': 'a@example.com', 'content': 'Root comment'},
+            {'article_id': 'test-article', 'author': 'b@example.com', 'content': 'A reply', 'parent_index': 0},
+            {'article_id': 'test-article', 'author': 'c@example.com', 'content': 'Bad reply', 'parent_index': 2}
+        ])
+        
+        assert result.success is True
+        assert result.comment_count == 2
+        assert 'earlier comment' in result.errors[0]
+        mock_comments_table.get_item.assert_not_called()
+        
+        # Parent and reply go out in separate, ordered writes
+        writes = [
+            call[1]['RequestItems']['test-comments'][0]['PutRequest']['Item']
+            for call in mock_client.batch_write_item.call_args_list
+        ]
+        parent, reply = writes
+        assert reply['parent_comment_id'] == parent['comment_id']
+        assert reply['thread_id'] == parent['thread_id']
+        assert reply['depth'] == 1
+        mock_comments_table.update_item.assert_called_once()
+        assert mock_comments_table.update_item.call_args[1]['Key'] == {'comment_id': parent['comment_id']}
     
     @patch('lambda_tools.commentary_api.dynamodb')
     def test_get_comments_as_tree(self, mock_dynamodb):
@@ -476,6 +640,22 @@ class TestCommentaryAPI:
         # Verify update was called
         mock_comments_table.update_item.assert_called_once()
     
+    @patch('lambda_tools.commentary_api.dynamodb')
+    def test_update_comment_empty_updates(self, mock_dynamodb):
+        """Test empty updates return without touching DynamoDB."""
+        mock_comments_table = Mock()
+        mock_dynamodb.Table.return_value = mock_comments_table
+        
+        api = CommentaryAPI('test-comments', 'test-articles')
+        
+        result = api.update_comment('test-comment', {}, 'user@example.com')
+        
+        assert result.success is True
+        assert result.metadata['updated_fields'] == []
+        assert len(result.warnings) == 1
+        mock_comments_table.get_item.assert_not_called()
+        mock_comments_table.update_item.assert_not_called()
+    
     @patch('lambda_tools.commentary_api.dynamodb')
     def test_update_comment_unauthorized(self, mock_dynamodb):
         """Test comment update by unauthorized user."""
@@ -533,13 +713,76 @@ class TestCommentaryAPI:
         mock_articles_table.update_item.assert_called()
 
 
+class TestCommentCache:
+    """Test get_comments result cache."""
+    
+    def test_cache_expires_entries(self):
+        """Test cached results expire after the TTL."""
+        cache = CommentCache(ttl_seconds=0)
+        key = ('test-article', False, True)
+        cache.put(key, CommentResult(success=True, operation='get_comments'))
+        
+        assert cache.get(key) is None
+    
+    def test_cache_evicts_oldest_when_full(self):
+        """Test the oldest entry is evicted once max_size is reached."""
+        cache = CommentCache(ttl_seconds=60, max_size=2)
+        for article_id in ('a1', 'a2', 'a3'):
+            cache.put((article_id, False, True), CommentResult(success=True, operation='get_comments'))
+        
+        assert cache.get(('a1', False, True)) is None
+        assert cache.get(('a3', False, True)) is not None
+    
+    def test_cache_invalidate_article(self):
+        """Test invalidation drops every variant for an article."""
+        cache = CommentCache(ttl_seconds=60)
+        result = CommentResult(success=True, operation='get_comments')
+        cache.put(('a1', False, True), result)
+        cache.put(('a1', True, False), result)
+        cache.put(('a2', False, True), result)
+        
+        cache.invalidate('a1')
+        
+        assert cache.get(('a1', False, True)) is None
+        assert cache.get(('a1', True, False)) is None
+        assert cache.get(('a2', False, True)) is result
+
+
 class TestLambdaHandler:
     """Test Lambda handler function."""
     
-    @patch.dict(os.environ, {
-        'COMMENTS_TABLE': 'test-comments',
-        'ARTICLES_TABLE': 'test-articles'
-    })
+    @pytest.fixture(autouse=True)
+    def reset_api_cache(self):
+        """Reset the warm-container caches between tests."""
+        _get_api.cache_clear()
+        _comment_cache.clear()
+        yield
+        _get_api.cache_clear()
+        _comment_cache.clear()
+    
+    @patch('lambda_tools.commentary_api.COMMENTS_TABLE', 'test-comments')
+    @patch('lambda_tools.commentary_api.ARTICLES_TABLE', 'test-articles')
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_reuses_api_instance(self, mock_api_class):
+        """Test Lambda handler reuses the API across warm invocations."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.get_comments.return_value = CommentResult(
+            success=True,
+            operation='get_comments',
+            article_id='test-article'
+        )
+        
+        event = {'operation': 'get_comments', 'article_id': 'test-article'}
+        
+        lambda_handler(event, None)
+        lambda_handler(event, None)
+        
+        mock_api_class.assert_called_once_with('test-comments', 'test-articles')
+        assert mock_api.get_comments.call_count == 2
+    
+    @patch('lambda_tools.commentary_api.COMMENTS_TABLE', 'test-comments')
+    @patch('lambda_tools.commentary_api.ARTICLES_TABLE', 'test-articles')
     @patch('lambda_tools.commentary_api.CommentaryAPI')
     def test_lambda_handler_create_comment(self, mock_api_class):
         """Test Lambda handler for create_comment operation."""
@@ -560,16 +803,15 @@ class TestLambdaHandler:
         }
         
         response = lambda_handler(event, None)
+        body = json.loads(response['body'])
         
         assert response['statusCode'] == 200
-        assert response['body']['success'] is True
-        assert response['body']['comment_id'] == 'test-comment'
+        assert body['success'] is True
+        assert body['comment_id'] == 'test-comment'
         mock_api.create_comment.assert_called_once()
     
-    @patch.dict(os.environ, {
-        'COMMENTS_TABLE': 'test-comments',
-        'ARTICLES_TABLE': 'test-articles'
-    })
+    @patch('lambda_tools.commentary_api.COMMENTS_TABLE', 'test-comments')
+    @patch('lambda_tools.commentary_api.ARTICLES_TABLE', 'test-articles')
     @patch('lambda_tools.commentary_api.CommentaryAPI')
     def test_lambda_handler_get_comments(self, mock_api_class):
         """Test Lambda handler for get_comments operation."""
@@ -590,12 +832,145 @@ class TestLambdaHandler:
         }
         
         response = lambda_handler(event, None)
+        body = json.loads(response['body'])
         
         assert response['statusCode'] == 200
-        assert response['body']['success'] is True
-        assert response['body']['comment_count'] == 2
+        assert body['success'] is True
+        assert body['comment_count'] == 2
         mock_api.get_comments.assert_called_once()
     
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_search_comments_defaults(self, mock_api_class):
+        """Test Lambda handler fills optional fields from the dispatch table."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.search_comments.return_value = CommentResult(
+            success=True,
+            operation='search_comments',
+            comment_count=0
+        )
+        
+        response = lambda_handler({'operation': 'search_comments'}, None)
+        
+        assert response['statusCode'] == 200
+        mock_api.search_comments.assert_called_once_with(search_params={})
+    
+    @patch('lambda_tools.commentary_api.ENABLE_COMMENTS_CACHE', True)
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_get_comments_cached(self, mock_api_class):
+        """Test repeated get_comments reads are served from the cache until a write."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.get_comments.return_value = CommentResult(
+            success=True,
+            operation='get_comments',
+            article_id='test-article',
+            comment_count=1,
+            comments=[{'comment_id': 'comment-1'}]
+        )
+        mock_api.create_comment.return_value = CommentResult(
+            success=True,
+            operation='create_comment',
+            comment_id='comment-2',
+            article_id='test-article'
+        )
+        
+        get_event = {'operation': 'get_comments', 'article_id': 'test-article'}
+        
+        first = lambda_handler(get_event, None)
+        second = lambda_handler(get_event, None)
+        
+        assert first['body'] == second['body']
+        assert mock_api.get_comments.call_count == 1
+        
+        lambda_handler({
+            'operation': 'create_comment',
+            'article_id': 'test-article',
+            'author': 'user@example.com',
+            'content': 'A new comment'
+        }, None)
+        lambda_handler(get_event, None)
+        
+        assert mock_api.get_comments.call_count == 2
+    
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_emits_emf_metrics(self, mock_api_class, capsys):
+        """Test Lambda handler prints an embedded-metric-format record."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.delete_comment.return_value = CommentResult(
+            success=True,
+            operation='delete_comment',
+            comment_id='test-comment'
+        )
+        
+        lambda_handler({
+            'operation': 'delete_comment',
+            'comment_id': 'test-comment',
+            'author': 'user@example.com'
+        }, None)
+        
+        record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert record['_aws']['CloudWatchMetrics'][0]['Namespace'] == 'Sentinel/Commentary'
+        assert record['Operation'] == 'delete_comment'
+        assert record['Success'] == 1
+        assert record['Latency'] >= 0
+    
+    @patch('lambda_tools.commentary_api.ENABLE_RESPONSE_COMPRESSION', True)
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_gzips_large_responses(self, mock_api_class):
+        """Test large responses are gzipped when the client accepts gzip."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.get_comments.return_value = CommentResult(
+            success=True,
+            operation='get_comments',
+            article_id='test-article',
+            comments=[{'comment_id': f'comment-{i}', 'content': 'x' * 100} for i in range(50)]
+        )
+        
+        event = {
+            'operation': 'get_comments',
+            'article_id': 'test-article',
+            'headers': {'Accept-Encoding': 'gzip, deflate'}
+        }
+        
+        response = lambda_handler(event, None)
+        
+        assert response['isBase64Encoded'] is True
+        assert response['headers']['Content-Encoding'] == 'gzip'
+        body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+        assert len(body['comments']) == 50
+        
+        # Small responses and clients without gzip support are left uncompressed
+        mock_api.get_comments.return_value = CommentResult(success=True, operation='get_comments')
+        assert lambda_handler(event, None)['isBase64Encoded'] is False
+        event['headers'] = {}
+        assert lambda_handler(event, None)['isBase64Encoded'] is False
+    
+    @patch('lambda_tools.commentary_api.CommentaryAPI')
+    def test_lambda_handler_empty_comments_batch(self, mock_api_class):
+        """Test an empty batch is accepted like the API accepts it, while a missing one is not."""
+        mock_api = Mock()
+        mock_api_class.return_value = mock_api
+        mock_api.create_comments_batch.return_value = CommentResult(
+            success=True,
+            operation='create_comments_batch',
+            comment_count=0,
+            metadata={'article_ids': []}
+        )
+        
+        response = lambda_handler({'operation': 'create_comments_batch', 'comments': []}, None)
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['success'] is True
+        mock_api.create_comments_batch.assert_called_once_with(comments=[])
+        
+        response = lambda_handler({'operation': 'create_comments_batch'}, None)
+        
+        assert response['statusCode'] == 400
+        assert json.loads(response['body'])['error'] == 'comments is required'
+    
     def test_lambda_handler_missing_required_fields(self):
         """Test Lambda handler with missing required fields."""
         event = {
@@ -605,10 +980,25 @@ class TestLambdaHandler:
         }
         
         response = lambda_handler(event, None)
+        body = json.loads(response['body'])
+        
+        assert response['statusCode'] == 400
+        assert body['success'] is False
+        assert 'required' in body['error']
+    
+    def test_lambda_handler_reports_first_missing_field(self):
+        """Test required-field validation names the first missing field."""
+        event = {
+            'operation': 'update_comment',
+            'comment_id': 'test-comment',
+            'author': ''
+        }
+        
+        response = lambda_handler(event, None)
+        body = json.loads(response['body'])
         
-        assert response['statusCode'] == 500
-        assert response['body']['success'] is False
-        assert 'required' in response['body']['error']
+        assert body['success'] is False
+        assert body['error'] == 'author is required'
     
     def test_lambda_handler_unknown_operation(self):
         """Test Lambda handler with unknown operation."""
@@ -617,10 +1007,11 @@ class TestLambdaHandler:
         }
         
         response = lambda_handler(event, None)
+        body = json.loads(response['body'])
         
-        assert response['statusCode'] == 500
-        assert response['body']['success'] is False
-        assert 'Unknown operation' in response['body']['error']
+        assert response['statusCode'] == 400
+        assert body['success'] is False
+        assert 'Unknown operation' in body['error']
 
 
 if __name__ == '__main__':
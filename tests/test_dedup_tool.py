@@ -7,6 +7,7 @@ URL comparison, title similarity, domain clustering, and OpenSearch k-NN integra
 
 import json
 import pytest
+from array import array
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 from moto import mock_aws
@@ -52,6 +53,35 @@ class TestArticleFingerprint:
         assert fingerprint.published_at == published_at
 
 
+class TestDuplicationResult:
+    """Test DuplicationResult data class."""
+    
+    def test_to_dict(self):
+        """Test converting a result to a plain dict."""
+        similar = {'article_id': 'a-1', 'similarity': 0.9}
+        result = DuplicationResult(
+            is_duplicate=True,
+            duplicate_of="a-1",
+            similarity_score=0.9,
+            method="semantic",
+            similar_articles=[similar]
+        )
+        
+        result_dict = result.to_dict()
+        
+        assert result_dict == {
+            'is_duplicate': True,
+            'cluster_id': None,
+            'duplicate_of': 'a-1',
+            'similarity_score': 0.9,
+            'method': 'semantic',
+            'rationale': '',
+            'similar_articles': [similar]
+        }
+        assert result_dict['similar_articles'][0] is not similar
+        assert not hasattr(result, '__dict__')
+
+
 class TestHeuristicDeduplicator:
     """Test heuristic deduplication functionality."""
     
@@ -109,6 +139,37 @@ class TestHeuristicDeduplicator:
         assert result.duplicate_of == "article-2"
         assert result.similarity_score == 1.0
         assert "exact_url_match" in result.method
+        assert result.existing_cluster_id is None
+    
+    def test_duplicate_carries_existing_cluster(self):
+        """Test a match against a clustered article carries its cluster ID."""
+        self.article2.cluster_id = "cluster_article-0"
+        
+        result = self.deduplicator.find_heuristic_duplicates(self.article1, [self.article2, self.article3])
+        
+        assert result.duplicate_of == "article-2"
+        assert result.existing_cluster_id == "cluster_article-0"
+    
+    def test_content_hash_match(self):
+        """Test identical content hash short-circuits other heuristics."""
+        syndicated = ArticleFingerprint(
+            article_id="syndicated",
+            url="https://other.com/wire/story",
+            canonical_url="https://other.com/wire/story",
+            title="Unrelated Headline",
+            normalized_title="unrelated headline",
+            domain="other.com",
+            published_at=self.base_time,
+            content_hash="hash3",
+            title_hash="title_syndicated",
+            url_hash="url_syndicated"
+        )
+        
+        result = self.deduplicator.find_heuristic_duplicates(syndicated, [self.article2, self.article3])
+        
+        assert result.is_duplicate is True
+        assert result.duplicate_of == "article-3"
+        assert result.method == "heuristic_content_hash_match"
     
     def test_canonical_url_match(self):
         """Test canonical URL duplicate detection."""
@@ -157,6 +218,33 @@ class TestHeuristicDeduplicator:
         assert result.similarity_score >= 0.85
         assert "title_similarity" in result.method
     
+    def test_title_similarity_with_domain_index(self):
+        """Test title matching through a prebuilt domain index."""
+        similar_article = ArticleFingerprint(
+            article_id="similar-article",
+            url="https://example.com/different-url",
+            canonical_url="https://example.com/different-url",
+            title="Major Security Breach Impacts Users",
+            normalized_title="major security breach impacts users",
+            domain="example.com",
+            published_at=self.base_time,
+            content_hash="hash_similar",
+            title_hash="title_similar",
+            url_hash="url_similar"
+        )
+        existing_articles = [self.article1, self.article3]
+        domain_index = self.deduplicator.build_domain_index(existing_articles)
+        
+        assert set(domain_index) == {"example.com", "different.com"}
+        
+        result = self.deduplicator.find_heuristic_duplicates(
+            similar_article, existing_articles, domain_index
+        )
+        
+        assert result.is_duplicate is True
+        assert result.duplicate_of == "article-1"
+        assert "title_similarity" in result.method
+    
     def test_no_duplicate_found(self):
         """Test when no duplicates are found."""
         existing_articles = [self.article3]  # Completely different article
@@ -187,6 +275,48 @@ class TestHeuristicDeduplicator:
         
         assert result.is_duplicate is False  # Should not match due to time window
     
+    def test_sorted_time_window_filtering(self):
+        """Test binary-search time filtering over a domain bucket."""
+        old_article = ArticleFingerprint(
+            article_id="old-article",
+            url="https://example.com/old",
+            canonical_url="https://example.com/old",
+            title="Old Security Breach",
+            normalized_title="old security breach",
+            domain="example.com",
+            published_at=self.base_time - timedelta(days=5),
+            content_hash="hash_old",
+            title_hash="title_old",
+            url_hash="url_old"
+        )
+        domain_index = self.deduplicator.build_domain_index([self.article2, old_article, self.article1])
+        bucket = domain_index["example.com"]
+        
+        assert [a.article_id for a in bucket.articles] == ["old-article", "article-2", "article-1"]
+        assert bucket.published == sorted(bucket.published)
+        
+        filtered = self.deduplicator._filter_by_time_window(
+            self.article1, bucket.articles, bucket.published
+        )
+        
+        assert [a.article_id for a in filtered] == ["article-2"]
+    
+    def test_mark_batch_copies(self):
+        """Test later copies within a batch point at the first occurrence."""
+        results = [
+            DuplicationResult(is_duplicate=False),
+            DuplicationResult(is_duplicate=False),
+            DuplicationResult(is_duplicate=False)
+        ]
+        
+        self.deduplicator.mark_batch_copies([self.article1, self.article3, self.article2], results)
+        
+        assert results[0].is_duplicate is False
+        assert results[1].is_duplicate is False
+        assert results[2].is_duplicate is True
+        assert results[2].duplicate_of == "article-1"
+        assert results[2].method == "heuristic_exact_url_match"
+    
     def test_title_similarity_calculation(self):
         """Test title similarity calculation."""
         similarity = self.deduplicator._calculate_title_similarity(
@@ -195,6 +325,82 @@ class TestHeuristicDeduplicator:
         )
         assert similarity > 0.8  # Should be high similarity
     
+    def test_best_candidate_identical_and_fallback(self):
+        """Test best-match scoring short-circuits identical strings and works without RapidFuzz."""
+        candidates = [self.article1, self.article2, self.article3]
+        choices = [a.normalized_title for a in candidates]
+        
+        with patch('lambda_tools.dedup_tool.process', None):
+            identical = self.deduplicator._best_candidate(
+                "major security breach affects users", choices, candidates, 0.85
+            )
+            similar = self.deduplicator._best_candidate(
+                "major security breach impacts users", choices, candidates, 0.85
+            )
+            missing = self.deduplicator._best_candidate(
+                "patch tuesday roundup", choices, candidates, 0.85
+            )
+        
+        assert identical == (self.article1, 1.0)
+        assert similar[0] is self.article1
+        assert 0.85 <= similar[1] < 1.0
+        assert missing is None
+    
+    def test_url_path_shingle_jaccard(self):
+        """Test URL pattern similarity uses n-gram Jaccard over normalized paths."""
+        from lambda_tools.dedup_tool import url_path_shingles
+        
+        assert url_path_shingles("abcdef") == frozenset({"abcd", "bcde", "cdef"})
+        assert url_path_shingles("ab") == frozenset({"ab"})
+        assert url_path_shingles("") == frozenset()
+        
+        article = ArticleFingerprint(
+            article_id="new", url="https://a.com/news/security-breach-affects-users-worldwide",
+            canonical_url="", title="", normalized_title="", domain="a.com",
+            published_at=self.base_time, content_hash="", title_hash="", url_hash=""
+        )
+        near = ArticleFingerprint(
+            article_id="near", url="https://b.com/news/security-breach-affects-users-worldwide1",
+            canonical_url="", title="", normalized_title="", domain="b.com",
+            published_at=self.base_time, content_hash="", title_hash="", url_hash=""
+        )
+        far = ArticleFingerprint(
+            article_id="far", url="https://b.com/blog/patch-tuesday",
+            canonical_url="", title="", normalized_title="", domain="b.com",
+            published_at=self.base_time, content_hash="", title_hash="", url_hash=""
+        )
+        
+        match = self.deduplicator._find_url_pattern_duplicates(article, [far, near])
+        
+        assert match[0] is near
+        assert 0.9 <= match[1] < 1.0
+        assert self.deduplicator._find_url_pattern_duplicates(article, [far]) is None
+    
+    @pytest.mark.parametrize("path, other_path, is_duplicate", [
+        ("security/ransomware-attack-hits-hospital-chain", "security/ransomware-attack-hit-hospital-chain", True),
+        ("news/cve-2024-1234-patch", "news/cve-2024-1235-patch", True),
+        ("2024/01/15/big-breach", "2024/01/16/big-breach", True),
+        ("news/cve-2024-1234-patch", "news/cve-2024-9876-exploit", False),
+        ("security/ransomware-attack-hits-hospital-chain", "security/ransomware-attack-hits-school-district", False),
+        ("news/microsoft-patches-zero-day", "news/google-patches-zero-day", False),
+    ])
+    def test_url_pattern_threshold_on_small_edits(self, path, other_path, is_duplicate):
+        """Test paths differing by one character or one ID still match under Jaccard."""
+        article = ArticleFingerprint(
+            article_id="new", url=f"https://a.com/{path}",
+            canonical_url="", title="", normalized_title="", domain="a.com",
+            published_at=self.base_time, content_hash="", title_hash="", url_hash=""
+        )
+        candidate = ArticleFingerprint(
+            article_id="other", url=f"https://b.com/{other_path}",
+            canonical_url="", title="", normalized_title="", domain="b.com",
+            published_at=self.base_time, content_hash="", title_hash="", url_hash=""
+        )
+        
+        match = self.deduplicator._find_url_pattern_duplicates(article, [candidate])
+        
+        assert (match is not None) == is_duplicate
+    
     def test_url_normalization(self):
         """Test URL path normalization."""
         # Test that numeric IDs are replaced
@@ -257,6 +463,23 @@ class TestSemanticDeduplicator:
         assert result.similarity_score == 0.92
         assert result.method == "semantic"
     
+    @patch('lambda_tools.dedup_tool.OpenSearch')
+    @patch('lambda_tools.dedup_tool.boto_session')
+    def test_opensearch_client_reused_across_instances(self, mock_session, mock_opensearch_class):
+        """Test the OpenSearch client and credentials are built once per endpoint."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator, _get_opensearch_client
+        
+        _get_opensearch_client.cache_clear()
+        try:
+            first = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+            second = SemanticDeduplicator(self.opensearch_endpoint, "other-index")
+            
+            assert first.opensearch_client is second.opensearch_client
+            assert mock_opensearch_class.call_count == 1
+            assert mock_session.get_credentials.call_count == 1
+        finally:
+            _get_opensearch_client.cache_clear()
+    
     @patch('lambda_tools.dedup_tool.SemanticDeduplicator._generate_embedding')
     @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
     def test_embedding_generation_failure(self, mock_create_client, mock_generate_embedding):
@@ -279,6 +502,202 @@ class TestSemanticDeduplicator:
         assert "failed" in result.rationale.lower()
 
 
+    @patch('lambda_tools.dedup_tool.bedrock_client')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_generate_embedding_uses_content_cache(self, mock_create_client, mock_bedrock):
+        """Test identical title and content reuse the cached embedding."""
+        from lambda_tools import dedup_tool
+        from lambda_tools.dedup_tool import SemanticDeduplicator
+        
+        dedup_tool._embedding_cache.clear()
+        mock_bedrock.invoke_model.return_value = {
+            'body': Mock(read=Mock(return_value=json.dumps({'embedding': [0.5, 0.25]})))
+        }
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        first = deduplicator._generate_embedding("Syndicated body", "Same Title")
+        second = deduplicator._generate_embedding("Syndicated body", "Same Title")
+        deduplicator._generate_embedding("Different body", "Same Title")
+        
+        assert first == second == [0.5, 0.25]
+        assert mock_bedrock.invoke_model.call_count == 2
+        
+        # Cached embeddings are packed float32 arrays; hits get a fresh list
+        assert all(isinstance(v, array) and v.typecode == 'f' for v in dedup_tool._embedding_cache.values())
+        second.append(1.0)
+        assert deduplicator._generate_embedding("Syndicated body", "Same Title") == [0.5, 0.25]
+        dedup_tool._embedding_cache.clear()
+    
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._generate_embedding')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_generate_embeddings_batch(self, mock_create_client, mock_generate_embedding):
+        """Test concurrent batch embedding keeps order and tolerates failures."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator
+        
+        def fake_embedding(content, title):
+            if title == "bad":
+                raise Exception("Bedrock error")
+            return [float(len(title))]
+        
+        mock_generate_embedding.side_effect = fake_embedding
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        embeddings = deduplicator.generate_embeddings_batch([
+            ("content", "a"), ("content", "bad"), ("content", "abc")
+        ])
+        
+        assert embeddings == [[1.0], None, [3.0]]
+        assert deduplicator.generate_embeddings_batch([]) == []
+    
+    @patch('lambda_tools.dedup_tool.DedupTool._get_existing_articles', return_value=[])
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._generate_embedding')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_store_reuses_search_embedding(self, mock_create_client, mock_generate_embedding, mock_get_existing):
+        """Test that storing an article reuses the embedding from the search step."""
+        mock_generate_embedding.return_value = [0.1, 0.2, 0.3]
+        mock_opensearch = Mock()
+        mock_create_client.return_value = mock_opensearch
+        mock_opensearch.search.return_value = {'hits': {'hits': []}}
+        mock_opensearch.index.return_value = {'result': 'created'}
+        
+        dedup_tool = DedupTool("dummy-table", self.opensearch_endpoint, self.opensearch_index)
+        result = dedup_tool.find_duplicates({
+            'article_id': 'article-1',
+            'url': 'https://example.com/a',
+            'title': 'Title',
+            'published_at': '2024-01-15T10:00:00Z',
+            'normalized_content': 'Content'
+        })
+        
+        assert result.is_duplicate is False
+        assert mock_generate_embedding.call_count == 1
+        assert mock_opensearch.index.call_args[1]['body']['embedding'] == [0.1, 0.2, 0.3]
+        
+        # The next article is embedded once and stores its own vector, not a leftover one
+        mock_generate_embedding.return_value = [0.4, 0.5, 0.6]
+        dedup_tool.find_duplicates({
+            'article_id': 'article-2',
+            'url': 'https://example.com/b',
+            'title': 'Other Title',
+            'published_at': '2024-01-15T11:00:00Z',
+            'normalized_content': 'Other content'
+        })
+        
+        assert mock_generate_embedding.call_count == 2
+        assert mock_opensearch.index.call_args[1]['body']['article_id'] == 'article-2'
+        assert mock_opensearch.index.call_args[1]['body']['embedding'] == [0.4, 0.5, 0.6]
+
+
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._generate_embedding')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_store_with_explicit_embedding(self, mock_create_client, mock_generate_embedding):
+        """Test an explicit embedding is indexed without calling Bedrock."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator
+        
+        mock_opensearch = Mock()
+        mock_create_client.return_value = mock_opensearch
+        mock_opensearch.index.return_value = {'result': 'created'}
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        stored = deduplicator.store_article_embedding(
+            "article-1", "Title", "Content", "https://example.com/a",
+            "2024-01-15T10:00:00Z", embedding=[0.7, 0.8]
+        )
+        
+        assert stored is True
+        mock_generate_embedding.assert_not_called()
+        assert mock_opensearch.index.call_args[1]['body']['embedding'] == [0.7, 0.8]
+    
+    @patch('lambda_tools.dedup_tool.VECTOR_DATA_TYPE', 'byte')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_byte_vectors_are_quantized(self, mock_create_client):
+        """Test embeddings are scaled to int8 for byte vector indexes."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator, quantize_embedding
+        
+        assert quantize_embedding([0.5, -1.0, 0.25]) == [64, -127, 32]
+        assert quantize_embedding([0.0, 0.0]) == [0, 0]
+        
+        mock_opensearch = Mock()
+        mock_create_client.return_value = mock_opensearch
+        mock_opensearch.index.return_value = {'result': 'created'}
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        deduplicator.store_article_embedding(
+            "article-1", "Title", "Content", "https://example.com/a",
+            "2024-01-15T10:00:00Z", embedding=[0.5, -1.0, 0.25]
+        )
+        query = deduplicator._build_knn_query([0.5, -1.0, 0.25], "article-2")
+        
+        assert mock_opensearch.index.call_args[1]['body']['embedding'] == [64, -127, 32]
+        assert query['query']['bool']['must'][0]['knn']['embedding']['vector'] == [64, -127, 32]
+    
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator.generate_embeddings_batch')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_find_semantic_duplicates_batch_uses_msearch(self, mock_create_client, mock_embeddings_batch):
+        """Test batch semantic search sends one msearch and maps responses back in order."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator
+        
+        mock_embeddings_batch.return_value = [[0.1, 0.2], None, [0.3, 0.4]]
+        mock_opensearch = Mock()
+        mock_create_client.return_value = mock_opensearch
+        mock_opensearch.msearch.return_value = {
+            'responses': [
+                {'hits': {'hits': [{
+                    '_score': 0.95,
+                    '_source': {
+                        'article_id': 'existing-1',
+                        'title': 'Existing',
+                        'url': 'https://example.com/existing',
+                        'published_at': '2024-01-15T10:00:00Z'
+                    }
+                }]}},
+                {'hits': {'hits': []}}
+            ]
+        }
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        results = deduplicator.find_semantic_duplicates_batch([
+            ("content a", "title a", "article-a"),
+            ("content b", "title b", "article-b"),
+            ("content c", "title c", "article-c")
+        ])
+        
+        assert results[0].is_duplicate is True
+        assert results[0].duplicate_of == 'existing-1'
+        assert results[1].is_duplicate is False
+        assert "failed" in results[1].rationale.lower()
+        assert results[2].is_duplicate is False
+        
+        mock_opensearch.msearch.assert_called_once()
+        body = mock_opensearch.msearch.call_args[1]['body']
+        assert len(body) == 4
+        assert body[0] == {'index': self.opensearch_index}
+        assert body[3]['query']['bool']['must_not'][0]['term']['article_id'] == 'article-c'
+
+
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator.generate_embeddings_batch')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator._create_opensearch_client')
+    def test_find_semantic_duplicates_batch_compares_batch_vectors(self, mock_create_client, mock_embeddings_batch):
+        """Test articles of one batch are matched against each other's vectors."""
+        from lambda_tools.dedup_tool import SemanticDeduplicator
+        
+        mock_embeddings_batch.return_value = [[1.0, 0.0], [0.0, 1.0], [0.99, 0.05]]
+        mock_opensearch = Mock()
+        mock_create_client.return_value = mock_opensearch
+        mock_opensearch.msearch.return_value = {'responses': [{'hits': {'hits': []}}] * 3}
+        
+        deduplicator = SemanticDeduplicator(self.opensearch_endpoint, self.opensearch_index)
+        results = deduplicator.find_semantic_duplicates_batch([
+            ("content a", "title a", "article-a"),
+            ("content b", "title b", "article-b"),
+            ("content a again", "title a again", "article-c")
+        ])
+        
+        assert [r.is_duplicate for r in results] == [False, False, True]
+        assert results[2].duplicate_of == "article-a"
+        assert results[2].similarity_score > 0.99
+
+
 class TestClusterManager:
     """Test cluster management functionality."""
     
@@ -307,11 +726,11 @@ class TestClusterManager:
         mock_update.assert_called_once_with("article-123", "cluster_article-123", None)
     
     @patch('lambda_tools.dedup_tool.ClusterManager._update_article_cluster')
-    @patch('lambda_tools.dedup_tool.ClusterManager._get_article_cluster')
-    def test_assign_to_existing_cluster(self, mock_get_cluster, mock_update):
+    @patch('lambda_tools.dedup_tool.ClusterManager._claim_cluster')
+    def test_assign_to_existing_cluster(self, mock_claim_cluster, mock_update):
         """Test assigning article to existing cluster."""
         # Mock that the original article already has a cluster
-        mock_get_cluster.return_value = "cluster_original-article"
+        mock_claim_cluster.return_value = "cluster_original-article"
         mock_update.return_value = None
         
         # Create duplicate result
@@ -328,38 +747,44 @@ class TestClusterManager:
         assert cluster_id == "cluster_original-article"
         
         # Verify methods were called correctly
-        mock_get_cluster.assert_called_once_with("original-article")
+        mock_claim_cluster.assert_called_once_with("original-article")
         mock_update.assert_called_once_with("duplicate-article", "cluster_original-article", "original-article")
     
     @patch('lambda_tools.dedup_tool.ClusterManager._update_article_cluster')
-    @patch('lambda_tools.dedup_tool.ClusterManager._get_article_cluster')
-    def test_create_cluster_for_original_when_none_exists(self, mock_get_cluster, mock_update):
-        """Test creating a new cluster when original article has no cluster."""
-        # Mock that the original article has no cluster yet
-        mock_get_cluster.return_value = None
-        mock_update.return_value = None
-        
-        # Create duplicate result
+    @patch('lambda_tools.dedup_tool.ClusterManager._claim_cluster')
+    def test_assign_reuses_known_cluster(self, mock_claim_cluster, mock_update):
+        """Test a duplicate whose original's cluster is known skips the claim update."""
         duplicate_result = DuplicationResult(
             is_duplicate=True,
             duplicate_of="original-article",
-            similarity_score=0.95,
-            method="heuristic",
-            rationale="Exact URL match"
+            similarity_score=1.0,
+            method="heuristic_exact_url_match",
+            rationale="Exact URL match",
+            existing_cluster_id="cluster_earlier-article"
         )
         
         cluster_id = self.cluster_manager.assign_cluster("duplicate-article", duplicate_result)
         
-        assert cluster_id == "cluster_original-article"
+        assert cluster_id == "cluster_earlier-article"
+        mock_claim_cluster.assert_not_called()
+        mock_update.assert_called_once_with("duplicate-article", "cluster_earlier-article", "original-article")
+    
+    def test_claim_cluster_uses_conditional_update(self):
+        """Test the original's cluster is read and created in one conditional update."""
+        self.cluster_manager.articles_table = Mock()
+        self.cluster_manager.articles_table.update_item.return_value = {
+            'Attributes': {'cluster_id': 'cluster_earlier-article', 'is_duplicate': True}
+        }
         
-        # Verify methods were called correctly - should create cluster for original first
-        mock_get_cluster.assert_called_once_with("original-article")
-        assert mock_update.call_count == 2  # Once for original, once for duplicate
+        cluster_id = self.cluster_manager._claim_cluster("original-article")
         
-        # Check the calls
-        calls = mock_update.call_args_list
-        assert calls[0] == (("original-article", "cluster_original-article", None),)
-        assert calls[1] == (("duplicate-article", "cluster_original-article", "original-article"),)
+        # An existing cluster wins over the one the update would create
+        assert cluster_id == "cluster_earlier-article"
+        kwargs = self.cluster_manager.articles_table.update_item.call_args[1]
+        assert kwargs['Key'] == {'article_id': 'original-article'}
+        assert "if_not_exists(cluster_id, :cluster_id)" in kwargs['UpdateExpression']
+        assert kwargs['ExpressionAttributeValues'][':cluster_id'] == "cluster_original-article"
+        assert kwargs['ReturnValues'] == 'UPDATED_NEW'
 
 
 class TestDedupTool:
@@ -414,6 +839,151 @@ class TestDedupTool:
         assert result.duplicate_of == 'existing-article'
         assert "heuristic" in result.method
     
+    @patch('lambda_tools.dedup_tool.DedupTool._get_existing_articles')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator.generate_embeddings_batch')
+    @patch('lambda_tools.dedup_tool.SemanticDeduplicator.find_semantic_duplicates_batch')
+    def test_find_duplicates_batch_reads_existing_articles_once(self, mock_semantic_batch,
+                                                                mock_embeddings_batch, mock_get_existing):
+        """Test a batch shares one existing-articles read covering every article."""
+        existing_article = ArticleFingerprint(
+            article_id='existing-article',
+            url='https://example.com/test',
+            canonical_url='https://example.com/test',
+            title='Test Article',
+            normalized_title='test article',
+            domain='example.com',
+            published_at=datetime(2024, 1, 15, 9, 0),
+            content_hash='hash123',
+            title_hash='title123',
+            url_hash='url123'
+        )
+        mock_get_existing.return_value = [existing_article]
+        mock_embeddings_batch.return_value = [[0.1, 0.2]]
+        mock_semantic_batch.return_value = [DuplicationResult(is_duplicate=True, method="semantic")]
+        
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        results = dedup_tool.find_duplicates_batch([
+            {
+                'article_id': 'new-1',
+                'url': 'https://example.com/test',
+                'title': 'Test Article',
+                'published_at': '2024-01-15T10:00:00'
+            },
+            {
+                'article_id': 'new-2',
+                'url': 'https://other.com/unrelated',
+                'title': 'Unrelated Story',
+                'published_at': '2024-01-14T10:00:00'
+            }
+        ])
+        
+        assert results[0].duplicate_of == 'existing-article'
+        assert results[1].method == "semantic"
+        assert mock_semantic_batch.call_args[0][1] == [[0.1, 0.2]]
+        mock_get_existing.assert_called_once_with(
+            datetime(2024, 1, 15, 10, 0), earliest=datetime(2024, 1, 14, 10, 0)
+        )
+    
+    @patch('lambda_tools.dedup_tool.USE_PUBLISHED_DATE_INDEX', True)
+    def test_get_existing_articles_queries_day_partitions(self):
+        """Test existing articles are read from the published-date index with pagination."""
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        dedup_tool.articles_table = Mock()
+        item = {
+            'article_id': 'existing-article',
+            'url': 'https://example.com/test',
+            'title': 'Test Article',
+            'published_at': '2024-01-15T09:00:00+00:00'
+        }
+        dedup_tool.articles_table.query.side_effect = [
+            {'Items': [], 'LastEvaluatedKey': {'article_id': 'x'}},
+            {'Items': []},
+            {'Items': [item]}
+        ]
+        
+        published_at = datetime(2024, 1, 15, 10, 0)
+        articles = dedup_tool._get_existing_articles(published_at, days_back=1)
+        
+        assert [a.article_id for a in articles] == ['existing-article']
+        assert articles[0].domain == 'example.com'
+        calls = dedup_tool.articles_table.query.call_args_list
+        assert len(calls) == 3
+        assert calls[0][1]['IndexName'] == 'published_date-published_at-index'
+        assert calls[1][1]['ExclusiveStartKey'] == {'article_id': 'x'}
+        dedup_tool.articles_table.meta.client.scan.assert_not_called()
+    
+    @patch('lambda_tools.dedup_tool.USE_PUBLISHED_DATE_INDEX', True)
+    def test_query_day_partitions_are_utc(self):
+        """Test day partitions are derived from the UTC instant, not the local date."""
+        from datetime import timezone
+        
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        dedup_tool.articles_table = Mock()
+        dedup_tool.articles_table.query.return_value = {'Items': []}
+        
+        plus_five = timezone(timedelta(hours=5))
+        dedup_tool._query_articles_by_day(
+            datetime(2024, 1, 15, 2, 0, tzinfo=plus_five),
+            datetime(2024, 1, 15, 4, 0, tzinfo=plus_five)
+        )
+        
+        condition = dedup_tool.articles_table.query.call_args[1]['KeyConditionExpression']
+        day_condition, time_condition = condition.get_expression()['values']
+        assert dedup_tool.articles_table.query.call_count == 1
+        assert day_condition.get_expression()['values'][1] == '2024-01-14'
+        assert time_condition.get_expression()['values'][1:] == (
+            '2024-01-14T21:00:00+00:00', '2024-01-14T23:00:00+00:00'
+        )
+    
+    def test_get_existing_articles_scans_until_index_enabled(self):
+        """Test the published-date index is not read before the backfill is enabled."""
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        dedup_tool.articles_table = Mock()
+        dedup_tool.articles_table.meta.client.scan.return_value = {'Items': []}
+        
+        dedup_tool._get_existing_articles(datetime(2024, 1, 15, 10, 0))
+        
+        dedup_tool.articles_table.query.assert_not_called()
+        assert dedup_tool.articles_table.meta.client.scan.call_count == 8
+    
+    @patch('lambda_tools.dedup_tool.USE_PUBLISHED_DATE_INDEX', True)
+    def test_get_existing_articles_falls_back_to_scan(self):
+        """Test scan fallback when the published-date index does not exist."""
+        from botocore.exceptions import ClientError
+        
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        dedup_tool.articles_table = Mock()
+        dedup_tool.articles_table.name = "dummy-table"
+        dedup_tool.articles_table.query.side_effect = ClientError(
+            {'Error': {'Code': 'ValidationException', 'Message': 'no such index'}}, 'Query'
+        )
+        
+        def scan_segment(**kwargs):
+            if kwargs['Segment'] != 3:
+                return {'Items': []}
+            if 'ExclusiveStartKey' not in kwargs:
+                return {'Items': [], 'LastEvaluatedKey': {'article_id': {'S': 'x'}}}
+            return {'Items': [{
+                'article_id': {'S': 'existing-article'},
+                'url': {'S': 'https://example.com/test'},
+                'title': {'S': 'Test Article'},
+                'published_at': {'S': '2024-01-15T09:00:00Z'}
+            }]}
+        
+        # Segments scan through the thread-safe client, not the shared Table resource
+        dedup_tool.articles_table.meta.client.scan.side_effect = scan_segment
+        
+        articles = dedup_tool._get_existing_articles(datetime(2024, 1, 15, 10, 0))
+        
+        assert [a.article_id for a in articles] == ['existing-article']
+        assert articles[0].title == 'Test Article'
+        dedup_tool.articles_table.scan.assert_not_called()
+        scan_calls = [c[1] for c in dedup_tool.articles_table.meta.client.scan.call_args_list]
+        assert sorted({c['Segment'] for c in scan_calls}) == list(range(8))
+        assert all(c['TotalSegments'] == 8 and c['TableName'] == 'dummy-table' for c in scan_calls)
+        assert scan_calls[0]['ExpressionAttributeNames'] == {'#url': 'url'}
+        assert scan_calls[0]['ExpressionAttributeValues'][':end_time'] == {'S': '2024-01-15T10:00:00'}
+    
     def test_create_article_fingerprint(self):
         """Test creating article fingerprint from data."""
         article_data = {
@@ -434,6 +1004,18 @@ class TestDedupTool:
         assert fingerprint.normalized_title == 'major security breach'
         assert fingerprint.domain == 'example.com'
     
+    def test_parse_published_at(self):
+        """Test ISO timestamps with a Z suffix parse as UTC, with and without ciso8601."""
+        from datetime import timezone
+        from lambda_tools.dedup_tool import parse_published_at
+        
+        expected = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        parse_published_at.cache_clear()
+        with patch('lambda_tools.dedup_tool.ciso8601', None):
+            assert parse_published_at('2024-01-15T10:30:00Z') == expected
+            assert parse_published_at('2024-01-15T10:30:00+00:00') == expected
+        parse_published_at.cache_clear()
+    
     def test_normalize_title(self):
         """Test title normalization."""
         dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
@@ -451,6 +1033,18 @@ class TestDedupTool:
             result = dedup_tool._normalize_title(original)
             assert result == expected
     
+    def test_normalize_title_is_memoized(self):
+        """Test repeated titles are served from the normalization cache."""
+        from lambda_tools.dedup_tool import normalize_title
+        
+        normalize_title.cache_clear()
+        dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
+        
+        dedup_tool._normalize_title("Breaking: Security Alert!")
+        dedup_tool._normalize_title("Breaking: Security Alert!")
+        
+        assert normalize_title.cache_info().hits == 1
+    
     def test_extract_domain(self):
         """Test domain extraction from URLs."""
         dedup_tool = DedupTool("dummy-table", "dummy-opensearch", "dummy-index")
@@ -512,6 +1106,39 @@ class TestLambdaHandler:
         assert result['body']['cluster_id'] == 'cluster_existing-article'
         assert result['body']['result']['is_duplicate'] is True
     
+    @patch.dict(os.environ, {
+        'ARTICLES_TABLE': 'test-articles',
+        'OPENSEARCH_ENDPOINT': 'https://test-opensearch.us-east-1.es.amazonaws.com'
+    })
+    @patch('lambda_tools.dedup_tool.DedupTool')
+    def test_lambda_handler_batch(self, mock_dedup_tool_class):
+        """Test Lambda handler with a batch of articles."""
+        mock_dedup_tool = Mock()
+        mock_dedup_tool_class.return_value = mock_dedup_tool
+        mock_dedup_tool.find_duplicates_batch.return_value = [
+            DuplicationResult(is_duplicate=False, method="semantic"),
+            DuplicationResult(is_duplicate=True, duplicate_of="article-1", similarity_score=0.9)
+        ]
+        mock_dedup_tool.assign_cluster.side_effect = ["cluster_article-1", "cluster_article-1"]
+        
+        articles = [
+            {
+                'article_id': f'article-{i}',
+                'url': f'https://example.com/{i}',
+                'title': 'Test Article',
+                'published_at': '2024-01-15T10:30:00Z'
+            }
+            for i in (1, 2)
+        ]
+        
+        result = lambda_handler({'articles': articles}, None)
+        
+        assert result['statusCode'] == 200
+        assert result['body']['success'] is True
+        assert [r['article_id'] for r in result['body']['results']] == ['article-1', 'article-2']
+        assert result['body']['results'][1]['result']['duplicate_of'] == 'article-1'
+        mock_dedup_tool.find_duplicates_batch.assert_called_once_with(articles)
+    
     def test_lambda_handler_missing_required_field(self):
         """Test Lambda handler with missing required field."""
         event = {
@@ -2,12 +2,14 @@
 Unit tests for FeedParser Lambda tool.
 """
 
+import gzip
 import json
 import os
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 from botocore.exceptions import ClientError
+from feedparser import FeedParserDict
 
 from src.lambda_tools.feed_parser import (
     FeedParser, 
@@ -110,6 +112,88 @@ class TestContentNormalizer:
         assert metadata['images'][0]['alt'] == 'Image 1'
         assert metadata['images'][0]['title'] == 'First Image'
 
+    def test_normalize_html_extracts_urls_from_text(self):
+        """Test URL extraction stops at quotes, brackets and whitespace."""
+        html = '<p>Advisory (https://example.com/advisory?id=1) and "http://test.com/a"</p>'
+
+        result = self.normalizer.normalize_html(html)
+
+        assert sorted(result['extracted_urls']) == [
+            'http://test.com/a',
+            'https://example.com/advisory?id=1'
+        ]
+
+    def test_normalize_html_caps_extracted_urls(self):
+        """Test URLs are deduplicated in first-seen order and capped."""
+        links = ' '.join(f'https://spam.example/{i}' for i in range(80))
+        html = f'<p>https://spam.example/0 {links}</p>'
+
+        result = self.normalizer.normalize_html(html)
+
+        assert result['extracted_urls'] == [f'https://spam.example/{i}' for i in range(50)]
+
+    def test_normalize_html_stream_matches_normalize_html(self):
+        """Test that streaming normalization matches the tree-based result."""
+        html = """
+        <html>
+            <head>
+                <title>Stream Test</title>
+                <meta name="description" content="Streamed">
+                <script>var skipped = true;</script>
+            </head>
+            <body>
+                <p>Intro with <a href="http://example.com">a <b>bold</b> link</a> inside.</p>
+                <img src="image1.jpg" alt="Image 1">
+                <style>p { color: red; }</style>
+                <p>Café déjà vu</p>
+            </body>
+        </html>
+        """
+
+        expected = self.normalizer.normalize_html(html)
+        result = self.normalizer.normalize_html_stream(html.encode('utf-8'))
+
+        assert result == expected
+        assert 'skipped' not in result['normalized_text']
+        assert result['metadata']['links'][0]['text'] == 'a bold link'
+
+    def test_normalize_html_without_metadata(self):
+        """Test that metadata collection can be skipped."""
+        html = """
+        <html>
+            <head><title>No Metadata</title><meta name="author" content="Someone"></head>
+            <body><p>Read <a href="http://example.com">http://example.com</a> now.</p></body>
+        </html>
+        """
+
+        full = self.normalizer.normalize_html(html)
+        result = self.normalizer.normalize_html(html, extract_metadata=False)
+        streamed = self.normalizer.normalize_html_stream(html.encode('utf-8'), extract_metadata=False)
+
+        assert 'metadata' not in result
+        assert result == streamed
+        assert result['normalized_text'] == full['normalized_text']
+        assert result['extracted_urls'] == ['http://example.com']
+        assert result['word_count'] == full['word_count']
+
+
+    @patch('src.lambda_tools.feed_parser._make_soup')
+    @patch('src.lambda_tools.feed_parser.lxml_html', None)
+    def test_normalize_html_regex_fallback(self, mock_make_soup):
+        """Test text-only normalization without lxml skips BeautifulSoup."""
+        html = (
+            '<p>Patch <b>now</b> &amp; see https://example.com/advisory</p>'
+            '<SCRIPT type="text/javascript">var hidden = 1;</SCRIPT>'
+            '<style>p { color: red; }</style><p>Done</p>'
+        )
+
+        result = self.normalizer.normalize_html(html, extract_metadata=False)
+
+        mock_make_soup.assert_not_called()
+        assert result['normalized_text'] == 'Patch now & see https://example.com/advisory Done'
+        assert result['extracted_urls'] == ['https://example.com/advisory']
+        assert 'metadata' not in result
+
 
 class TestFeedParser:
     """Test cases for FeedParser class."""
@@ -120,10 +204,11 @@ class TestFeedParser:
     
     def test_parse_date_valid(self):
         """Test date parsing with valid date tuple."""
-        mock_entry = Mock()
-        mock_entry.published_parsed = (2024, 1, 15, 10, 30, 0, 0, 15, 0)
-        mock_entry.updated_parsed = None
-        mock_entry.created_parsed = None
+        mock_entry = FeedParserDict(
+            published_parsed=(2024, 1, 15, 10, 30, 0, 0, 15, 0),
+            updated_parsed=None,
+            created_parsed=None
+        )
         
         result = self.parser._parse_date(mock_entry)
         
@@ -136,10 +221,11 @@ class TestFeedParser:
     
     def test_parse_date_fallback(self):
         """Test date parsing with fallback to updated_parsed."""
-        mock_entry = Mock()
-        mock_entry.published_parsed = None
-        mock_entry.updated_parsed = (2024, 2, 20, 15, 45, 30, 0, 51, 0)
-        mock_entry.created_parsed = None
+        mock_entry = FeedParserDict(
+            published_parsed=None,
+            updated_parsed=(2024, 2, 20, 15, 45, 30, 0, 51, 0),
+            created_parsed=None
+        )
         
         result = self.parser._parse_date(mock_entry)
         
@@ -150,45 +236,61 @@ class TestFeedParser:
     
     def test_parse_date_none(self):
         """Test date parsing when no date is available."""
-        mock_entry = Mock()
-        mock_entry.published_parsed = None
-        mock_entry.updated_parsed = None
-        mock_entry.created_parsed = None
-        mock_entry.published = None
-        mock_entry.updated = None
-        mock_entry.created = None
+        mock_entry = FeedParserDict(
+            published_parsed=None,
+            updated_parsed=None,
+            created_parsed=None,
+            published=None,
+            updated=None,
+            created=None
+        )
         
         result = self.parser._parse_date(mock_entry)
         
         assert result is None
     
+    def test_parse_date_string_fields(self):
+        """Test string date parsing remembers the winning feedparser handler."""
+        mock_entry = FeedParserDict(published="Mon, 15 Jan 2024 10:30:00 GMT")
+        
+        result = self.parser._parse_date(mock_entry)
+        
+        assert result == datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+        winner = self.parser._winning_date_parser
+        assert winner is not None
+        
+        mock_entry['published'] = "2024-02-20T15:45:30Z"
+        result = self.parser._parse_date(mock_entry)
+        
+        assert result == datetime(2024, 2, 20, 15, 45, 30, tzinfo=timezone.utc)
+        assert self.parser._winning_date_parser is not winner
+    
     def test_extract_content_priority(self):
         """Test content extraction priority order."""
-        mock_entry = Mock()
+        # feedparser aliases description to summary, so plain dicts keep them apart
+        mock_entry = {
+            'content': [{'value': "Content from content field"}],
+            'description': "Description content",
+            'summary': "Summary content",
+            'title': "Title content"
+        }
         
         # Test content field priority
-        mock_content = Mock()
-        mock_content.value = "Content from content field"
-        mock_entry.content = [mock_content]
-        mock_entry.description = "Description content"
-        mock_entry.summary = "Summary content"
-        mock_entry.title = "Title content"
-        
         result = self.parser._extract_content(mock_entry)
         assert result == "Content from content field"
         
         # Test description fallback
-        mock_entry.content = None
+        mock_entry['content'] = None
         result = self.parser._extract_content(mock_entry)
         assert result == "Description content"
         
         # Test summary fallback
-        mock_entry.description = None
+        mock_entry['description'] = None
         result = self.parser._extract_content(mock_entry)
         assert result == "Summary content"
         
         # Test title fallback
-        mock_entry.summary = None
+        mock_entry['summary'] = None
         result = self.parser._extract_content(mock_entry)
         assert result == "Title content"
     
@@ -217,10 +319,13 @@ class TestFeedParser:
         mock_s3.put_object.assert_called_once_with(
             Bucket=self.bucket_name,
             Key="test/key.html",
-            Body=b"test content",
+            Body=ANY,
             ContentType="text/html",
-            ServerSideEncryption="AES256"
+            ServerSideEncryption="AES256",
+            ContentEncoding="gzip"
         )
+        body = mock_s3.put_object.call_args.kwargs['Body']
+        assert gzip.decompress(body) == b"test content"
     
     @patch('src.lambda_tools.feed_parser.s3_client')
     def test_store_content_s3_failure(self, mock_s3):
@@ -240,32 +345,34 @@ class TestFeedParser:
         """Test successful feed parsing."""
         # Mock HTTP response
         mock_response = Mock()
-        mock_response.content = b"<rss>test feed</rss>"
+        mock_response.iter_content.return_value = [b"<rss>test feed</rss>"]
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
         # Mock feedparser response
-        mock_feed = Mock()
-        mock_feed.bozo = False
-        mock_feed.bozo_exception = None
-        mock_feed.feed = Mock()
-        mock_feed.feed.title = "Test Feed"
-        mock_feed.feed.description = "Test Description"
-        mock_feed.feed.link = "https://example.com"
+        mock_feed = FeedParserDict(
+            bozo=False,
+            bozo_exception=None,
+            feed=FeedParserDict(
+                title="Test Feed",
+                description="Test Description",
+                link="https://example.com"
+            )
+        )
         
         # Mock feed entry
-        mock_entry = Mock()
-        mock_entry.title = "Test Article"
-        mock_entry.link = "https://example.com/article"
-        mock_entry.published_parsed = (2024, 1, 15, 10, 30, 0, 0, 15, 0)
-        mock_entry.author = "Test Author"
-        mock_entry.tags = []
-        mock_entry.id = "test-id"
-        mock_entry.summary = "Test summary"
-        mock_entry.content = [Mock(value="<p>Test content</p>")]
-        mock_entry.description = None
-        
-        mock_feed.entries = [mock_entry]
+        mock_entry = FeedParserDict(
+            title="Test Article",
+            link="https://example.com/article",
+            published_parsed=(2024, 1, 15, 10, 30, 0, 0, 15, 0),
+            author="Test Author",
+            tags=[],
+            id="test-id",
+            summary="Test summary",
+            content=[FeedParserDict(value="<p>Test content</p>")]
+        )
+        
+        mock_feed['entries'] = [mock_entry]
         mock_feedparser.return_value = mock_feed
         
         # Mock S3 operations
@@ -282,6 +389,33 @@ class TestFeedParser:
         assert 'raw_s3_uri' in article
         assert 'normalized_s3_uri' in article
     
+    @patch('src.lambda_tools.feed_parser.s3_client')
+    def test_process_entry_hashes_normalized_text(self, mock_s3):
+        """Test that markup-only differences share a content hash but not a raw hash."""
+        mock_s3.put_object.return_value = {}
+        
+        def make_entry(html):
+            return FeedParserDict(
+                title="Test Article",
+                link="https://example.com/article",
+                published_parsed=(2024, 1, 15, 10, 30, 0, 0, 15, 0),
+                author="Test Author",
+                tags=[],
+                id="test-id",
+                summary="Test summary",
+                content=[FeedParserDict(value=html)]
+            )
+        
+        first = self.parser._process_entry(make_entry("<p>Same story</p>"), "test-feed", {})
+        second = self.parser._process_entry(
+            make_entry('<div class="syndicated"><p>Same <b>story</b></p></div>'), "test-feed", {}
+        )
+        
+        assert first['content_hash'] == second['content_hash']
+        assert first['raw_hash'] != second['raw_hash']
+        assert first['raw_s3_uri'].endswith(f"{first['raw_hash']}.html")
+        assert first['normalized_s3_uri'].endswith(f"{first['content_hash']}.json")
+    
     @patch('requests.Session.get')
     def test_parse_feed_network_error(self, mock_get):
         """Test feed parsing with network error."""
@@ -296,35 +430,37 @@ class TestFeedParser:
         """Test feed parsing with since date filter."""
         # Mock HTTP response
         mock_response = Mock()
-        mock_response.content = b"<rss>test feed</rss>"
+        mock_response.iter_content.return_value = [b"<rss>test feed</rss>"]
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
         # Mock feedparser response
-        mock_feed = Mock()
-        mock_feed.bozo = False
-        mock_feed.bozo_exception = None
-        mock_feed.feed = Mock()
-        mock_feed.feed.title = "Test Feed"
+        mock_feed = FeedParserDict(
+            bozo=False,
+            bozo_exception=None,
+            feed=FeedParserDict(title="Test Feed")
+        )
         
         # Mock old entry (should be filtered out)
-        old_entry = Mock()
-        old_entry.title = "Old Article"
-        old_entry.link = "https://example.com/old"
-        old_entry.published_parsed = (2023, 1, 1, 0, 0, 0, 0, 1, 0)  # Old date
+        old_entry = FeedParserDict(
+            title="Old Article",
+            link="https://example.com/old",
+            published_parsed=(2023, 1, 1, 0, 0, 0, 0, 1, 0)  # Old date
+        )
         
         # Mock new entry (should be included)
-        new_entry = Mock()
-        new_entry.title = "New Article"
-        new_entry.link = "https://example.com/new"
-        new_entry.published_parsed = (2024, 6, 1, 0, 0, 0, 0, 153, 0)  # New date
-        new_entry.author = ""
-        new_entry.tags = []
-        new_entry.id = "new-id"
-        new_entry.summary = ""
-        new_entry.content = [Mock(value="New content")]
-        
-        mock_feed.entries = [old_entry, new_entry]
+        new_entry = FeedParserDict(
+            title="New Article",
+            link="https://example.com/new",
+            published_parsed=(2024, 6, 1, 0, 0, 0, 0, 153, 0),  # New date
+            author="",
+            tags=[],
+            id="new-id",
+            summary="",
+            content=[FeedParserDict(value="New content")]
+        )
+        
+        mock_feed['entries'] = [old_entry, new_entry]
         mock_feedparser.return_value = mock_feed
         
         # Mock S3 operations
@@ -337,6 +473,48 @@ class TestFeedParser:
             assert len(result) == 1
             assert result[0]['title'] == "New Article"
 
+    @patch('requests.Session.get')
+    @patch('src.lambda_tools.feed_parser.s3_client')
+    def test_parse_feed_drops_articles_with_failed_uploads(self, mock_s3, mock_get):
+        """Test that articles whose S3 uploads fail are left out of the results."""
+        mock_response = Mock()
+        mock_response.iter_content.return_value = [b"""<?xml version="1.0"?>
+        <rss version="2.0"><channel>
+            <title>Test Feed</title>
+            <link>https://example.com</link>
+            <item>
+                <title>Stored Article</title>
+                <link>https://example.com/stored</link>
+                <description>&lt;p&gt;Stored content&lt;/p&gt;</description>
+            </item>
+            <item>
+                <title>Failed Article</title>
+                <link>https://example.com/failed</link>
+                <description>&lt;p&gt;Failed content&lt;/p&gt;</description>
+            </item>
+        </channel></rss>"""]
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        stored_keys = []
+
+        def put_object(**kwargs):
+            stored_keys.append(kwargs['Key'])
+            if b'Failed content' in gzip.decompress(kwargs['Body']):
+                raise ClientError(
+                    {'Error': {'Code': 'SlowDown', 'Message': 'Slow down'}},
+                    'PutObject'
+                )
+            return {}
+
+        mock_s3.put_object.side_effect = put_object
+
+        result = self.parser.parse_feed("https://example.com/feed.xml", "test-feed")
+
+        assert [article['title'] for article in result] == ["Stored Article"]
+        assert result[0]['raw_s3_uri'].startswith(f"s3://{self.bucket_name}/raw/test-feed/")
+        assert len(stored_keys) == 4
+
 
 class TestLambdaHandler:
     """Test cases for Lambda handler function."""
@@ -402,6 +580,36 @@ class TestLambdaHandler:
             assert args[1] == 'test-feed'
             assert args[2] is not None  # since parameter
     
+    @patch('src.lambda_tools.feed_parser.s3_client')
+    @patch('src.lambda_tools.feed_parser.FeedParser.parse_feed')
+    def test_lambda_handler_returns_manifest(self, mock_parse_feed, mock_s3):
+        """Test articles are written to an NDJSON manifest when requested."""
+        mock_articles = [
+            {'title': 'First', 'content_hash': 'abc123'},
+            {'title': 'Second', 'content_hash': 'def456'}
+        ]
+        mock_parse_feed.return_value = mock_articles
+        mock_s3.put_object.return_value = {}
+        
+        event = {
+            'feed_id': 'test-feed',
+            'feed_url': 'https://example.com/feed.xml',
+            'return_manifest': True
+        }
+        
+        with patch.dict(os.environ, {'CONTENT_BUCKET': 'test-bucket'}):
+            result = lambda_handler(event, None)
+        
+        assert result['statusCode'] == 200
+        assert result['body']['articles_count'] == 2
+        assert 'articles' not in result['body']
+        assert result['body']['manifest_s3_uri'].startswith('s3://test-bucket/manifests/test-feed/')
+        
+        kwargs = mock_s3.put_object.call_args.kwargs
+        assert kwargs['ContentType'] == 'application/x-ndjson'
+        lines = kwargs['Body'].split(b'\n')
+        assert [json.loads(line) for line in lines] == mock_articles
+    
     def test_lambda_handler_invalid_since(self):
         """Test Lambda handler with invalid since parameter."""
         event = {
@@ -463,16 +671,17 @@ class TestErrorHandling:
         """Test feed parser with malformed feed data."""
         with patch('requests.Session.get') as mock_get:
             mock_response = Mock()
-            mock_response.content = b"not a valid feed"
+            mock_response.iter_content.return_value = [b"not a valid feed"]
             mock_response.raise_for_status.return_value = None
             mock_get.return_value = mock_response
             
             with patch('feedparser.parse') as mock_feedparser:
-                mock_feed = Mock()
-                mock_feed.bozo = True
-                mock_feed.bozo_exception = Exception("Malformed feed")
-                mock_feed.feed = Mock()
-                mock_feed.entries = []
+                mock_feed = FeedParserDict(
+                    bozo=True,
+                    bozo_exception=Exception("Malformed feed"),
+                    feed=FeedParserDict(),
+                    entries=[]
+                )
                 mock_feedparser.return_value = mock_feed
                 
                 # Should not raise exception, just log warning
@@ -7,15 +7,21 @@ and bias/sensationalism filtering.
 """
 
 import json
+import threading
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
+from dataclasses import asdict
 from datetime import datetime
+from botocore.exceptions import ClientError
 
 # Import the modules to test
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'lambda_tools'))
 
+import guardrail_tool
 from guardrail_tool import (
     GuardrailTool, JSONSchemaValidator, PIIDetector, CVEValidator,
     BiasAndSensationalismDetector, GuardrailViolationType, GuardrailViolation,
@@ -23,6 +29,25 @@ from guardrail_tool import (
 )
 
 
+class TestGuardrailViolation:
+    """Test violation serialization."""
+    
+    def test_to_dict_matches_asdict(self):
+        """Test to_dict gives the asdict fields with the enum as its value."""
+        violation = GuardrailViolation(
+            violation_type=GuardrailViolationType.PII_DETECTED,
+            severity="high",
+            description="PII detected: 1 entities",
+            suggested_fix="Review and redact PII before publication",
+            confidence=0.9
+        )
+        
+        result = violation.to_dict()
+        
+        assert result == {**asdict(violation), 'violation_type': 'pii_detected'}
+        assert type(result['violation_type']) is str
+
+
 class TestJSONSchemaValidator:
     """Test JSON schema validation functionality."""
     
@@ -68,6 +93,34 @@ class TestJSONSchemaValidator:
         violations = self.validator.validate_schema(invalid_data, "article_schema")
         assert len(violations) > 0
     
+    def test_reports_every_schema_error(self):
+        """Test each schema error becomes its own violation."""
+        invalid_data = {
+            "article_id": "",
+            "title": "Test Article",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "relevancy_score": 1.5
+        }
+        
+        violations = self.validator.validate_schema(invalid_data, "article_schema")
+        
+        assert sorted(v.location for v in violations) == ["Path: article_id", "Path: relevancy_score"]
+    
+    def test_reports_schema_errors_without_fastjsonschema(self):
+        """Test the jsonschema path alone still reports schema errors."""
+        self.validator._compiled = {}
+        
+        violations = self.validator.validate_schema({"title": "Test Article"}, "article_schema")
+        
+        # One violation per missing required property (article_id, url, published_at)
+        assert len(violations) == 3
+        assert all(v.violation_type == GuardrailViolationType.SCHEMA_VIOLATION for v in violations)
+    
+    def test_guardrail_tools_share_compiled_validators(self):
+        """Test GuardrailTool instances reuse one compiled schema validator."""
+        assert GuardrailTool().schema_validator is GuardrailTool().schema_validator
+    
     def test_unknown_schema(self):
         """Test validation with unknown schema name."""
         data = {"test": "data"}
@@ -115,6 +168,57 @@ class TestPIIDetector:
         assert result.has_pii
         assert any(entity['type'] == 'ssn' for entity in result.pii_entities)
     
+    def test_pattern_scan_matches_per_pattern_finditer(self):
+        """Test the single-pass scan finds the same spans as per-pattern finditer."""
+        content = (
+            "Mail john.doe@company.com, call +1 555.123.4567, SSN 123-45-6789, "
+            "card 4111-1111-1111-1111 from 192.168.0.1 with key " + "A1" * 20 +
+            " and hash $2b$12$abcdefghijklmnopqrstuvwxyz0123"
+        )
+        
+        expected = sorted(
+            (pii_type, m.start(), m.end())
+            for pii_type, pattern in self.detector.pii_patterns.items()
+            for m in pattern.finditer(content)
+        )
+        entities = self.detector._detect_with_patterns(content)
+        
+        assert sorted((e['type'], e['start'], e['end']) for e in entities) == expected
+        assert {e['type'] for e in entities} >= {'email', 'phone', 'ssn', 'credit_card', 'ip_address', 'api_key', 'password_hash'}
+    
+    def test_combined_pattern_fallback(self):
+        """Test the combined-alternation scan used without Hyperscan or for non-ASCII text."""
+        content = "Café contact: john.doe@company.com, SSN 123-45-6789, host 10.0.0.1"
+        
+        with patch('guardrail_tool._PII_DATABASE', None):
+            entities = self.detector._detect_with_patterns(content)
+        
+        assert [(e['type'], e['text']) for e in entities] == [
+            ('email', 'john.doe@company.com'),
+            ('ssn', '123-45-6789'),
+            ('ip_address', '10.0.0.1')
+        ]
+        assert content[entities[0]['start']:entities[0]['end']] == 'john.doe@company.com'
+    
+    def test_possessive_patterns_keep_word_boundaries(self):
+        """Test api_key/ip_address matching on runs that cannot end at a boundary."""
+        content = "token " + "a" * 5000 + "_x, key " + "B" * 40 + ", host 1.2.3.4567"
+    
+        with patch('guardrail_tool._PII_DATABASE', None):
+            entities = self.detector._detect_with_patterns(content)
+    
+        assert [(e['type'], e['text']) for e in entities] == [('api_key', "B" * 40)]
+    
+    def test_pattern_scans_run_concurrently(self):
+        """Test pattern detection gives the same entities when run from several threads."""
+        content = "Mail john.doe@company.com, SSN 123-45-6789, host 10.0.0.1. " * 2000
+        expected = self.detector._detect_with_patterns(content)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(self.detector._detect_with_patterns, [content] * 8))
+        
+        assert all(result == expected for result in results)
+    
     def test_no_pii_detected(self):
         """Test content with no PII."""
         content = "This is a normal cybersecurity article about vulnerabilities."
@@ -145,6 +249,41 @@ class TestPIIDetector:
         mock_comprehend.detect_pii_entities.assert_called_once()
         assert result.has_pii
     
+    @patch('guardrail_tool.comprehend_client')
+    def test_detect_pii_batch_matches_single_detection(self, mock_comprehend):
+        """Test batch detection returns per-article results in input order."""
+        mock_comprehend.detect_pii_entities.side_effect = lambda Text, LanguageCode: {
+            'Entities': [{'Type': 'PERSON', 'BeginOffset': 0, 'EndOffset': 8, 'Score': 0.95}]
+            if Text.startswith('John Doe') else []
+        }
+        articles = [
+            ("John Doe reported a security incident.", ""),
+            ("Contact john.doe@company.com for details.", "Advisory"),
+            ("No personal data here.", "")
+        ]
+        
+        results = self.detector.detect_pii_batch(articles)
+        
+        assert mock_comprehend.detect_pii_entities.call_count == 3
+        assert results == [self.detector.detect_pii(content, title) for content, title in articles]
+        assert [r.has_pii for r in results] == [True, True, False]
+        assert results[0].redacted_content == "[REDACTED_PERSON] reported a security incident."
+    
+    @patch('guardrail_tool.comprehend_client')
+    def test_comprehend_input_capped_in_utf8_bytes(self, mock_comprehend):
+        """Test Comprehend gets at most COMPREHEND_MAX_BYTES of whole UTF-8 characters."""
+        mock_comprehend.detect_pii_entities.return_value = {
+            'Entities': [{'Type': 'PERSON', 'BeginOffset': 6, 'EndOffset': 14, 'Score': 0.95}]
+        }
+        text = "Café: John Doe écrit.. " + "é" * 6000  # Cap falls mid-character
+        
+        entities = self.detector._detect_with_comprehend(text)
+        
+        sent = mock_comprehend.detect_pii_entities.call_args.kwargs['Text']
+        assert len(sent.encode('utf-8')) <= guardrail_tool.COMPREHEND_MAX_BYTES
+        assert text.startswith(sent)
+        assert entities[0]['text'] == "John Doe"
+    
     def test_deduplicate_entities(self):
         """Test deduplication of overlapping PII entities."""
         entities = [
@@ -158,6 +297,26 @@ class TestPIIDetector:
         assert len(unique_entities) == 2
         assert unique_entities[0]['type'] == 'email'
         assert unique_entities[1]['type'] == 'phone'
+    
+    def test_overlapping_entities_merge_under_most_confident(self):
+        """Test overlapping spans merge into one span typed by the most confident entity."""
+        text = "Reach John Smith at 555-123-4567 or key ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef12 now."
+        entities = [
+            {'type': 'phone', 'start': 20, 'end': 32, 'confidence': 0.9},
+            {'type': 'name', 'start': 6, 'end': 16, 'confidence': 0.8},
+            {'type': 'phone_number', 'start': 20, 'end': 28, 'confidence': 0.99},
+            {'type': 'api_key', 'start': 40, 'end': 74, 'confidence': 0.9},
+            {'type': 'person', 'start': 45, 'end': 50, 'confidence': 0.95}
+        ]
+        
+        unique_entities = self.detector._deduplicate_entities(entities, text)
+        
+        assert [(e['type'], e['start'], e['end']) for e in unique_entities] == [
+            ('name', 6, 16), ('phone_number', 20, 32), ('person', 40, 74)
+        ]
+        assert unique_entities[1]['text'] == "555-123-4567"
+        assert self.detector._redact_content(text, unique_entities) == \
+            "Reach [REDACTED_NAME] at [REDACTED_PHONE_NUMBER] or key [REDACTED_PERSON] now."
 
 
 class TestCVEValidator:
@@ -199,6 +358,17 @@ class TestCVEValidator:
         year_violations = [v for v in violations if "Suspicious CVE year" in v.description]
         assert len(year_violations) > 0
     
+    def test_known_cve_years_shared_and_refreshed(self):
+        """Test the valid-year set is shared and rebuilt once its TTL lapses."""
+        assert self.validator.known_cve_years is CVEValidator().known_cve_years
+        assert datetime.now().year + 1 in self.validator.known_cve_years
+        
+        with patch('guardrail_tool._known_cve_years_cache', (time.monotonic(), frozenset({2000}))):
+            assert self.validator.known_cve_years == {2000}
+        
+        with patch('guardrail_tool._known_cve_years_cache', (float('-inf'), frozenset({2000}))):
+            assert self.validator.known_cve_years == set(range(1999, datetime.now().year + 2))
+    
     def test_cve_hallucination_detection(self):
         """Test detection of hallucinated CVEs."""
         # CVE not mentioned in content
@@ -211,6 +381,16 @@ class TestCVEValidator:
                                   if v.violation_type == GuardrailViolationType.HALLUCINATION]
         assert len(hallucination_violations) > 0
     
+    def test_cve_prefix_of_content_cve_is_hallucination(self):
+        """Test an extracted CVE must appear as a whole identifier, not a prefix."""
+        content = "Patch CVE-2024-12345 now."
+        
+        violations = self.validator.validate_cves(content, ["CVE-2024-1234", "CVE-2024-12345"])
+        
+        assert [v.description for v in violations
+                if v.violation_type == GuardrailViolationType.HALLUCINATION] == \
+            ["Extracted CVE not found in content: CVE-2024-1234"]
+    
     def test_missing_cve_extraction(self):
         """Test detection of CVEs in content but not extracted."""
         extracted_cves = []
@@ -272,6 +452,22 @@ class TestBiasAndSensationalismDetector:
         # This test depends on the banned terms list
         # May or may not trigger based on actual implementation
     
+    def test_term_scan_matches_substring_checks(self):
+        """Test the automaton scan agrees with the plain substring fallback."""
+        text = "BREAKING: Massive outage, totally false claims of hate speech by a Conservative"
+        
+        with patch.object(self.detector, '_term_automaton', None):
+            expected = self.detector._find_terms(text.lower())
+        
+        assert self.detector._find_terms(text.lower()) == expected
+        assert expected == {'breaking', 'massive', 'totally false', 'hate speech', 'conservative'}
+    
+    def test_sensational_words_match_whole_words(self):
+        """Test sensational words are not counted inside longer words."""
+        found = self.detector._find_terms("criticality and hugely massive, breaking-news".lower())
+        
+        assert found == {'massive', 'breaking'}
+    
     def test_neutral_content(self):
         """Test neutral content with no bias or sensationalism."""
         content = "A security vulnerability was discovered in the software. The vendor has released a patch."
@@ -302,6 +498,28 @@ class TestBiasAndSensationalismDetector:
         
         mock_bedrock.invoke_model.assert_called_once()
         assert len(violations) > 0
+    
+    @patch('guardrail_tool.bedrock_client')
+    def test_llm_bias_detection_ignores_surrounding_prose(self, mock_bedrock):
+        """Test the first JSON object is parsed even with braces in trailing text."""
+        mock_response = {
+            'body': Mock()
+        }
+        mock_response['body'].read.return_value = json.dumps({
+            'content': [{
+                'text': 'Assessment:\n{"has_bias": true, "bias_type": "political", "severity": "high", '
+                        '"description": "One-sided framing", "confidence": 0.9}\n'
+                        'Note: ignore the {placeholder} in the source.'
+            }]
+        }).encode()
+        
+        mock_bedrock.invoke_model.return_value = mock_response
+        
+        violations = self.detector._detect_bias_with_llm("Some content.", "Test Title")
+        
+        assert len(violations) == 1
+        assert violations[0].severity == "high"
+        assert violations[0].description == "LLM detected political bias: One-sided framing"
 
 
 class TestGuardrailTool:
@@ -309,8 +527,21 @@ class TestGuardrailTool:
     
     def setup_method(self):
         """Set up test fixtures."""
+        guardrail_tool._result_cache.clear()
         self.tool = GuardrailTool()
     
+    @pytest.fixture(autouse=True)
+    def healthy_aws_clients(self):
+        """Stub Comprehend and Bedrock with answers that report nothing."""
+        with patch('guardrail_tool.comprehend_client') as comprehend, \
+             patch('guardrail_tool.bedrock_client') as bedrock:
+            comprehend.detect_pii_entities.return_value = {'Entities': []}
+            bedrock.invoke_model.return_value = {'body': Mock(read=Mock(return_value=json.dumps({
+                'content': [{'text': '{"has_bias": false, "bias_type": "none"}'}]
+            }).encode()))}
+            self.comprehend, self.bedrock = comprehend, bedrock
+            yield
+    
     def test_validate_clean_content(self):
         """Test validation of clean content that should pass."""
         article_data = {
@@ -343,12 +574,312 @@ class TestGuardrailTool:
             "entities": {"cves": []}
         }
         
-        result = self.tool.validate_content(article_data)
+        with patch.object(self.tool.pii_detector, 'detect_pii',
+                          wraps=self.tool.pii_detector.detect_pii) as detect_pii:
+            result = self.tool.validate_content(article_data)
         
         assert not result.passed  # Should fail due to PII
         assert 'pii_detected' in result.flags
         assert result.redacted_content is not None
         assert "[REDACTED_" in result.redacted_content
+        detect_pii.assert_called_once()
+    
+    def test_validate_content_caches_replayed_articles(self):
+        """Test replaying the same article and config reuses the first result."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "Patch CVE-2024-1234 on every affected server as soon as possible.",
+            "entities": {"cves": ["CVE-2024-1234"]}
+        }
+        
+        with patch.object(self.tool.pii_detector, 'detect_pii',
+                          wraps=self.tool.pii_detector.detect_pii) as detect_pii:
+            first = self.tool.validate_content(article_data)
+            replay = self.tool.validate_content(dict(article_data))
+            edited = self.tool.validate_content({**article_data, "title": "Security Incident Update"})
+        
+        assert replay == first
+        assert edited is not first
+        assert detect_pii.call_count == 2
+    
+    def test_cached_results_are_copies(self):
+        """Test mutating a returned result does not alter later cache hits."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "Contact john.doe@company.com for more information about the security incident.",
+            "entities": {"cves": []}
+        }
+        
+        first = self.tool.validate_content(article_data)
+        expected_flags = list(first.flags)
+        expected_description = first.violations[0].description
+        first.flags.append('reviewed')
+        first.violations[0].description = "edited"
+        first.violations.clear()
+        
+        replay = self.tool.validate_content(article_data)
+        assert replay.flags == expected_flags
+        assert replay.violations[0].description == expected_description
+        
+        replay.flags.clear()
+        assert self.tool.validate_content(article_data).flags == expected_flags
+    
+    def test_unserializable_article_skips_cache(self):
+        """Test an article orjson cannot encode is validated without caching."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "The vendor shipped a fix for the reported security incident last week.",
+            "entities": {"cves": []},
+            "feed_sequence": 2 ** 70
+        }
+        
+        result = self.tool.validate_content(article_data)
+        
+        assert isinstance(result, GuardrailResult)
+        assert not guardrail_tool._result_cache
+        assert guardrail_tool._result_cache_key({1: "a", "b": 2}, {}) is not None
+        with patch('guardrail_tool.orjson', None):
+            assert guardrail_tool._result_cache_key({1: "a", "b": 2}, {}) is None
+    
+    def test_validate_content_batch(self):
+        """Test batch validation detects PII once per article and keeps input order."""
+        articles = [
+            {
+                "article_id": f"test-{i}",
+                "title": "Security Incident Report",
+                "url": "https://example.com/article",
+                "published_at": "2024-01-01T12:00:00Z",
+                "normalized_content": content,
+                "entities": {"cves": []}
+            }
+            for i, content in enumerate([
+                "Contact john.doe@company.com for more information about the security incident.",
+                "The vendor shipped a fix for the reported security incident last week."
+            ])
+        ]
+        
+        with patch.object(self.tool.pii_detector, 'detect_pii') as detect_pii:
+            results = self.tool.validate_content_batch(articles)
+        
+        detect_pii.assert_not_called()
+        assert ['pii_detected' in r.flags for r in results] == [True, False]
+        assert "[REDACTED_EMAIL]" in results[0].redacted_content
+        assert results[1].redacted_content is None
+    
+    def test_validate_content_batch_skips_pii_for_cached_and_rejected(self):
+        """Test batch PII detection only covers articles not cached or rejected."""
+        base = {
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "entities": {"cves": []}
+        }
+        cached = {**base, "article_id": "cached",
+                  "normalized_content": "The vendor shipped a fix for the reported security incident last week."}
+        banned = {**base, "article_id": "banned",
+                  "normalized_content": "This offensive post lists john.doe@company.com for the security incident."}
+        fresh = {**base, "article_id": "fresh",
+                 "normalized_content": "Contact john.doe@company.com for more information about the security incident."}
+        first = self.tool.validate_content(cached)
+        
+        with patch.object(self.tool.pii_detector, 'detect_pii_batch',
+                          wraps=self.tool.pii_detector.detect_pii_batch) as detect_pii_batch:
+            results = self.tool.validate_content_batch([cached, banned, fresh])
+        
+        detect_pii_batch.assert_called_once_with([(fresh["normalized_content"], fresh["title"])])
+        assert results[0] == first
+        assert not results[1].passed
+        assert 'pii_detected' not in results[1].flags
+        assert 'pii_detected' in results[2].flags
+    
+    def test_validate_content_degrades_when_llm_bias_is_slow(self):
+        """Test a late LLM bias verdict is dropped and the result is not cached."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "This is completely ridiculous and always happens with these systems.",
+            "entities": {"cves": []}
+        }
+        llm_violation = GuardrailViolation(
+            violation_type=GuardrailViolationType.BIAS_DETECTED,
+            severity="high",
+            description="LLM detected emotional bias: slow",
+        )
+        
+        def slow_llm(content, title):
+            time.sleep(0.5)
+            return [llm_violation]
+        
+        with patch.object(self.tool.bias_detector, '_detect_bias_with_llm', side_effect=slow_llm), \
+             patch('guardrail_tool.LLM_BIAS_TIMEOUT_SECONDS', 0.05):
+            result = self.tool.validate_content(article_data)
+        
+        assert 'bias_detected' in result.flags
+        assert llm_violation not in result.violations
+        assert not guardrail_tool._result_cache
+        
+        with patch.object(self.tool.bias_detector, '_detect_bias_with_llm', return_value=[llm_violation]):
+            result = self.tool.validate_content(article_data)
+        
+        assert llm_violation in result.violations
+        assert len(guardrail_tool._result_cache) == 1
+    
+    def test_validate_content_degrades_when_pii_detection_is_slow(self):
+        """Test a late Comprehend result falls back to patterns and is not cached."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "Contact john.doe@company.com for more information about the security incident.",
+            "entities": {"cves": []}
+        }
+        release = threading.Event()
+        
+        def slow_pii(content, title):
+            release.wait(5)
+            return PIIDetectionResult(has_pii=False, pii_entities=[], redacted_content=content, confidence=1.0)
+        
+        try:
+            with patch.object(self.tool.pii_detector, 'detect_pii', side_effect=slow_pii), \
+                 patch('guardrail_tool.PII_TIMEOUT_SECONDS', 0.05):
+                start = time.perf_counter()
+                result = self.tool.validate_content(article_data)
+                elapsed = time.perf_counter() - start
+        finally:
+            release.set()
+        
+        assert elapsed < 2
+        assert 'pii_detected' in result.flags
+        assert "[REDACTED_EMAIL]" in result.redacted_content
+        assert not guardrail_tool._result_cache
+    
+    def test_slow_llm_calls_do_not_delay_pii_detection(self):
+        """Test LLM calls left running past their deadline never queue PII detection."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "The vendor shipped a fix for the reported security incident last week.",
+            "entities": {"cves": []}
+        }
+        release = threading.Event()
+        
+        def stuck_llm(content, title):
+            release.wait(5)
+            return []
+        
+        try:
+            with patch.object(self.tool.bias_detector, '_detect_bias_with_llm', side_effect=stuck_llm), \
+                 patch('guardrail_tool.LLM_BIAS_TIMEOUT_SECONDS', 0.01), \
+                 patch('guardrail_tool.PII_TIMEOUT_SECONDS', 1.0), \
+                 patch.object(self.tool.pii_detector, '_detect_with_comprehend', return_value=[]) as comprehend:
+                for i in range(6):
+                    result = self.tool.validate_content({**article_data, "article_id": f"test-{i}"})
+                    assert result.passed
+        finally:
+            release.set()
+        
+        # A PII call queued behind the stuck LLM calls would be cancelled unrun
+        assert comprehend.call_count == 6
+        assert not guardrail_tool._result_cache
+    
+    def test_failed_remote_checks_are_not_cached(self):
+        """Test a throttled Comprehend or Bedrock call leaves the result uncached."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "Contact john.doe@company.com for more information about the security incident.",
+            "entities": {"cves": []}
+        }
+        throttled = ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'Invoke')
+        self.comprehend.detect_pii_entities.side_effect = throttled
+        self.bedrock.invoke_model.side_effect = throttled
+        
+        result = self.tool.validate_content(article_data)
+        
+        assert 'pii_detected' in result.flags
+        assert not guardrail_tool._result_cache
+        
+        self.tool.validate_content(article_data)
+        assert self.comprehend.detect_pii_entities.call_count == 2
+        assert self.bedrock.invoke_model.call_count == 2
+    
+    def test_incomplete_verdicts_are_not_cached(self):
+        """Test batch PII failures and LLM replies without a verdict are not cached."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "The vendor shipped a fix for the reported security incident last week.",
+            "entities": {"cves": []}
+        }
+        self.comprehend.detect_pii_entities.side_effect = ClientError(
+            {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'DetectPiiEntities'
+        )
+        
+        result = self.tool.validate_content_batch([article_data])[0]
+        
+        assert result.passed
+        assert not guardrail_tool._result_cache
+        
+        self.comprehend.detect_pii_entities.side_effect = None
+        self.bedrock.invoke_model.return_value = {'body': Mock(read=Mock(return_value=json.dumps({
+            'content': [{'text': 'I cannot assess this article.'}]
+        }).encode()))}
+        
+        self.tool.validate_content(article_data)
+        
+        assert not guardrail_tool._result_cache
+    
+    def test_validate_content_skips_network_checks_after_banned_terms(self):
+        """Test a banned term rejects the article without PII or LLM calls."""
+        article_data = {
+            "article_id": "test-123",
+            "title": "Security Incident Report",
+            "url": "https://example.com/article",
+            "published_at": "2024-01-01T12:00:00Z",
+            "normalized_content": "This offensive post lists john.doe@company.com and cites CVE-2024-1234.",
+            "entities": {"cves": []}
+        }
+        
+        with patch.object(self.tool.pii_detector, 'detect_pii') as detect_pii, \
+             patch.object(self.tool.bias_detector, '_detect_bias_with_llm') as detect_llm:
+            result = self.tool.validate_content(article_data)
+        
+        detect_pii.assert_not_called()
+        detect_llm.assert_not_called()
+        assert not result.passed
+        assert result.flags == ['bias_detected']
+        assert any(v.violation_type == GuardrailViolationType.BANNED_TERMS for v in result.violations)
+    
+    def test_result_cache_key_ignores_key_order(self):
+        """Test equal articles share a cache key with and without orjson."""
+        config = guardrail_tool.DEFAULT_VALIDATION_CONFIG
+        first = {"title": "Report", "published_at": datetime(2024, 1, 1), "entities": {"cves": [], "vendors": ["x"]}}
+        second = {"entities": {"vendors": ["x"], "cves": []}, "published_at": datetime(2024, 1, 1), "title": "Report"}
+        
+        assert guardrail_tool._result_cache_key(first, config) == guardrail_tool._result_cache_key(second, config)
+        with patch('guardrail_tool.orjson', None):
+            assert guardrail_tool._result_cache_key(first, config) == \
+                guardrail_tool._result_cache_key(second, config)
+        assert guardrail_tool._result_cache_key(first, config) != \
+            guardrail_tool._result_cache_key({**first, "title": "Other"}, config)
     
     def test_validate_content_with_invalid_cves(self):
         """Test validation of content with invalid CVEs."""
@@ -405,7 +936,27 @@ class TestGuardrailTool:
         quality_violations = [v for v in violations 
                             if v.violation_type == GuardrailViolationType.QUALITY_ISSUES]
         assert len(quality_violations) > 0
-    
+
+    def test_quality_checks_url_validity(self):
+        """Test URL check requires an http(s) scheme and a non-empty host."""
+        def url_flagged(url):
+            article_data = {
+                "title": "A sufficiently long title",
+                "url": url,
+                "normalized_content": "x" * 100,
+            }
+            return any("URL" in v.description
+                       for v in self.tool._perform_quality_checks(article_data))
+
+        assert not url_flagged("https://example.com/article")
+        assert not url_flagged("http://example.com")
+        assert not url_flagged("https://example.com?id=1")
+        assert url_flagged("https://")
+        assert url_flagged("https:///path")
+        assert url_flagged("https://exa mple.com/")
+        assert url_flagged("ftp://example.com/")
+        assert url_flagged("https://" + "a" * 254 + "/")
+
     def test_determine_pass_status(self):
         """Test pass/fail determination logic."""
         # Test with critical violation
@@ -455,11 +1006,56 @@ class TestGuardrailTool:
         ]
         confidence = self.tool._calculate_overall_confidence(many_violations)
         assert confidence < 0.8
+    
+    def test_generate_rationale(self):
+        """Test rationale counts violations per type in first-seen order."""
+        violations = [
+            GuardrailViolation(violation_type=violation_type, severity="low", description="Issue")
+            for violation_type in [
+                GuardrailViolationType.QUALITY_ISSUES,
+                GuardrailViolationType.PII_DETECTED,
+                GuardrailViolationType.QUALITY_ISSUES
+            ]
+        ]
+        
+        assert self.tool._generate_rationale([], True) == "Content passed all guardrail validations"
+        assert self.tool._generate_rationale(violations, True) == \
+            "Content passed with minor issues: 2 quality_issues, 1 pii_detected"
+        assert self.tool._generate_rationale(violations, False) == \
+            "Content failed validation due to: 2 quality_issues, 1 pii_detected"
 
 
 class TestLambdaHandler:
     """Test Lambda handler function."""
     
+    @pytest.fixture(autouse=True)
+    def reset_tool_cache(self):
+        """Reset the warm-container caches between tests."""
+        guardrail_tool._get_guardrail_tool.cache_clear()
+        guardrail_tool._result_cache.clear()
+        yield
+        guardrail_tool._get_guardrail_tool.cache_clear()
+        guardrail_tool._result_cache.clear()
+    
+    def test_lambda_handler_reuses_tool_instance(self):
+        """Test Lambda handler reuses the tool and default config across warm invocations."""
+        event = {"article_id": "test-123", "article_data": {"title": "Test Article"}}
+        
+        with patch('guardrail_tool.GuardrailTool') as mock_tool_class:
+            mock_tool = mock_tool_class.return_value
+            mock_tool.validate_content.return_value = GuardrailResult(
+                passed=True, violations=[], flags=[], confidence=0.95, rationale="All checks passed"
+            )
+            
+            lambda_handler(event, None)
+            lambda_handler(event, None)
+        
+        mock_tool_class.assert_called_once()
+        assert mock_tool.validate_content.call_count == 2
+        mock_tool.validate_content.assert_called_with(
+            event["article_data"], guardrail_tool.DEFAULT_VALIDATION_CONFIG
+        )
+    
     def test_lambda_handler_success(self):
         """Test successful lambda handler execution."""
         event = {
@@ -498,6 +1094,42 @@ class TestLambdaHandler:
             assert response['body']['success'] is True
             assert response['body']['article_id'] == "test-123"
     
+    def test_lambda_handler_batch(self):
+        """Test a batch event validates every article in one call."""
+        event = {
+            "articles": [
+                {"article_id": "a-1", "article_data": {"title": "First Article"}},
+                {"article_id": "a-2", "article_data": {"title": "Second Article"}}
+            ],
+            "validation_config": {"detect_pii": False}
+        }
+        
+        with patch('guardrail_tool.GuardrailTool') as mock_tool_class:
+            mock_tool = mock_tool_class.return_value
+            mock_tool.validate_content_batch.return_value = [
+                GuardrailResult(passed=True, violations=[], flags=[], confidence=0.95, rationale="ok"),
+                GuardrailResult(passed=False, violations=[], flags=['quality_issues'], confidence=0.6, rationale="bad")
+            ]
+            
+            response = lambda_handler(event, None)
+        
+        mock_tool.validate_content_batch.assert_called_once_with(
+            [{"title": "First Article"}, {"title": "Second Article"}], {"detect_pii": False}
+        )
+        assert response['statusCode'] == 200
+        assert [(r['article_id'], r['result']['passed']) for r in response['body']['results']] == [
+            ("a-1", True), ("a-2", False)
+        ]
+    
+    def test_lambda_handler_batch_requires_article_fields(self):
+        """Test a batch with an incomplete article is rejected."""
+        event = {"articles": [{"article_id": "a-1"}]}
+        
+        response = lambda_handler(event, None)
+        
+        assert response['statusCode'] == 500
+        assert response['body']['error_type'] == 'ValueError'
+    
     def test_lambda_handler_missing_parameters(self):
         """Test lambda handler with missing parameters."""
         event = {
@@ -567,6 +1199,7 @@ class TestGuardrailIntegration:
             "relevancy_score": 0.95
         }
         
+        guardrail_tool._result_cache.clear()
         tool = GuardrailTool()
         result = tool.validate_content(article_data)
         
@@ -10,7 +10,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from lambda_tools.storage_tool import (
     StorageResult, BatchOperationResult, DynamoDBManager, S3Manager, 
-    StorageTool, lambda_handler
+    StorageTool, lambda_handler, published_day
 )
 
 
@@ -258,6 +258,52 @@ class TestDynamoDBManager:
         assert isinstance(back_converted['float_field'], float)
         assert isinstance(back_converted['dict_field']['nested'], float)
         assert isinstance(back_converted['list_field'][0], float)
+    
+    def test_create_article_sets_utc_published_date(self, setup_dynamodb_manager):
+        """Test the GSI day bucket comes from the UTC instant of published_at."""
+        manager, mock_articles_table, _, _ = setup_dynamodb_manager
+        
+        article_data = {
+            'title': 'Test Article',
+            'url': 'https://example.com/test',
+            'source': 'test-source',
+            'feed_id': 'test-feed',
+            'published_at': '2024-01-15T02:00:00+05:00'
+        }
+        
+        manager.create_article(article_data)
+        
+        item = mock_articles_table.put_item.call_args[1]['Item']
+        assert item['published_date'] == '2024-01-14'
+        assert published_day('2024-01-15T23:30:00Z') == '2024-01-15'
+        assert published_day('not a date') is None
+    
+    def test_backfill_published_dates(self, setup_dynamodb_manager):
+        """Test articles without published_date are backfilled page by page."""
+        manager, mock_articles_table, _, _ = setup_dynamodb_manager
+        
+        mock_articles_table.scan.side_effect = [
+            {
+                'Items': [{'article_id': 'a-1', 'published_at': '2024-01-15T02:00:00+05:00'}],
+                'ScannedCount': 10,
+                'LastEvaluatedKey': {'article_id': 'a-1'}
+            },
+            {
+                'Items': [{'article_id': 'a-2', 'published_at': 'garbage'}],
+                'ScannedCount': 10
+            }
+        ]
+        
+        result = manager.backfill_published_dates()
+        
+        assert result.success is True
+        assert result.items_processed == 1
+        assert result.metadata == {'scanned': 20, 'last_evaluated_key': None}
+        assert 'a-2' in result.warnings[0]
+        assert mock_articles_table.scan.call_args_list[1][1]['ExclusiveStartKey'] == {'article_id': 'a-1'}
+        update = mock_articles_table.update_item.call_args[1]
+        assert update['Key'] == {'article_id': 'a-1'}
+        assert update['ExpressionAttributeValues'] == {':published_date': '2024-01-14'}
 
 
 @patch('lambda_tools.storage_tool.s3_client')